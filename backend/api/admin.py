@@ -0,0 +1,74 @@
+import hmac
+from typing import Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse
+from pydantic import BaseModel, Field
+
+from .profiling import MODES, profiler
+from ..config import settings
+
+
+admin_router = APIRouter(prefix="/admin")
+
+
+def is_admin(request: Request) -> bool:
+    token = request.headers.get("x-admin-token")
+    return bool(settings.admin_token and token and hmac.compare_digest(token, settings.admin_token))
+
+
+def _require_admin(request: Request) -> None:
+    if not settings.admin_token:
+        # Admin surface does not exist unless configured
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not is_admin(request):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+class ProfileRequest(BaseModel):
+    mode: str = Field("cprofile", pattern=f"^({'|'.join(MODES)})$")
+    requests: Optional[int] = Field(None, ge=1, le=10000)
+    seconds: Optional[float] = Field(None, gt=0, le=3600)
+    route_prefix: str = ""
+
+
+@admin_router.get("/profile")
+async def profile_status(request: Request) -> Dict:
+    _require_admin(request)
+    return profiler.status()
+
+
+@admin_router.post("/profile")
+async def arm_profiler(body: ProfileRequest, request: Request) -> Dict:
+    """Profile the next ``requests`` requests and/or the next ``seconds`` (default: one request)."""
+    _require_admin(request)
+    return profiler.arm(body.mode, body.requests, body.seconds, body.route_prefix)
+
+
+@admin_router.delete("/profile")
+async def disarm_profiler(request: Request) -> Dict:
+    _require_admin(request)
+    return profiler.disarm()
+
+
+@admin_router.get("/profiles")
+async def list_profiles(request: Request) -> Dict:
+    _require_admin(request)
+    return {"directory": profiler.directory, "dumps": profiler.list_dumps()}
+
+
+@admin_router.get("/profiles/{name}")
+async def download_profile(name: str, request: Request) -> FileResponse:
+    _require_admin(request)
+    path = profiler.dump_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="No such profile")
+    media_type = "text/plain" if name.endswith(".collapsed") else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=name)
+
+
+@admin_router.delete("/profiles")
+async def clear_profiles(request: Request) -> Dict:
+    _require_admin(request)
+    return {"removed": profiler.clear()}
+
@@ -0,0 +1,86 @@
+import gzip
+import json
+import struct
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..indicators.bundle import indicator_arrays
+
+
+F32_MEDIA_TYPE = "application/vnd.traderblock.columns+f32"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MAGIC = b"TBC1"
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Pick ``"f32"``, ``"arrow"`` or ``"json"`` from an Accept header; JSON unless asked otherwise."""
+    accept = (accept or "").lower()
+    if F32_MEDIA_TYPE in accept:
+        return "f32"
+    if ARROW_MEDIA_TYPE in accept and arrow_available():
+        return "arrow"
+    return "json"
+
+
+def wants_gzip(accept_encoding: Optional[str]) -> bool:
+    return "gzip" in (accept_encoding or "").lower()
+
+
+def arrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def encode_f32(ticker: str, timestamps: np.ndarray, columns: Dict[str, np.ndarray]) -> bytes:
+    """
+    Little-endian columnar frame built straight from the NumPy buffers.
+
+    Layout: ``b"TBC1"``, uint32 header length, UTF-8 JSON header padded to a
+    multiple of 8 bytes, int64 epoch-second timestamps, then one float32
+    buffer of ``rows`` values per column in header order. NaN marks missing
+    (warm-up) values.
+    """
+    names = list(columns)
+    header = json.dumps({
+        "ticker": ticker,
+        "rows": int(len(timestamps)),
+        "timestamp": {"dtype": "<i8", "unit": "s"},
+        "dtype": "<f4",
+        "columns": names,
+    }, separators=(",", ":")).encode()
+    header += b" " * (-(len(MAGIC) + 4 + len(header)) % 8)
+    parts = [MAGIC, struct.pack("<I", len(header)), header, timestamps.astype("<i8", copy=False).tobytes()]
+    parts.extend(columns[name].astype("<f4", copy=False).tobytes() for name in names)
+    return b"".join(parts)
+
+
+def encode_arrow(ticker: str, timestamps: np.ndarray, columns: Dict[str, np.ndarray]) -> bytes:
+    """Arrow IPC stream with a shared ``timestamp`` column; requires the optional pyarrow."""
+    import pyarrow as pa
+
+    arrays = [pa.array(timestamps.astype("datetime64[s]"))]
+    arrays += [pa.array(values, from_pandas=True) for values in columns.values()]
+    table = pa.Table.from_arrays(arrays, names=["timestamp", *columns])
+    table = table.replace_schema_metadata({"ticker": ticker})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def compress(body: bytes) -> bytes:
+    # Level 6 is the usual speed/size trade-off; float columns compress modestly
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def encode_indicators(ticker: str, df: pd.DataFrame, fmt: str, gzipped: bool = False, points: int = 120) -> bytes:
+    """Compute the chart columns and encode them; picklable for the CPU pool."""
+    timestamps, columns = indicator_arrays(df, points)
+    body = encode_arrow(ticker, timestamps, columns) if fmt == "arrow" else encode_f32(ticker, timestamps, columns)
+    return compress(body) if gzipped else body
+
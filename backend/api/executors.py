@@ -0,0 +1,126 @@
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+from fastapi import HTTPException, status
+
+from ..config import settings
+
+
+def _timed(fn: Callable, args: Tuple, kwargs: Dict) -> Tuple[Any, float, float]:
+    # Runs inside the worker; wall-clock timestamps stay comparable across processes
+    started = time.time()
+    result = fn(*args, **kwargs)
+    return result, started, time.time() - started
+
+
+class ExecutorPool:
+    """
+    Bounded executor that keeps blocking or CPU-heavy work off the event loop.
+
+    ``kind`` is ``"thread"`` for blocking I/O or ``"process"`` for CPU-bound
+    work (callables and arguments must then be picklable). At most
+    ``max_workers + max_queue`` calls may be in flight; beyond that ``run``
+    raises a 503 so callers shed load instead of queueing without bound.
+    """
+
+    def __init__(self, name: str, kind: str = "thread", max_workers: int = 4, max_queue: int = 32) -> None:
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+        self._created = time.time()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+        return self._executor
+
+    async def run(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Server busy ({self.name} pool saturated)",
+                headers={"Retry-After": "1"},
+            )
+        self.in_flight += 1
+        self.submitted += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        queued_at = time.time()
+        loop = asyncio.get_running_loop()
+        try:
+            result, started, elapsed = await loop.run_in_executor(
+                self.executor, functools.partial(_timed, fn, args, kwargs)
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        self.completed += 1
+        self.busy_seconds += elapsed
+        self.wait_seconds += max(0.0, started - queued_at)
+        return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict:
+        capacity = (time.time() - self._created) * self.max_workers
+        done = self.completed or 1
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.max_workers),
+            "peak_in_flight": self.peak_in_flight,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "utilization": round(self.busy_seconds / capacity, 4) if capacity else 0.0,
+            "avg_run_ms": round(self.busy_seconds / done * 1000, 2),
+            "avg_wait_ms": round(self.wait_seconds / done * 1000, 2),
+        }
+
+
+io_pool = ExecutorPool(
+    "io", kind="thread", max_workers=settings.io_pool_workers, max_queue=settings.io_pool_queue
+)
+cpu_pool = ExecutorPool(
+    "cpu",
+    kind=settings.cpu_pool_kind,
+    max_workers=settings.cpu_pool_workers or os.cpu_count() or 2,
+    max_queue=settings.cpu_pool_queue,
+)
+
+
+def get_pool_stats() -> Dict:
+    return {pool.name: pool.get_stats() for pool in (io_pool, cpu_pool)}
+
+
+def shutdown_pools() -> None:
+    io_pool.shutdown()
+    cpu_pool.shutdown()
+
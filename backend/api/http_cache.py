@@ -0,0 +1,35 @@
+from typing import Dict, Optional, Tuple
+from fastapi import Request, Response
+
+
+# (encoded body, ETag, seconds of freshness left)
+EncodedEntry = Tuple[bytes, str, int]
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in header.split(","))
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def cached_response(
+    request: Request,
+    entry: EncodedEntry,
+    media_type: str = "application/json",
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Serve a pre-encoded body, answering a matching ``If-None-Match`` with 304."""
+    body, etag, max_age = entry
+    headers = {**(headers or {}), "ETag": etag, "Cache-Control": f"max-age={max(0, max_age)}"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        headers.pop("Content-Encoding", None)
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def cached_json_response(request: Request, entry: EncodedEntry) -> Response:
+    return cached_response(request, entry)
+
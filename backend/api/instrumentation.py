@@ -0,0 +1,46 @@
+import time
+from typing import Callable
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+
+from .admin import is_admin
+from .profiling import profiler
+from ..utils.metrics import REQUEST_LATENCY
+
+
+class TimedRoute(APIRoute):
+    """
+    Route class recording request latency per route template.
+
+    The label is the path template (``/stock/{ticker}``), not the concrete
+    URL, so series cardinality stays bounded by the number of routes.
+    Requests selected by the opt-in profiler run under it.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route = self.path
+
+        async def timed_handler(request: Request) -> Response:
+            started = time.perf_counter()
+            status = 500
+            header = request.headers.get("x-profile")
+            mode = profiler.wants(route, header if header is not None and is_admin(request) else None)
+            try:
+                if mode is None:
+                    response = await handler(request)
+                else:
+                    response = await profiler.run(route, mode, lambda: handler(request))
+                status = response.status_code
+                return response
+            except HTTPException as e:
+                status = e.status_code
+                raise
+            finally:
+                REQUEST_LATENCY.observe(
+                    time.perf_counter() - started, route=route, method=request.method, status=str(status)
+                )
+
+        return timed_handler
+
@@ -0,0 +1,234 @@
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from ..config import settings
+from ..utils.logger import get_logger
+
+
+_logger = get_logger(__name__)
+
+MODES = ("cprofile", "sampling")
+
+# Leaf frames of threads parked waiting for work; sampling them only adds noise
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+}
+
+
+def _route_slug(route: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+
+
+class StackSampler:
+    """
+    Wall-clock sampler over every Python thread.
+
+    Unlike cProfile, which only sees the event-loop thread, this also
+    captures work running on the I/O pool threads. Stacks are collapsed
+    root-first (``thread;module:function;...``) for flamegraph tools.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES:
+                    continue
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                parts = []
+                while frame is not None:
+                    code = frame.f_code
+                    parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                parts.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(parts))] += 1
+
+
+class Profiler:
+    """
+    Opt-in request profiler.
+
+    Arm it for the next ``requests`` calls and/or a ``seconds`` window (or
+    send ``X-Profile`` with a valid admin token on a single request). One
+    request is profiled at a time; results accumulate per route in
+    ``directory`` as ``<route>.pstats`` (cProfile) or ``<route>.collapsed``
+    (sampling). When disarmed, ``wants`` costs one attribute check and a
+    header lookup.
+    """
+
+    def __init__(self, directory: str, sample_interval: float = 0.005) -> None:
+        self.directory = directory
+        self.sample_interval = sample_interval
+        self.armed = False
+        self.mode = "cprofile"
+        self.route_prefix = ""
+        self.remaining: Optional[int] = None
+        self.until: Optional[float] = None
+        self.profiled = 0
+        self._busy = threading.Lock()
+        self._stats: Dict[str, pstats.Stats] = {}
+        self._stacks: Dict[str, Counter] = {}
+
+    def arm(self, mode: str = "cprofile", requests: Optional[int] = None,
+            seconds: Optional[float] = None, route_prefix: str = "") -> Dict:
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.mode = mode
+        self.route_prefix = route_prefix
+        self.remaining = requests
+        self.until = time.time() + seconds if seconds else None
+        if requests is None and seconds is None:
+            self.remaining = 1
+        self.armed = True
+        return self.status()
+
+    def disarm(self) -> Dict:
+        self.armed = False
+        self.remaining = None
+        self.until = None
+        return self.status()
+
+    def status(self) -> Dict:
+        self._expire()
+        return {
+            "armed": self.armed,
+            "mode": self.mode,
+            "route_prefix": self.route_prefix,
+            "remaining_requests": self.remaining,
+            "seconds_left": round(self.until - time.time(), 1) if self.armed and self.until else None,
+            "profiled_requests": self.profiled,
+            "directory": self.directory,
+        }
+
+    def _expire(self) -> None:
+        if self.armed and self.until is not None and time.time() >= self.until:
+            self.disarm()
+
+    def wants(self, route: str, header: Optional[str]) -> Optional[str]:
+        """Profiling mode for this request, or ``None`` for the normal path."""
+        if header is not None:
+            return header if header in MODES else self.mode
+        if not self.armed:
+            return None
+        self._expire()
+        if not self.armed or not route.startswith(self.route_prefix):
+            return None
+        return self.mode
+
+    async def run(self, route: str, mode: str, call: Callable[[], Awaitable]) -> object:
+        # Concurrent requests are served unprofiled rather than blurring the profile
+        if not self._busy.acquire(blocking=False):
+            return await call()
+        try:
+            if mode == "sampling":
+                sampler = StackSampler(self.sample_interval)
+                sampler.start()
+                try:
+                    return await call()
+                finally:
+                    self._record_stacks(route, sampler.stop())
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                return await call()
+            finally:
+                profile.disable()
+                self._record_profile(route, profile)
+        finally:
+            self._busy.release()
+            self._count()
+
+    def _count(self) -> None:
+        self.profiled += 1
+        if self.armed and self.remaining is not None:
+            self.remaining -= 1
+            if self.remaining <= 0:
+                self.disarm()
+
+    def _record_profile(self, route: str, profile: cProfile.Profile) -> None:
+        try:
+            stats = self._stats.get(route)
+            if stats is None:
+                stats = self._stats[route] = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+            os.makedirs(self.directory, exist_ok=True)
+            stats.dump_stats(os.path.join(self.directory, f"{_route_slug(route)}.pstats"))
+        except Exception as e:
+            _logger.warning("profile dump failed for %s: %s", route, e)
+
+    def _record_stacks(self, route: str, stacks: Counter) -> None:
+        try:
+            total = self._stacks.setdefault(route, Counter())
+            total.update(stacks)
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{_route_slug(route)}.collapsed")
+            with open(path, "w") as f:
+                f.writelines(f"{stack} {count}\n" for stack, count in total.most_common())
+        except Exception as e:
+            _logger.warning("stack dump failed for %s: %s", route, e)
+
+    def list_dumps(self) -> List[Dict]:
+        if not os.path.isdir(self.directory):
+            return []
+        out = []
+        for name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, name)
+            if os.path.isfile(path):
+                st = os.stat(path)
+                out.append({"name": name, "bytes": st.st_size, "modified": int(st.st_mtime)})
+        return out
+
+    def dump_path(self, name: str) -> Optional[str]:
+        # Only plain file names from list_dumps; no path components
+        if os.path.basename(name) != name or not name.endswith((".pstats", ".collapsed")):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+    def clear(self) -> int:
+        removed = 0
+        for entry in self.list_dumps():
+            path = self.dump_path(entry["name"])
+            if path:
+                os.remove(path)
+                removed += 1
+        self._stats.clear()
+        self._stacks.clear()
+        return removed
+
+
+profiler = Profiler(settings.profile_dir, sample_interval=settings.profile_sample_interval_ms / 1000)
+
@@ -1,61 +1,181 @@
+import sqlite3
+import threading
 import time
-from typing import Dict
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
 from fastapi import HTTPException, status
 
 
+# Theoretical arrival times, one per limit; None means the update was rejected
+Update = Callable[[Optional[List[float]]], Tuple[Optional[List[float]], int]]
+
+
+class MemoryStore:
+    """
+    Per-process GCRA state bounded to ``max_keys`` entries.
+
+    Keys are kept in LRU order. Entries whose arrival times are all in the past
+    carry no information (they behave like a new client) and are evicted
+    opportunistically; beyond ``max_keys`` the least recently seen key goes.
+    """
+
+    def __init__(self, max_keys: int = 50_000) -> None:
+        self.max_keys = max_keys
+        self._state: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def apply(self, key: str, now: float, update: Update) -> int:
+        with self._lock:
+            tats, violated = update(self._state.get(key))
+            if tats is None:
+                return violated
+            self._state[key] = tats
+            self._state.move_to_end(key)
+            self._evict(now)
+            return -1
+
+    def _evict(self, now: float) -> None:
+        state = self._state
+        while len(state) > self.max_keys:
+            state.popitem(last=False)
+            self.evictions += 1
+        # Amortised idle cleanup: look at a couple of the oldest keys per call
+        for _ in range(2):
+            if not state:
+                return
+            key, tats = next(iter(state.items()))
+            if max(tats) > now:
+                return
+            del state[key]
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+
+class SharedStore:
+    """
+    GCRA state in a local SQLite file so all workers on a host share limits.
+
+    Each check is one short ``BEGIN IMMEDIATE`` transaction; idle rows are
+    purged every ``purge_every`` checks.
+    """
+
+    def __init__(self, path: str, max_keys: int = 50_000, purge_every: int = 1000) -> None:
+        self.path = path
+        self.max_keys = max_keys
+        self.purge_every = purge_every
+        self._local = threading.local()
+        self._calls = 0
+        self.evictions = 0
+        conn = self._conn()
+        conn.execute("CREATE TABLE IF NOT EXISTS gcra (key TEXT PRIMARY KEY, tats TEXT NOT NULL, tat_max REAL NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS gcra_tat_max ON gcra (tat_max)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return conn
+
+    def apply(self, key: str, now: float, update: Update) -> int:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tats FROM gcra WHERE key = ?", (key,)).fetchone()
+            tats, violated = update([float(t) for t in row[0].split(",")] if row else None)
+            if tats is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO gcra (key, tats, tat_max) VALUES (?, ?, ?)",
+                    (key, ",".join(repr(t) for t in tats), max(tats)),
+                )
+            self._calls += 1
+            if self._calls % self.purge_every == 0:
+                self._purge(conn, now)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return -1 if tats is not None else violated
+
+    def _purge(self, conn: sqlite3.Connection, now: float) -> None:
+        cur = conn.execute("DELETE FROM gcra WHERE tat_max <= ?", (now,))
+        self.evictions += cur.rowcount
+        excess = len(self) - self.max_keys
+        if excess > 0:
+            cur = conn.execute(
+                "DELETE FROM gcra WHERE key IN (SELECT key FROM gcra ORDER BY tat_max LIMIT ?)", (excess,)
+            )
+            self.evictions += cur.rowcount
+
+    def __len__(self) -> int:
+        return int(self._conn().execute("SELECT COUNT(*) FROM gcra").fetchone()[0])
+
+
 class RateLimiter:
     """
-    Simple in-memory multi-layer rate limiter.
+    Multi-layer rate limiter using GCRA (generic cell rate algorithm).
 
     Layer 1: Per-IP limits
       - 10 requests/minute per IP
       - 1000 requests/day per IP (raised to be lenient during dev)
+      Each request spends ``cost`` units, so cheap routes and cache hits can
+      be charged a fraction of a full request.
 
     Layer 2: API-level limits (placeholder; Twelve Data limits enforced in fetcher)
       - Calls/min to external API handled by fetcher-level limiter
 
     Layer 3: Cache optimization handled by CacheManager
+
+    GCRA keeps a single arrival time per limit and key, so a check is O(1)
+    with no per-window buckets. State lives in a bounded in-process store, or
+    in a SQLite file shared by all workers when ``store_path`` is given.
     """
 
-    def __init__(self) -> None:
-        self.per_minute_limit = 10
-        self.per_day_limit = 1000
-        self._minute_buckets: Dict[str, Dict[str, int]] = {}
-        self._day_buckets: Dict[str, Dict[str, int]] = {}
+    def __init__(
+        self,
+        per_minute_limit: int = 10,
+        per_day_limit: int = 1000,
+        max_keys: int = 50_000,
+        store_path: Optional[str] = None,
+    ) -> None:
+        self.per_minute_limit = per_minute_limit
+        self.per_day_limit = per_day_limit
+        self._limits = (
+            (60.0, 60.0 / per_minute_limit, f"Rate limit exceeded: {per_minute_limit} requests/min per IP"),
+            (86400.0, 86400.0 / per_day_limit, "Daily limit exceeded"),
+        )
+        self.store = SharedStore(store_path, max_keys=max_keys) if store_path else MemoryStore(max_keys=max_keys)
         self.total_requests = 0
-
-    def _now(self) -> int:
-        return int(time.time())
-
-    def enforce(self, ip: str) -> None:
-        now = self._now()
-        minute = now // 60
-        day = now // 86400
-
-        # Minute bucket
-        minute_bucket = self._minute_buckets.setdefault(ip, {})
-        minute_count = minute_bucket.get(str(minute), 0) + 1
-        minute_bucket.clear()
-        minute_bucket[str(minute)] = minute_count
-
-        if minute_count > self.per_minute_limit:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Rate limit exceeded: 10 requests/min per IP",
-            )
-
-        # Day bucket
-        day_bucket = self._day_buckets.setdefault(ip, {})
-        day_count = day_bucket.get(str(day), 0) + 1
-        day_bucket.clear()
-        day_bucket[str(day)] = day_count
-
-        if day_count > self.per_day_limit:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Daily limit exceeded",
-            )
-
+        self.rejected_requests = 0
+
+    def _update(self, now: float, cost: float) -> Update:
+        def update(tats: Optional[List[float]]) -> Tuple[Optional[List[float]], int]:
+            new = []
+            for i, (period, interval, _) in enumerate(self._limits):
+                tat = max(tats[i], now) if tats else now
+                tat += cost * interval
+                if tat - now > period:
+                    return None, i
+                new.append(tat)
+            return new, -1
+
+        return update
+
+    def enforce(self, ip: str, cost: float = 1.0) -> None:
+        if cost > 0:
+            now = time.time()
+            violated = self.store.apply(ip, now, self._update(now, cost))
+            if violated >= 0:
+                self.rejected_requests += 1
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail=self._limits[violated][2],
+                )
         self.total_requests += 1
 
     def get_stats(self) -> Dict:
@@ -63,6 +183,9 @@ class RateLimiter:
             "per_minute_limit": self.per_minute_limit,
             "per_day_limit": self.per_day_limit,
             "total_requests": self.total_requests,
+            "rejected_requests": self.rejected_requests,
+            "tracked_clients": len(self.store),
+            "evicted_clients": self.store.evictions,
+            "shared": isinstance(self.store, SharedStore),
         }
 
-
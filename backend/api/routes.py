@@ -1,33 +1,111 @@
-from fastapi import APIRouter, Request, HTTPException
-from typing import Dict, List, Any
+from fastapi import APIRouter, Query, Request, Response, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from typing import Callable, Dict, List, Any, Tuple
+import asyncio
+import functools
+import json
+import re
 import time
 import pandas as pd
 
 from .rate_limiter import RateLimiter
+from .executors import io_pool, cpu_pool, get_pool_stats, shutdown_pools
+from .schemas import BatchRequest
+from .http_cache import cached_json_response, cached_response
+from . import columnar
+from .streaming import StreamHub, Subscriber
+from .instrumentation import TimedRoute
+from .admin import admin_router
 from ..data.cache_manager import CacheManager
+from ..data.bar_store import BarStore
+from ..data.sentiment_store import SentimentStore
+from ..data.fundamentals_table import FundamentalsTable
+from ..data.snapshot_table import SnapshotTable
+from ..data.intraday_store import IntradayStore
+from ..data.trending import TrendingBoard
+from ..data.warm_state import WarmState
 from ..data.fetcher import TwelveDataFetcher
 from ..ml.predictor import ThreeDayPredictor
-from ..indicators import volatility as vol_mod
-from ..indicators import momentum as mom_mod
-from ..indicators import risk as risk_mod
-from ..indicators import extreme_value as evt_mod
-from ..indicators import trend as trend_mod
+from ..ml.models.lstm_model import LSTMModel
+from ..ml.backtest import WalkForwardBacktester
+from ..scheduler.update_scheduler import UpdateScheduler
+from ..scheduler.batch_predictions import BatchPredictionJob
+from ..scheduler.access_tracker import AccessTracker
+from ..scheduler.prefetch import PrefetchJob
+from ..scheduler.fundamentals import FundamentalsJob
+from ..scheduler.screener import ScreenerJob
+from ..scheduler.intraday import IntradayPollJob
+from ..reddit.mentions import COMPANY_NAMES, MentionIndex
+from ..reddit.pipeline import SentimentPipeline
+from ..reddit.sources import PostSource, RedditSource, ReplaySource
+from ..utils.logger import get_logger
+from ..utils.market_hours import is_market_open, last_close
+from ..utils.metrics import REGISTRY, stage
+from ..utils.universe import read_universe
+from ..utils.warmup import warmup
+from ..indicators import bundle
+from ..indicators.fundamental import FIELDS as FUNDAMENTAL_FIELDS
 from ..config import settings
 
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
+router.include_router(admin_router)
 
 _start_time = time.time()
 _cache = CacheManager()
-_rate_limiter = RateLimiter()
-_fetcher = TwelveDataFetcher(settings.twelve_data_api_key)
-_predictor = ThreeDayPredictor()
+_rate_limiter = RateLimiter(
+    per_minute_limit=settings.rate_limit_per_minute,
+    per_day_limit=settings.rate_limit_per_day,
+    max_keys=settings.rate_limit_max_clients,
+    store_path=settings.rate_limit_store,
+)
+_fetcher = TwelveDataFetcher(
+    settings.twelve_data_api_key,
+    base_url=settings.twelve_data_base_url,
+    calls_per_minute=settings.twelve_data_calls_per_minute,
+)
+_bar_store = BarStore(settings.bar_store_dir, ttl_minutes=settings.bar_store_ttl_minutes)
+# Spilled intraday history gets its own small in-memory LRU so it never evicts daily bars;
+# the disk copy in the shared directory is what keeps it
+_intraday = IntradayStore(
+    BarStore(settings.bar_store_dir, ttl_minutes=7 * 24 * 60, max_entries=64),
+    interval=settings.intraday_interval,
+    capacity=settings.intraday_capacity,
+    max_tickers=settings.intraday_max_tickers,
+    history_bars=settings.intraday_history_bars,
+)
+_predictor = ThreeDayPredictor(lstm=LSTMModel.load_if_exists(settings.lstm_weights_path))
+_sentiment_store = SentimentStore(settings.sentiment_store_path)
+_fundamentals = FundamentalsTable(
+    settings.fundamentals_path,
+    ttl_days=settings.fundamentals_ttl_days,
+    refresh_hours=settings.fundamentals_refresh_hours,
+)
+_performance_cache = CacheManager(
+    cache_file="performance_cache.json", ttl_minutes=2 * settings.performance_refresh_minutes
+)
+_snapshot = SnapshotTable(
+    bundle.SCREENER_COLUMNS + FUNDAMENTAL_FIELDS,
+    indexed=("close", "change_1d_pct", "volume", "rsi", "macd_hist", "bb_percent_b", "pe_ratio", "market_cap"),
+)
+_scheduler = UpdateScheduler(
+    max_workers=settings.scheduler_workers, quick_workers=settings.scheduler_quick_workers
+)
+_access = AccessTracker()
+_logger = get_logger(__name__)
 
 TOP_30 = [
     "AAPL","MSFT","AMZN","GOOGL","META","NVDA","TSLA","BRK.B","JPM","V",
     "UNH","HD","MA","PG","XOM","AVGO","LLY","JNJ","WMT","CVX",
     "KO","PFE","BAC","DIS","PEP","ABBV","COST","CSCO","ADBE","NFLX"
 ]
+# Tickers the background jobs keep warm; the watchlist and backtest stay on TOP_30
+UNIVERSE = read_universe(settings.universe_path) if settings.universe_path else TOP_30
+
+# Rate-limit units charged per request; a full computation costs 1
+CACHED_HIT_COST = 0.25
+# Batch tickers that miss the cache cost as much as a single uncached request
+BATCH_MISS_COST = 1.0
 
 
 def _to_dataframe(values: List[Dict[str, Any]]) -> pd.DataFrame:
@@ -52,6 +130,330 @@ def _to_dataframe(values: List[Dict[str, Any]]) -> pd.DataFrame:
     return df[[c for c in ["Open","High","Low","Close","Volume"] if c in df.columns]]
 
 
+def _load_session_frames(tickers: List[str], outputsize: int) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    # Bars stored before the last close end in that session's partial bar; reload those
+    closed = last_close().timestamp()
+    for t in tickers:
+        loaded = _bar_store.loaded_at(_bars_key(t))
+        if loaded is not None and loaded < closed:
+            _bar_store.discard(_bars_key(t))
+    # _load_frames is defined with the batch routes below
+    return _load_frames(tickers, outputsize)
+
+
+_batch_predictions = BatchPredictionJob(
+    _load_session_frames,
+    _predictor,
+    _cache,
+    UNIVERSE + settings.hot_tickers,
+    sentiment=_sentiment_store.features_many,
+)
+
+
+def _fetch_frame(tkr: str, outputsize: int, interval: str = "1day") -> pd.DataFrame:
+    # Blocking fetch + parse, bypassing the bar store
+    with stage("fetch"):
+        values = _fetcher.get_time_series(tkr, interval=interval, outputsize=outputsize)
+    with stage("parse"):
+        return _to_dataframe(values)
+
+
+def _bars_key(tkr: str, interval: str = "1day") -> str:
+    return f"twelvedata:{interval}:{tkr}"
+
+
+def _load_frame(tkr: str, outputsize: int, interval: str = "1day") -> pd.DataFrame:
+    # Served from the shared bar store; a miss fetches at least bar_store_min_bars so
+    # the other routes' shorter windows reuse the same upstream call. Runs on the I/O pool.
+    df = _bar_store.get_or_load(
+        _bars_key(tkr, interval),
+        max(outputsize, settings.bar_store_min_bars),
+        lambda size: _fetch_frame(tkr, size, interval),
+    )
+    return df.tail(outputsize)
+
+
+_stream_hub = StreamHub(
+    # Streams read through the bar store, so all feeds and routes share one upstream load per TTL
+    _load_frame,
+    io_pool.run,
+    poll_seconds=settings.stream_poll_seconds,
+    max_queue=settings.stream_queue_size,
+    max_drops=settings.stream_max_drops,
+    max_feeds=settings.stream_max_feeds,
+)
+# Only symbols the background jobs already cover can be streamed
+_STREAMABLE = frozenset(UNIVERSE + settings.hot_tickers)
+
+
+def refresh_performance() -> None:
+    """Backtest the universe and store the metrics served by ``/performance``."""
+    frames = {}
+    for t in TOP_30:
+        # Started off-hours; loads that would run into the session wait for the next close
+        if is_market_open():
+            _logger.info("performance: market opened, backtest deferred")
+            return
+        try:
+            df = _load_frame(t, settings.backtest_history_bars)
+            if not df.empty:
+                frames[t] = df
+        except Exception as e:
+            _logger.warning("performance: skipping %s: %s", t, e)
+    if not frames:
+        return
+    result = WalkForwardBacktester(
+        max_workers=settings.backtest_workers, lstm_weights_path=settings.lstm_weights_path
+    ).run(frames)
+    _performance_cache.set("performance", result)
+
+
+def _predict_frames(frames: Dict[str, pd.DataFrame]) -> Dict[str, Dict]:
+    return _predictor.predict_frames(frames, _sentiment_store.features_many(frames))
+
+
+def _stock_payloads(frames: Dict[str, pd.DataFrame]) -> Dict[str, Dict]:
+    return bundle.stock_payloads(frames, _fundamentals.get_many(frames))
+
+
+# Prefetchable responses: prefix -> (bars needed, compute over {ticker: frame})
+_PREFETCH = {
+    "stock": (200, _stock_payloads),
+    "predict": (120, _predict_frames),
+}
+
+
+def _prefetch(keys: List[str]) -> Dict[str, str]:
+    """Recompute cache entries such as ``stock:AAPL`` from fresh bars; returns per-key errors."""
+    by_prefix: Dict[str, List[str]] = {}
+    for key in keys:
+        prefix, _, tkr = key.partition(":")
+        by_prefix.setdefault(prefix, []).append(tkr)
+    tickers = sorted({t for ts in by_prefix.values() for t in ts})
+    # The entries were computed from bars about as old as themselves
+    for t in tickers:
+        _bar_store.discard(_bars_key(t))
+    frames, failed = _load_frames(tickers, max(size for size, _ in _PREFETCH.values()))
+    errors = {}
+    for prefix, ts in by_prefix.items():
+        size, compute = _PREFETCH[prefix]
+        computed = compute({t: frames[t].tail(size) for t in ts if t in frames})
+        fresh = {f"{prefix}:{t}": p for t, p in computed.items() if "error" not in p}
+        if fresh:
+            _cache.set_many(fresh)
+        errors.update({f"{prefix}:{t}": failed.get(t, "No result") for t in ts if f"{prefix}:{t}" not in fresh})
+    return errors
+
+
+_prefetch_job = PrefetchJob(
+    _access,
+    _cache,
+    _prefetch,
+    prefixes=tuple(_PREFETCH),
+    lead_seconds=settings.prefetch_lead_seconds,
+    max_keys=settings.prefetch_max_keys,
+    min_hits=settings.prefetch_min_hits,
+)
+
+# Daily bars only change after the close, so the backtest and the post-close
+# prediction batch keep running off-hours; prefetching idles until the open.
+# The backtest loads the whole top 30, so it never runs during the session,
+# where its misses would spend the provider quota price requests need.
+_scheduler.add_job(
+    "performance",
+    refresh_performance,
+    interval_seconds=None,
+    closed_interval_seconds=settings.performance_refresh_minutes * 60,
+    run_at_start=not is_market_open(),
+)
+_scheduler.add_job(
+    "batch_predictions",
+    _batch_predictions,
+    interval_seconds=settings.batch_prediction_check_minutes * 60,
+    closed_interval_seconds=settings.batch_prediction_check_minutes * 60,
+)
+_scheduler.add_job("prefetch", _prefetch_job, interval_seconds=settings.prefetch_interval_seconds, run_at_start=False)
+_scheduler.add_job(
+    "access_decay",
+    _access.decay,
+    interval_seconds=settings.access_decay_minutes * 60,
+    closed_interval_seconds=settings.access_decay_minutes * 60,
+    run_at_start=False,
+    quick=True,
+)
+
+
+def _universe() -> List[str]:
+    # The fixed universe plus whatever users have been asking for
+    requested = [key.partition(":")[2] for key, _ in _access.top(100) if key.startswith("stock:")]
+    return UNIVERSE + settings.hot_tickers + requested
+
+
+_fundamentals_job = FundamentalsJob(
+    _fetcher,
+    _fundamentals,
+    _universe,
+    max_per_run=settings.fundamentals_max_per_run,
+    # Screener rows pick up new fundamentals without waiting for their next bar
+    on_loaded=_snapshot.update_columns,
+)
+# Off-hours only, so price requests keep the provider quota during the session;
+# an empty table started mid-session waits for the close like a regular run
+_scheduler.add_job(
+    "fundamentals",
+    _fundamentals_job,
+    interval_seconds=None,
+    closed_interval_seconds=settings.fundamentals_check_minutes * 60,
+    run_at_start=_fundamentals.get_stats()["tickers"] == 0 and not is_market_open(),
+)
+
+
+# Event loop serving the app, set at startup so scheduler threads can hand it pool work
+_app_loop: Dict[str, asyncio.AbstractEventLoop] = {}
+
+
+def _screener_rows(frames: Dict[str, pd.DataFrame]) -> Dict[str, Dict]:
+    # Runs on a scheduler thread. The CPU pool call is made on the app loop, so it is
+    # counted with request work and refused with a 503 when the pool is saturated.
+    future = asyncio.run_coroutine_threadsafe(cpu_pool.run(bundle.screener_rows, frames), _app_loop["loop"])
+    return future.result()
+
+
+_screener_job = ScreenerJob(
+    _snapshot,
+    # _load_frames is defined with the batch routes below
+    lambda tickers, size: _load_frames(tickers, size),
+    _screener_rows,
+    _universe,
+    extra=_fundamentals.get_many,
+    bars=settings.bar_store_min_bars,
+    max_age_seconds=settings.screener_max_age_minutes * 60,
+    max_per_run=settings.screener_max_per_run,
+)
+# Every frame the bar store receives, from any route, refreshes its screener row and rankings
+_bar_store.subscribe(_screener_job.on_bars)
+_trending = TrendingBoard(members=UNIVERSE + settings.hot_tickers)
+_bar_store.subscribe(_trending.on_bars)
+# In session a run only turns queued frames into rows; the universe sweep waits for the close
+_scheduler.add_job(
+    "screener",
+    _screener_job,
+    interval_seconds=settings.screener_refresh_seconds,
+    closed_interval_seconds=settings.screener_closed_minutes * 60,
+)
+_intraday_job = IntradayPollJob(
+    _fetcher,
+    _intraday,
+    lambda: settings.intraday_tickers,
+    parse=_to_dataframe,
+    reserve_credits=settings.intraday_reserve_credits,
+)
+# Opt-in: every poll spends provider credits, so only the configured tickers are polled.
+# Intraday bars only move during the session; spilling continues until the close is written
+if settings.intraday_tickers:
+    _scheduler.add_job("intraday", _intraday_job, interval_seconds=settings.intraday_poll_seconds)
+
+
+def _fill_trending() -> None:
+    # Loads feed the board through the bar store; already ranked members are skipped
+    missing = _trending.missing()
+    if missing:
+        _load_frames(missing, _trending.lookback + 2)
+
+
+# Started on demand by /trending while the board is short of members, and off-hours
+# after the screener sweep; the scheduler never runs two fills at once
+_trending_fill = _scheduler.add_job(
+    "trending_fill",
+    _fill_trending,
+    interval_seconds=None,
+    closed_interval_seconds=settings.screener_closed_minutes * 60,
+    run_at_start=False,
+)
+_scheduler.add_job(
+    "intraday_spill",
+    _intraday.spill,
+    interval_seconds=settings.intraday_spill_minutes * 60,
+    closed_interval_seconds=settings.intraday_spill_minutes * 60,
+    run_at_start=False,
+    quick=True,
+)
+_warm_state = WarmState(settings.warm_snapshot_path)
+# Screener rows before bars, so the restored bars find their rows current and are not recomputed;
+# trending is rebuilt from the bars as they are restored
+_warm_state.register("screener", _snapshot.export_state, _snapshot.restore_state)
+_warm_state.register("bars", _bar_store.export_state, _bar_store.restore_state)
+_warm_state.register("intraday", _intraday.export_state, _intraday.restore_state)
+_scheduler.add_job(
+    "warm_snapshot",
+    _warm_state.save,
+    interval_seconds=settings.warm_snapshot_minutes * 60,
+    closed_interval_seconds=settings.warm_snapshot_minutes * 60,
+    run_at_start=False,
+    quick=True,
+)
+_scheduler.add_job(
+    "sentiment_save",
+    _sentiment_store.save,
+    interval_seconds=settings.sentiment_save_minutes * 60,
+    closed_interval_seconds=settings.sentiment_save_minutes * 60,
+    run_at_start=False,
+    quick=True,
+)
+
+
+_mentions = (
+    MentionIndex.from_file(settings.mention_universe_path or settings.universe_path)
+    if settings.mention_universe_path or settings.universe_path
+    else MentionIndex(TOP_30 + settings.hot_tickers, COMPANY_NAMES)
+)
+_sentiment = SentimentPipeline(
+    extract=_mentions,
+    sinks=[_sentiment_store.add],
+    workers=settings.sentiment_workers,
+    kind=settings.cpu_pool_kind,
+    batch_size=settings.sentiment_batch_size,
+    queue_size=settings.sentiment_queue_size,
+)
+
+
+def _sentiment_source() -> PostSource | None:
+    if settings.sentiment_replay_path:
+        return ReplaySource(settings.sentiment_replay_path)
+    if settings.reddit_client_id:
+        return RedditSource(settings.reddit_subreddits, poll_seconds=settings.reddit_poll_seconds)
+    return None
+
+
+# Fork the CPU workers before traffic arrives instead of on the first computation
+warmup.register("cpu_pool", lambda: cpu_pool.executor.submit(abs, 0).result())
+
+
+@router.on_event("startup")
+async def start_background_jobs() -> None:
+    _app_loop["loop"] = asyncio.get_running_loop()
+    # Map the last snapshot before any job can go upstream for the same bars
+    await io_pool.run(_warm_state.restore)
+    warmup.start()
+    _scheduler.start()
+    source = _sentiment_source()
+    if source is not None:
+        _sentiment.start(source)
+
+
+@router.on_event("shutdown")
+async def stop_background_jobs() -> None:
+    _scheduler.stop()
+    _sentiment.stop()
+    _sentiment_store.save()
+    try:
+        _warm_state.save()
+    except Exception as e:
+        # Best effort like the other saves; a stale snapshot only costs a colder start
+        _logger.warning("warm snapshot not saved at shutdown: %s", e)
+    shutdown_pools()
+
+
 @router.get("/health")
 async def health() -> Dict:
     uptime_seconds = int(time.time() - _start_time)
@@ -60,94 +462,227 @@ async def health() -> Dict:
         "uptime": uptime_seconds,
         "cache_stats": _cache.get_stats(),
         "rate_limiter": _rate_limiter.get_stats(),
+        "executors": get_pool_stats(),
     }
 
 
+@router.get("/ready")
+async def ready(full: bool = False) -> JSONResponse:
+    """
+    Readiness probe.
+
+    200 as soon as the worker serves requests (light traffic). With
+    ``full=true`` it answers 503 until every background warm-up task has
+    succeeded, and keeps answering 503 (status ``failed``) if one failed.
+    """
+    stats = warmup.get_stats()
+    status = "ready" if stats["ready"] else "failed" if stats["failed"] else "warming"
+    code = 503 if full and not stats["ready"] else 200
+    return JSONResponse({"status": status, "accepting_traffic": True, "warmup": stats}, status_code=code)
+
+
 @router.get("/predict/{ticker}")
-async def predict_ticker(ticker: str, request: Request) -> Dict:
+async def predict_ticker(ticker: str, request: Request) -> Response:
     client_ip = request.client.host if request.client else "unknown"
-    _rate_limiter.enforce(client_ip)
     tkr = ticker.upper()
-    cached = _cache.get(f"predict:{tkr}")
+    _access.record(f"predict:{tkr}")
+    cached = _cache.get_encoded(f"predict:{tkr}")
+    with stage("rate_limit"):
+        _rate_limiter.enforce(client_ip, cost=CACHED_HIT_COST if cached else 1.0)
     if cached:
-        return cached
+        return cached_json_response(request, cached)
     try:
-        ts = _fetcher.get_time_series(tkr, interval="1day", outputsize=120)
-        df = _to_dataframe(ts)
+        df = await io_pool.run(_load_frame, tkr, 120)
         if df.empty:
             raise HTTPException(status_code=404, detail="No data")
-        result = await _predictor.predict(tkr, df)
-        _cache.set(f"predict:{tkr}", result)
-        return result
+        with stage("predict"):
+            result = await cpu_pool.run(_predictor.predict_sync, tkr, df, _sentiment_store.features(tkr))
+        entry = await io_pool.run(_cache.set, f"predict:{tkr}", result)
+        return cached_json_response(request, entry)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/stock/{ticker}")
-async def stock_analysis(ticker: str, request: Request) -> Dict:
+async def stock_analysis(ticker: str, request: Request) -> Response:
     client_ip = request.client.host if request.client else "unknown"
-    _rate_limiter.enforce(client_ip)
     tkr = ticker.upper()
-    cached = _cache.get(f"stock:{tkr}")
+    _access.record(f"stock:{tkr}")
+    cached = _cache.get_encoded(f"stock:{tkr}")
+    with stage("rate_limit"):
+        _rate_limiter.enforce(client_ip, cost=CACHED_HIT_COST if cached else 1.0)
     if cached:
-        return cached
-    ts = _fetcher.get_time_series(tkr, interval="1day", outputsize=200)
-    df = _to_dataframe(ts)
+        return cached_json_response(request, cached)
+    df = await io_pool.run(_load_frame, tkr, 200)
     if df.empty:
         raise HTTPException(status_code=404, detail="No data")
+    with stage("indicators"):
+        payload = await cpu_pool.run(bundle.stock_payload, tkr, df, _fundamentals.get(tkr))
+    entry = await io_pool.run(_cache.set, f"stock:{tkr}", payload)
+    return cached_json_response(request, entry)
+
+
+def _load_frames(tickers: List[str], outputsize: int) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    # Bar store first, then one multi-symbol upstream fetch; returns parsed frames and per-ticker errors
+    size = max(outputsize, settings.bar_store_min_bars)
+    frames, errors = {}, {}
+    for t in tickers:
+        df = _bar_store.get(_bars_key(t), size)
+        if df is not None:
+            frames[t] = df.tail(outputsize)
+    missing = [t for t in tickers if t not in frames]
+    if not missing:
+        return frames, errors
+    try:
+        with stage("fetch_batch"):
+            series = _fetcher.get_time_series_batch(missing, interval="1day", outputsize=size)
+    except Exception as e:
+        return frames, {t: str(e) for t in missing}
+    with stage("parse"):
+        for t in missing:
+            df = _to_dataframe(series.get(t, []))
+            if df.empty:
+                errors[t] = "No data"
+            else:
+                _bar_store.put(_bars_key(t), df, size)
+                frames[t] = df.tail(outputsize)
+    return frames, errors
+
+
+async def _batch(
+    body: BatchRequest, request: Request, prefix: str, outputsize: int, compute: Callable[[Dict], Dict]
+) -> Dict:
+    client_ip = request.client.host if request.client else "unknown"
+    for t in body.tickers:
+        _access.record(f"{prefix}:{t}")
+    cached = _cache.get_many([f"{prefix}:{t}" for t in body.tickers])
+    results = {t: cached[f"{prefix}:{t}"] for t in body.tickers if f"{prefix}:{t}" in cached}
+    misses = [t for t in body.tickers if t not in results]
+    # Uncached tickers past the cap are left for a later request, not computed
+    misses, deferred = misses[:settings.batch_max_misses], misses[settings.batch_max_misses:]
+    with stage("rate_limit"):
+        _rate_limiter.enforce(client_ip, cost=CACHED_HIT_COST + BATCH_MISS_COST * len(misses))
+    errors: Dict[str, str] = {t: "Not cached; too many uncached tickers in one request" for t in deferred}
+    fresh: Dict[str, Dict] = {}
+    if misses:
+        frames, failed = await io_pool.run(_load_frames, misses, outputsize)
+        errors.update(failed)
+        with stage(f"{prefix}_batch"):
+            computed = await cpu_pool.run(compute, frames) if frames else {}
+        for t, payload in computed.items():
+            if "error" in payload:
+                errors[t] = payload["error"]
+            else:
+                fresh[t] = payload
+        if fresh:
+            await io_pool.run(_cache.set_many, {f"{prefix}:{t}": p for t, p in fresh.items()})
+    results.update(fresh)
+    return {
+        "results": {t: results[t] for t in body.tickers if t in results},
+        "errors": errors,
+        "cached": len(results) - len(fresh),
+    }
 
-    # Indicators
-    atr = vol_mod.calculate_atr(df)
-    bb = vol_mod.calculate_bollinger_bands(df["Close"]) if "Close" in df else {}
-    hv = vol_mod.calculate_historical_volatility(df["Close"].pct_change().dropna()) if "Close" in df else None
-    macdv = mom_mod.calculate_macd_v(df)
-    rsi = mom_mod.calculate_rsi(df["Close"]) if "Close" in df else {"rsi": None}
-    stoch = mom_mod.calculate_stochastic(df)
-    mdd = risk_mod.calculate_max_drawdown(df["Close"]) if "Close" in df else {"max_drawdown": None}
-    var = risk_mod.calculate_var(df["Close"].pct_change().dropna()) if "Close" in df else {"var": None, "cvar": None}
-    tail = evt_mod.calculate_tail_risk(df["Close"].pct_change().dropna()) if "Close" in df else {}
-
-    payload = {
+
+@router.post("/stock/batch")
+async def stock_batch(body: BatchRequest, request: Request) -> Dict:
+    compute = functools.partial(bundle.stock_payloads, fundamentals=_fundamentals.get_many(body.tickers))
+    return await _batch(body, request, "stock", 200, compute)
+
+
+@router.post("/predict/batch")
+async def predict_batch(body: BatchRequest, request: Request) -> Dict:
+    compute = functools.partial(_predictor.predict_frames, sentiment=_sentiment_store.features_many(body.tickers))
+    return await _batch(body, request, "predict", 120, compute)
+
+
+@router.get("/sentiment/{ticker}")
+async def sentiment(ticker: str, request: Request) -> Dict:
+    """Rolling social sentiment for ``ticker`` over the store's window."""
+    client_ip = request.client.host if request.client else "unknown"
+    _rate_limiter.enforce(client_ip, cost=CACHED_HIT_COST)
+    features = _sentiment_store.features(ticker)
+    if features is None:
+        return {"ticker": ticker.upper(), "mentions": 0, "label": "Neutral", "consistency": 0.5}
+    return features
+
+
+@router.get("/intraday/{ticker}")
+async def intraday(ticker: str, request: Request, bars: int = 120) -> Dict:
+    """Latest intraday bar and indicators over the newest ``bars`` bars."""
+    client_ip = request.client.host if request.client else "unknown"
+    _rate_limiter.enforce(client_ip, cost=CACHED_HIT_COST)
+    if not 1 <= bars <= settings.intraday_history_bars:
+        raise HTTPException(status_code=400, detail=f"bars must be between 1 and {settings.intraday_history_bars}")
+    tkr = ticker.upper()
+    df = await io_pool.run(_intraday.history, tkr, bars)
+    if df.empty:
+        raise HTTPException(status_code=404, detail=f"No intraday bars for {tkr}")
+    row = await cpu_pool.run(bundle.screener_row, df)
+    last = df.iloc[-1]
+    return {
         "ticker": tkr,
-        "current_price": float(df["Close"].iloc[-1]) if "Close" in df and not df.empty else None,
-        "volatility": {
-            "atr": float(atr.iloc[-1]) if len(atr) else None,
-            "bollinger": {k: (float(v.iloc[-1]) if hasattr(v, "iloc") else None) for k, v in bb.items()} if bb else {},
-            "historical_volatility": hv,
-        },
-        "momentum": {
-            "macd_v": float(macdv["macd_v"].iloc[-1]) if len(macdv["macd_v"]) else None,
-            "signal": float(macdv["signal"].iloc[-1]) if len(macdv["signal"]) else None,
-            "hist": float(macdv["hist"].iloc[-1]) if len(macdv["hist"]) else None,
-            "rsi": float(rsi.get("rsi").iloc[-1]) if rsi.get("rsi") is not None else None,
-            "stochastic": {
-                "k": float(stoch["%K"].iloc[-1]) if len(stoch["%K"]) else None,
-                "d": float(stoch["%D"].iloc[-1]) if len(stoch["%D"]) else None,
-            },
-        },
-        "risk": {
-            "max_drawdown": mdd.get("max_drawdown"),
-            "var": var.get("var"),
-            "cvar": var.get("cvar"),
-            "tail_risk": tail,
-        },
+        "interval": settings.intraday_interval,
+        "bars": len(df),
+        "as_of": str(df.index[-1]),
+        "last": {c.lower(): (None if pd.isna(last[c]) else float(last[c])) for c in df.columns},
+        "indicators": {k: (None if pd.isna(v) else v) for k, v in row.items()},
     }
-    _cache.set(f"stock:{tkr}", payload)
-    return payload
 
 
-@router.get("/watchlist")
-async def get_watchlist(request: Request) -> Dict:
+_WHERE = re.compile(r"^\s*([a-z0-9_]+)\s*(<=|>=|==|!=|<|>)\s*(\S+)\s*$")
+
+
+def _parse_where(expr: str) -> Tuple[str, str, Any]:
+    match = _WHERE.match(expr.lower())
+    if not match:
+        raise HTTPException(status_code=400, detail=f"Bad filter: {expr!r} (expected e.g. rsi<30 or close>sma_200)")
+    column, op, value = match.groups()
+    try:
+        return column, op, float(value)
+    except ValueError:
+        return column, op, value
+
+
+@router.get("/screener")
+async def screener(
+    request: Request,
+    where: List[str] = Query([]),
+    sort: str | None = None,
+    limit: int = 50,
+    columns: str | None = None,
+) -> Dict:
+    """
+    Screen the snapshot of the whole universe, e.g.
+    ``/screener?where=rsi<30&where=close>sma_200&sort=-volume&limit=20``.
+
+    Filters compare a column with a number or another column; ``sort``
+    takes a column, prefixed with ``-`` for descending.
+    """
     client_ip = request.client.host if request.client else "unknown"
-    _rate_limiter.enforce(client_ip)
-    cached = _cache.get("watchlist")
-    if cached:
-        return cached
+    _rate_limiter.enforce(client_ip, cost=CACHED_HIT_COST)
+    if not 1 <= limit <= 1000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
+    filters = [_parse_where(w) for w in where]
+    descending = bool(sort) and sort.startswith("-")
+    sort_column = sort.lstrip("-").lower() if sort else None
+    selected = [c.strip().lower() for c in columns.split(",") if c.strip()] if columns else None
+    started = time.perf_counter()
+    try:
+        result = _snapshot.query(filters, sort_column, descending, limit, selected)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Unknown column: {e.args[0]}")
+    result["query_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return result
+
+
+def _watchlist_items() -> List[Dict]:
     items = []
     for t in TOP_30:
         try:
-            ts = _fetcher.get_time_series(t, outputsize=2)
-            df = _to_dataframe(ts)
+            df = _load_frame(t, 2)
             if not df.empty:
                 last = float(df["Close"].iloc[-1])
                 prev = float(df["Close"].iloc[-2]) if len(df) > 1 else last
@@ -155,93 +690,255 @@ async def get_watchlist(request: Request) -> Dict:
                 items.append({"ticker": t, "price": last, "change_pct": round(change_pct, 2)})
         except Exception:
             continue
-    payload = {"watchlist": items}
-    _cache.set("watchlist", payload)
-    return payload
+    return items
+
+
+@router.get("/watchlist")
+async def get_watchlist(request: Request) -> Response:
+    client_ip = request.client.host if request.client else "unknown"
+    cached = _cache.get_encoded("watchlist")
+    with stage("rate_limit"):
+        _rate_limiter.enforce(client_ip, cost=CACHED_HIT_COST if cached else 1.0)
+    if cached:
+        return cached_json_response(request, cached)
+    payload = {"watchlist": await io_pool.run(_watchlist_items)}
+    entry = await io_pool.run(_cache.set, "watchlist", payload)
+    return cached_json_response(request, entry)
 
 
 @router.post("/watchlist/refresh")
-async def refresh_watchlist(request: Request) -> Dict:
+async def refresh_watchlist(request: Request) -> Response:
     client_ip = request.client.host if request.client else "unknown"
     _rate_limiter.enforce(client_ip)
     # Invalidate and rebuild
-    _cache.set("watchlist", None)
+    await io_pool.run(_cache.set, "watchlist", None)
     return await get_watchlist(request)
 
 
 @router.get("/trending")
-async def trending(limit: int = 10, request: Request = None) -> Dict:
+async def trending(
+    limit: int = 10, metric: str = "change_5d_pct", ascending: bool = False, request: Request = None
+) -> Dict:
+    """
+    Top tickers by ``change_5d_pct``, ``volume_spike`` or
+    ``volatility_breakout`` (``ascending`` for the bottom), served from
+    rankings kept current as bars arrive.
+    """
     if request and request.client:
-        _rate_limiter.enforce(request.client.host)
-    items = []
-    for t in TOP_30:
-        try:
-            ts = _fetcher.get_time_series(t, outputsize=6)
-            df = _to_dataframe(ts)
-            if not df.empty:
-                last = float(df["Close"].iloc[-1])
-                prev5 = float(df["Close"].iloc[-5]) if len(df) > 5 else float(df["Close"].iloc[0])
-                change_pct = ((last - prev5) / prev5) * 100 if prev5 else 0.0
-                vol = float(df["Volume"].iloc[-1]) if "Volume" in df else None
-                items.append({"ticker": t, "change_5d_pct": round(change_pct, 2), "volume": vol})
-        except Exception:
-            continue
-    items.sort(key=lambda x: x.get("change_5d_pct", 0), reverse=True)
-    return {"trending": items[: max(1, min(limit, 50))]}
+        _rate_limiter.enforce(request.client.host, cost=CACHED_HIT_COST)
+    if metric not in TrendingBoard.METRICS:
+        raise HTTPException(status_code=400, detail=f"metric must be one of {', '.join(TrendingBoard.METRICS)}")
+    retry_after = (_trending_fill.last_success or 0) + settings.trending_fill_retry_minutes * 60
+    if _trending.missing() and not _trending_fill.running and time.time() >= retry_after:
+        # Cold start: fill in the background instead of loading the universe per request
+        _scheduler.run_now("trending_fill")
+        if not len(_trending):
+            return {"metric": metric, "status": "pending", "trending": []}
+    return {"metric": metric, "trending": _trending.top(metric, max(1, min(limit, 50)), ascending)}
 
 
 @router.get("/indicators/{ticker}")
-async def indicators(ticker: str, request: Request, indicators: str = "all") -> Dict:
+async def indicators(ticker: str, request: Request, indicators: str = "all") -> Response:
+    """
+    Chart series for ``ticker``.
+
+    JSON by default. Clients sending ``Accept: application/vnd.traderblock.columns+f32``
+    (or the Arrow stream type, when pyarrow is installed) get aligned binary
+    columns, gzip-compressed if ``Accept-Encoding`` allows.
+    """
     client_ip = request.client.host if request.client else "unknown"
-    _rate_limiter.enforce(client_ip)
     tkr = ticker.upper()
-    ts = _fetcher.get_time_series(tkr, outputsize=200)
-    df = _to_dataframe(ts)
-    if df.empty:
-        raise HTTPException(status_code=404, detail="No data")
-    payload = {
-        "ticker": tkr,
-        "close": df["Close"].dropna().tail(120).tolist() if "Close" in df else [],
-        "atr": vol_mod.calculate_atr(df).dropna().tail(120).tolist(),
-        "bollinger": {
-            "upper": vol_mod.calculate_bollinger_bands(df["Close"]).get("upper").dropna().tail(120).tolist(),
-            "middle": vol_mod.calculate_bollinger_bands(df["Close"]).get("middle").dropna().tail(120).tolist(),
-            "lower": vol_mod.calculate_bollinger_bands(df["Close"]).get("lower").dropna().tail(120).tolist(),
-        },
-        "rsi": mom_mod.calculate_rsi(df["Close"]).get("rsi").dropna().tail(120).tolist(),
-        "stochastic": {
-            "k": mom_mod.calculate_stochastic(df).get("%K").dropna().tail(120).tolist(),
-            "d": mom_mod.calculate_stochastic(df).get("%D").dropna().tail(120).tolist(),
-        },
-        "ema": {
-            "ema20": trend_mod.ema(df["Close"], 20).dropna().tail(120).tolist(),
-            "ema50": trend_mod.ema(df["Close"], 50).dropna().tail(120).tolist(),
-            "ema200": trend_mod.ema(df["Close"], 200).dropna().tail(120).tolist(),
-        },
-        "sma": {
-            "sma20": trend_mod.sma(df["Close"], 20).dropna().tail(120).tolist(),
-            "sma50": trend_mod.sma(df["Close"], 50).dropna().tail(120).tolist(),
-            "sma200": trend_mod.sma(df["Close"], 200).dropna().tail(120).tolist(),
-        },
-    }
-    return payload
+    fmt = columnar.negotiate(request.headers.get("accept"))
+    gzipped = fmt != "json" and columnar.wants_gzip(request.headers.get("accept-encoding"))
+    key = f"indicators:{tkr}" if fmt == "json" else f"indicators:{tkr}:{fmt}{':gzip' if gzipped else ''}"
+    cached = _cache.get_encoded(key) if fmt == "json" else _cache.get_bytes(key)
+    with stage("rate_limit"):
+        _rate_limiter.enforce(client_ip, cost=CACHED_HIT_COST if cached else 1.0)
+    if not cached:
+        df = await io_pool.run(_load_frame, tkr, 200)
+        if df.empty:
+            raise HTTPException(status_code=404, detail="No data")
+        if fmt == "json":
+            with stage("indicators"):
+                payload = await cpu_pool.run(bundle.indicator_series, tkr, df)
+            cached = await io_pool.run(_cache.set, key, payload)
+        else:
+            with stage("indicators_columnar"):
+                body = await cpu_pool.run(columnar.encode_indicators, tkr, df, fmt, gzipped)
+            cached = _cache.set_bytes(key, body)
+    if fmt == "json":
+        return cached_response(request, cached, headers={"Vary": "Accept"})
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+    media_type = columnar.F32_MEDIA_TYPE if fmt == "f32" else columnar.ARROW_MEDIA_TYPE
+    return cached_response(request, cached, media_type=media_type, headers=headers)
+
+
+def _subscribe(sub: Subscriber, tickers: List[str], client_ip: str) -> Tuple[Dict[str, str], bool]:
+    """
+    Subscribe ``sub`` to ``tickers``, charging one request per new ticker.
+    Returns the rejected tickers with reasons, and whether the rate limit
+    stopped the rest.
+    """
+    rejected: Dict[str, str] = {}
+    limited = False
+    for t in dict.fromkeys(t.strip().upper() for t in tickers):
+        if not t or t in sub.tickers:
+            continue
+        if t not in _STREAMABLE:
+            rejected[t] = "Not a streamable symbol"
+        elif limited:
+            rejected[t] = "Rate limit exceeded"
+        elif len(sub.tickers) >= settings.stream_max_tickers:
+            rejected[t] = f"At most {settings.stream_max_tickers} tickers per connection"
+        elif not _stream_hub.can_subscribe(t):
+            rejected[t] = "Streaming capacity reached"
+        else:
+            try:
+                _rate_limiter.enforce(client_ip)
+            except HTTPException as e:
+                rejected[t], limited = e.detail, True
+                continue
+            _stream_hub.subscribe(sub, t)
+    return rejected, limited
+
+
+@router.websocket("/ws/stream")
+async def stream_ws(websocket: WebSocket) -> None:
+    """
+    Push updates for subscribed tickers.
+
+    Client messages: ``{"action": "subscribe" | "unsubscribe", "tickers": [...]}``.
+    Each subscribed ticker is charged as one request; rejected tickers come
+    back as ``error`` messages.
+    """
+    client_ip = websocket.client.host if websocket.client else "unknown"
+    await websocket.accept()
+    sub = _stream_hub.new_subscriber()
+
+    async def reader() -> None:
+        while True:
+            msg = await websocket.receive_json()
+            tickers = [str(t) for t in msg.get("tickers", [])]
+            if msg.get("action") == "unsubscribe":
+                for t in tickers:
+                    _stream_hub.unsubscribe(sub, t)
+            else:
+                for t, detail in _subscribe(sub, tickers, client_ip)[0].items():
+                    sub.offer({"type": "error", "ticker": t, "detail": detail})
+
+    reader_task = asyncio.create_task(reader())
+    try:
+        while not sub.closed and not reader_task.done():
+            try:
+                message = await asyncio.wait_for(sub.queue.get(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+            await websocket.send_json(message)
+        if sub.closed:
+            await websocket.close(code=1013, reason="Slow consumer")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        reader_task.cancel()
+        _stream_hub.disconnect(sub)
+
+
+@router.get("/stream/sse")
+async def stream_sse(tickers: str, request: Request) -> StreamingResponse:
+    client_ip = request.client.host if request.client else "unknown"
+    sub = _stream_hub.new_subscriber()
+    rejected, limited = _subscribe(sub, tickers.split(","), client_ip)
+    if not sub.tickers:
+        raise HTTPException(status_code=429 if limited else 400, detail={"rejected": rejected})
+    for t, detail in rejected.items():
+        sub.offer({"type": "error", "ticker": t, "detail": detail})
+
+    async def events():
+        try:
+            while not sub.closed and not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(sub.queue.get(), timeout=15.0)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+        finally:
+            _stream_hub.disconnect(sub)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 
 @router.get("/performance")
 async def performance() -> Dict:
-    # Placeholder performance stats to be replaced with tracked metrics
+    # Served from the periodically refreshed backtest; never computed per request
+    cached = _performance_cache.get("performance")
+    if cached:
+        return cached
     return {
-        "strategy_accuracy_3d": 0.6,
-        "baseline_accuracy": 0.5,
-        "avg_confidence": 0.65,
+        "status": "pending",
+        "strategy_accuracy_3d": None,
+        "baseline_accuracy": None,
+        "avg_confidence": None,
     }
 
 
+def _family(name: str, kind: str, help_text: str, samples: List[Tuple[Dict, float]]) -> Tuple:
+    return name, kind, help_text, [(name, labels, value) for labels, value in samples]
+
+
+def _collect_runtime_metrics() -> List[Tuple]:
+    # Scrape-time view of counters the components already keep
+    pools = get_pool_stats()
+    caches = {c.name: c.get_stats() for c in (_cache, _performance_cache)}
+    limiter = _rate_limiter.get_stats()
+    return [
+        _family("traderblock_executor_in_flight", "gauge", "Calls running or queued per executor pool",
+                [({"pool": n}, p["in_flight"]) for n, p in pools.items()]),
+        _family("traderblock_executor_queued", "gauge", "Calls waiting for a worker per executor pool",
+                [({"pool": n}, p["queued"]) for n, p in pools.items()]),
+        _family("traderblock_executor_rejected_total", "counter", "Calls shed because the pool was saturated",
+                [({"pool": n}, p["rejected"]) for n, p in pools.items()]),
+        _family("traderblock_cache_requests_total", "counter", "Cache lookups by result",
+                [({"cache": n, "result": r}, c[k]) for n, c in caches.items() for r, k in (("hit", "hits"), ("miss", "misses"))]),
+        _family("traderblock_cache_entries", "gauge", "Entries held per cache",
+                [({"cache": n}, c["size"] + c["binary_entries"]) for n, c in caches.items()]),
+        _family("traderblock_rate_limit_rejected_total", "counter", "Requests rejected by the client rate limiter",
+                [({}, limiter["rejected_requests"])]),
+        _family("traderblock_rate_limit_tracked_clients", "gauge", "Clients tracked by the rate limiter",
+                [({}, limiter["tracked_clients"])]),
+        _family("traderblock_stream_subscriptions", "gauge", "Active streaming subscriptions",
+                [({}, _stream_hub.get_stats()["subscriptions"])]),
+    ]
+
+
+REGISTRY.register_collector(_collect_runtime_metrics)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus text exposition of latency histograms, upstream quota and cache metrics."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
 @router.get("/stats")
 async def stats() -> Dict:
     return {
         "rate_limiter": _rate_limiter.get_stats(),
         "cache": _cache.get_stats(),
+        "bar_store": _bar_store.get_stats(),
+        "fundamentals": {**_fundamentals.get_stats(), "last_run": _fundamentals_job.last_run_stats},
+        "screener": {**_snapshot.get_stats(), "last_run": _screener_job.last_run_stats},
+        "trending": _trending.get_stats(),
+        "warm_state": _warm_state.get_stats(),
+        "intraday": {**_intraday.get_stats(), "last_run": _intraday_job.last_run_stats},
+        "batch_predictions": _batch_predictions.last_run_stats,
+        "scheduler": _scheduler.get_stats(),
+        "prefetch": _prefetch_job.get_stats(),
+        "executors": get_pool_stats(),
+        "streaming": _stream_hub.get_stats(),
+        "sentiment": {**_sentiment.get_stats(), "store": _sentiment_store.get_stats()},
         "uptime": int(time.time() - _start_time),
     }
 
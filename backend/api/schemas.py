@@ -1,5 +1,7 @@
-from pydantic import BaseModel
-from typing import Dict, Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, List, Optional
+
+from ..config import settings
 
 
 class DayPrediction(BaseModel):
@@ -18,3 +20,12 @@ class PredictionResponse(BaseModel):
     risk_metrics: Dict
 
 
+class BatchRequest(BaseModel):
+    tickers: List[str] = Field(..., min_length=1, max_length=settings.batch_max_tickers)
+
+    @field_validator("tickers")
+    @classmethod
+    def normalize(cls, tickers: List[str]) -> List[str]:
+        # Upper-case, drop blanks and duplicates, keep request order
+        return list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+
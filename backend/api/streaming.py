@@ -0,0 +1,176 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+import pandas as pd
+
+from ..indicators.incremental import IncrementalIndicators
+from ..utils.logger import get_logger
+from ..utils.market_hours import is_market_open
+
+
+_logger = get_logger(__name__)
+
+
+class Subscriber:
+    """
+    One client connection's outbound queue.
+
+    ``offer`` never blocks the poller: when the queue is full the update is
+    dropped, and after ``max_drops`` consecutive drops the subscriber is
+    marked closed so the connection handler disconnects it.
+    """
+
+    def __init__(self, max_queue: int = 100, max_drops: int = 10) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.max_drops = max_drops
+        self.tickers: Set[str] = set()
+        self.dropped = 0
+        self._consecutive_drops = 0
+        self.closed = False
+
+    def offer(self, message: Dict) -> None:
+        try:
+            self.queue.put_nowait(message)
+            self._consecutive_drops = 0
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self._consecutive_drops += 1
+            if self._consecutive_drops >= self.max_drops:
+                self.closed = True
+
+
+class _Feed:
+    def __init__(self, ticker: str) -> None:
+        self.ticker = ticker
+        self.subscribers: Set[Subscriber] = set()
+        self.state: Optional[IncrementalIndicators] = None
+        self.last: Optional[Dict] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class StreamHub:
+    """
+    Fans out price and indicator updates from one upstream poller per ticker.
+
+    Upstream load scales with the number of distinct subscribed tickers, not
+    with the number of connections. Pollers start with the first subscriber
+    of a ticker and stop with the last one. At most ``max_feeds`` tickers
+    are polled at once, and only while the market is open; outside the
+    session a feed loads its snapshot once and then waits.
+    """
+
+    def __init__(
+        self,
+        load_frame: Callable[[str, int], pd.DataFrame],
+        run_io: Callable[..., Awaitable],
+        poll_seconds: float = 60.0,
+        max_queue: int = 100,
+        max_drops: int = 10,
+        history: int = 200,
+        max_feeds: int = 30,
+    ) -> None:
+        self.load_frame = load_frame
+        self.run_io = run_io
+        self.poll_seconds = poll_seconds
+        self.max_queue = max_queue
+        self.max_drops = max_drops
+        self.history = history
+        self.max_feeds = max_feeds
+        self._feeds: Dict[str, _Feed] = {}
+        self.messages_sent = 0
+        self.upstream_polls = 0
+        self.disconnected_slow = 0
+        self.rejected_feeds = 0
+
+    def new_subscriber(self) -> Subscriber:
+        return Subscriber(max_queue=self.max_queue, max_drops=self.max_drops)
+
+    def can_subscribe(self, ticker: str) -> bool:
+        """True when ``ticker`` is already polled or a new feed still fits."""
+        return ticker.upper() in self._feeds or len(self._feeds) < self.max_feeds
+
+    def subscribe(self, sub: Subscriber, ticker: str) -> bool:
+        """Add ``sub`` to ``ticker``'s feed; False when starting the feed would exceed ``max_feeds``."""
+        ticker = ticker.upper()
+        feed = self._feeds.get(ticker)
+        if feed is None:
+            if len(self._feeds) >= self.max_feeds:
+                self.rejected_feeds += 1
+                return False
+            feed = self._feeds[ticker] = _Feed(ticker)
+            feed.task = asyncio.create_task(self._poll(feed))
+        feed.subscribers.add(sub)
+        sub.tickers.add(ticker)
+        if feed.last is not None:
+            sub.offer({"type": "snapshot", **feed.last})
+        return True
+
+    def unsubscribe(self, sub: Subscriber, ticker: str) -> None:
+        ticker = ticker.upper()
+        sub.tickers.discard(ticker)
+        feed = self._feeds.get(ticker)
+        if feed is None:
+            return
+        feed.subscribers.discard(sub)
+        if not feed.subscribers:
+            if feed.task:
+                feed.task.cancel()
+            del self._feeds[ticker]
+
+    def disconnect(self, sub: Subscriber) -> None:
+        if sub.closed:
+            self.disconnected_slow += 1
+        for ticker in list(sub.tickers):
+            self.unsubscribe(sub, ticker)
+
+    def _publish(self, feed: _Feed, message: Dict) -> None:
+        for sub in list(feed.subscribers):
+            if not sub.closed:
+                sub.offer(message)
+                self.messages_sent += 1
+
+    def _advance(self, feed: _Feed, df: pd.DataFrame) -> None:
+        if feed.state is None:
+            feed.state = IncrementalIndicators.from_frame(df)
+            feed.last = {"ticker": feed.ticker, **feed.state.snapshot()}
+            self._publish(feed, {"type": "snapshot", **feed.last})
+            return
+        for ts, close in df["Close"].dropna().items():
+            ts = str(ts)
+            if ts > feed.state.last_time:
+                feed.last = {"ticker": feed.ticker, **feed.state.update(ts, float(close))}
+                self._publish(feed, {"type": "bar", **feed.last})
+            elif ts == feed.state.last_time and float(close) != feed.last["close"]:
+                # Revision of the bar still forming: indicators are recomputed from the revised close
+                feed.last = {"ticker": feed.ticker, **feed.state.revise(float(close))}
+                self._publish(feed, {"type": "price", **feed.last})
+
+    async def _poll(self, feed: _Feed) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                # Bars only change during the session; the first load still serves the snapshot
+                if feed.state is None or is_market_open():
+                    size = self.history if feed.state is None else 2
+                    df = await self.run_io(self.load_frame, feed.ticker, size)
+                    self.upstream_polls += 1
+                    if not df.empty and "Close" in df:
+                        self._advance(feed, df)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                _logger.warning("stream poll failed for %s: %s", feed.ticker, e)
+            await asyncio.sleep(max(0.0, self.poll_seconds - (time.monotonic() - started)))
+
+    def get_stats(self) -> Dict:
+        return {
+            "tickers": len(self._feeds),
+            "max_feeds": self.max_feeds,
+            "rejected_feeds": self.rejected_feeds,
+            "subscriptions": sum(len(f.subscribers) for f in self._feeds.values()),
+            "upstream_polls": self.upstream_polls,
+            "messages_sent": self.messages_sent,
+            "disconnected_slow": self.disconnected_slow,
+        }
+
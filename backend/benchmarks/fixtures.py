@@ -0,0 +1,132 @@
+import random
+import string
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+# Deterministic synthetic market data for benchmarks and the mock provider
+
+
+def ticker_names(count: int) -> List[str]:
+    return [f"T{i:04d}" for i in range(count)]
+
+
+def ticker_seed(ticker: str, seed: int) -> int:
+    # Stable across processes, unlike hash()
+    return (seed * 1_000_003 + sum((i + 1) * ord(ch) for i, ch in enumerate(ticker))) % (2**32)
+
+
+def synthetic_ohlcv(
+    ticker: str = "T0000", bars: int = 500, seed: int = 0, end: str = "2024-12-31", freq: str = "B"
+) -> pd.DataFrame:
+    """
+    Geometric random-walk OHLCV bars, identical for the same arguments.
+
+    Columns and index match what ``_to_dataframe`` produces from the
+    provider: ``Open/High/Low/Close/Volume`` indexed by ``Date``.
+    """
+    rng = np.random.default_rng(ticker_seed(ticker, seed))
+    returns = rng.normal(0.0003, 0.015, bars)
+    close = 20 + rng.random() * 280 * np.exp(np.cumsum(returns))
+    open_ = close * np.exp(rng.normal(0, 0.004, bars))
+    spread = np.abs(rng.normal(0, 0.008, bars)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.lognormal(14, 0.5, bars).round()
+    index = pd.date_range(end=end, periods=bars, freq=freq, name="Date")
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}, index=index)
+
+
+def to_provider_values(df: pd.DataFrame) -> List[Dict[str, str]]:
+    """Twelve Data ``time_series`` ``values``: newest first, every field a string."""
+    fmt = "%Y-%m-%d %H:%M:%S" if (df.index.normalize() != df.index).any() else "%Y-%m-%d"
+    return [
+        {
+            "datetime": ts.strftime(fmt),
+            "open": f"{row.Open:.5f}",
+            "high": f"{row.High:.5f}",
+            "low": f"{row.Low:.5f}",
+            "close": f"{row.Close:.5f}",
+            "volume": str(int(row.Volume)),
+        }
+        for ts, row in zip(df.index[::-1], df.iloc[::-1].itertuples(index=False))
+    ]
+
+
+def synthetic_values(ticker: str = "T0000", bars: int = 500, seed: int = 0, **kwargs) -> List[Dict[str, str]]:
+    return to_provider_values(synthetic_ohlcv(ticker, bars, seed, **kwargs))
+
+
+def universe(size: int = 30, bars: int = 500, seed: int = 0) -> Dict[str, pd.DataFrame]:
+    return {t: synthetic_ohlcv(t, bars, seed) for t in ticker_names(size)}
+
+
+class FixtureFetcher:
+    """
+    Stand-in for ``TwelveDataFetcher`` serving synthetic bars without network
+    or rate limiting; counts calls so benchmarks can report upstream load.
+    """
+
+    def __init__(self, bars: int = 500, seed: int = 0) -> None:
+        self.bars = bars
+        self.seed = seed
+        self.calls = 0
+        self._values: Dict[str, List[Dict[str, str]]] = {}
+
+    def _series(self, ticker: str, outputsize: int) -> List[Dict]:
+        values = self._values.get(ticker)
+        if values is None or len(values) < outputsize:
+            values = self._values[ticker] = synthetic_values(ticker, max(self.bars, outputsize), self.seed)
+        return values[:outputsize]
+
+    def get_time_series(self, ticker: str, interval: str = "1day", outputsize: int = 90) -> List[Dict]:
+        self.calls += 1
+        return self._series(ticker, outputsize)
+
+    def get_time_series_batch(
+        self, tickers: List[str], interval: str = "1day", outputsize: int = 90, chunk_size: int = 8
+    ) -> Dict[str, List[Dict]]:
+        self.calls += -(-len(tickers) // chunk_size)
+        return {t: self._series(t, outputsize) for t in tickers}
+
+
+def symbol_names(count: int, seed: int = 0) -> List[str]:
+    """Distinct letter-only symbols of 2-4 characters, like exchange tickers."""
+    rng = random.Random(seed)
+    names: Dict[str, None] = {}
+    while len(names) < count:
+        names["".join(rng.choices(string.ascii_uppercase, k=rng.choice((2, 3, 3, 4, 4))))] = None
+    return list(names)
+
+
+_POST_TEMPLATES = (
+    "Loading up on ${0} before earnings, this is going to rip",
+    "{0} looks terrible, I am buying puts and selling everything",
+    "Anyone else holding {0} and {1}? IT is a solid play for ALL of us",
+    "DD on ${0}: revenue up, margins up, CEO buying shares. Bullish",
+    "${0} vs ${1} which one is the better long term hold?",
+    "I think {0} is overvalued but A lot of people disagree",
+    "Lost everything on {0} calls, worst trade of my life",
+    "{0} breaking out, volume is huge today. YOLO",
+)
+
+
+def synthetic_posts(count: int, symbols: List[str], seed: int = 0, duplicate_rate: float = 0.05) -> List[Dict]:
+    """
+    Reddit-like post dicts mentioning ``symbols`` with Zipf-like popularity,
+    mixed with common false-positive words; a share are exact reposts.
+    """
+    rng = random.Random(seed)
+    weights = [1.0 / rank for rank in range(1, len(symbols) + 1)]
+    posts: List[Dict] = []
+    for i in range(count):
+        if posts and rng.random() < duplicate_rate:
+            posts.append(dict(rng.choice(posts)))
+            continue
+        first, second = rng.choices(symbols, weights, k=2)
+        text = rng.choice(_POST_TEMPLATES).format(first, second)
+        posts.append({"id": f"p{seed}_{i}", "text": text, "created_utc": 1_700_000_000 + i, "subreddit": "stocks"})
+    return posts
+
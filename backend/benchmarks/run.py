@@ -0,0 +1,357 @@
+"""
+Benchmark suite for the hot paths: indicators, provider parsing, the cache,
+the rate limiters, the ``/stock``, ``/indicators`` and ``/predict``
+handlers and social-text ticker mention extraction.
+
+``startup.*`` entries time module imports in a fresh interpreter, so worker
+start-up regressions (an eager heavy import) show up too.
+
+Run from the repository root::
+
+    python -m backend.benchmarks.run --bars 500 --universe 30 --output bench.json
+    python -m backend.benchmarks.run --fail-on-regression
+    python -m backend.benchmarks.run --update-baseline
+
+Results are per-call timings in microseconds (median and best of
+``--repeat`` runs). Each benchmark is compared against the saved median in
+``--baseline`` (``baseline.json`` next to this file by default) and
+anything slower by more than ``--threshold`` is reported as a regression.
+``--update-baseline`` replaces the saved baseline with this run; refresh
+it on the machine that runs the comparison, since timings do not carry
+across hardware.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import fixtures
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+class Benchmark:
+    def __init__(self, name: str, fn: Callable[[], object], setup: Optional[Callable[[], None]] = None,
+                 loops: Optional[int] = None) -> None:
+        self.name = name
+        self.fn = fn
+        # Runs before every repeat, outside the timed region
+        self.setup = setup
+        # Fixed loop count for benchmarks whose cost grows with repetition
+        self.loops = loops
+
+
+def _calibrate(fn: Callable[[], object], min_time: float) -> int:
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - started >= min_time or loops >= 1_000_000:
+            return loops
+        loops *= 4
+
+
+def measure(bench: Benchmark, repeat: int = 5, min_time: float = 0.1) -> Dict:
+    if bench.setup:
+        bench.setup()
+    loops = bench.loops or _calibrate(bench.fn, min_time)
+    timings = []
+    for _ in range(repeat):
+        if bench.setup:
+            bench.setup()
+        started = time.perf_counter()
+        for _ in range(loops):
+            bench.fn()
+        timings.append((time.perf_counter() - started) / loops * 1e6)
+    return {
+        "median_us": round(statistics.median(timings), 3),
+        "min_us": round(min(timings), 3),
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def indicator_benchmarks(df: pd.DataFrame) -> List[Benchmark]:
+    from ..indicators import bundle, extreme_value, fundamental, momentum, risk, trend, volatility, volume
+    from ..indicators.incremental import IncrementalIndicators
+
+    close = df["Close"]
+    returns = close.pct_change().dropna()
+    market = returns.sample(frac=1.0, random_state=0).set_axis(returns.index)
+    cases = {
+        "volatility.calculate_atr": lambda: volatility.calculate_atr(df),
+        "volatility.calculate_bollinger_bands": lambda: volatility.calculate_bollinger_bands(close),
+        "volatility.calculate_historical_volatility": lambda: volatility.calculate_historical_volatility(returns),
+        "momentum.calculate_macd_v": lambda: momentum.calculate_macd_v(df),
+        "momentum.calculate_rsi": lambda: momentum.calculate_rsi(close),
+        "momentum.calculate_stochastic": lambda: momentum.calculate_stochastic(df),
+        "trend.ema": lambda: trend.ema(close, 20),
+        "trend.sma": lambda: trend.sma(close, 20),
+        "volume.vwap": lambda: volume.vwap(df),
+        "volume.obv": lambda: volume.obv(df),
+        "volume.volume_roc": lambda: volume.volume_roc(df),
+        "risk.calculate_alpha_beta": lambda: risk.calculate_alpha_beta(returns, market),
+        "risk.calculate_sharpe_ratio": lambda: risk.calculate_sharpe_ratio(returns),
+        "risk.calculate_var": lambda: risk.calculate_var(returns),
+        "risk.calculate_max_drawdown": lambda: risk.calculate_max_drawdown(close),
+        "extreme_value.calculate_tail_risk": lambda: extreme_value.calculate_tail_risk(returns),
+        "extreme_value.calculate_return_distribution": lambda: extreme_value.calculate_return_distribution(returns),
+        "fundamental.compute_basic_fundamentals": lambda: fundamental.compute_basic_fundamentals({}),
+        "bundle.stock_payload": lambda: bundle.stock_payload("T0000", df),
+        "bundle.indicator_series": lambda: bundle.indicator_series("T0000", df),
+        "bundle.indicator_arrays": lambda: bundle.indicator_arrays(df),
+        "incremental.from_frame": lambda: IncrementalIndicators.from_frame(df),
+    }
+    return [Benchmark(f"indicators.{name}", fn) for name, fn in cases.items()]
+
+
+def parsing_benchmarks(bars: int) -> List[Benchmark]:
+    from ..api.routes import _to_dataframe
+
+    values = fixtures.synthetic_values("T0000", bars)
+    return [Benchmark("parse._to_dataframe", lambda: _to_dataframe(values))]
+
+
+def cache_benchmarks(sizes: List[int], tmpdir: str) -> List[Benchmark]:
+    from ..data.cache_manager import CacheManager
+
+    payload = {"ticker": "T0000", "current_price": 101.5, "values": list(np.linspace(0, 1, 50))}
+    benches = []
+    for size in sizes:
+        cache = CacheManager(cache_file=os.path.join(tmpdir, f"cache_{size}.json"))
+        cache.set_many({f"stock:{t}": payload for t in fixtures.ticker_names(size)})
+        keys = [f"stock:{t}" for t in fixtures.ticker_names(size)]
+        counter = iter(range(10**12))
+
+        def get(cache=cache, keys=keys, counter=counter):
+            return cache.get_encoded(keys[next(counter) % len(keys)])
+
+        def set_(cache=cache, keys=keys, counter=counter):
+            return cache.set(keys[next(counter) % len(keys)], payload)
+
+        benches.append(Benchmark(f"cache.get_encoded[{size}]", get))
+        # set() rewrites the whole JSON file, so its cost grows with the cache
+        benches.append(Benchmark(f"cache.set[{size}]", set_))
+    return benches
+
+
+def limiter_benchmarks(tmpdir: str) -> List[Benchmark]:
+    from ..api.rate_limiter import RateLimiter
+    from ..data.fetcher import RateLimiter as UpstreamLimiter
+
+    memory = RateLimiter(per_minute_limit=10**9, per_day_limit=10**12)
+    shared = RateLimiter(per_minute_limit=10**9, per_day_limit=10**12, store_path=os.path.join(tmpdir, "rl.db"))
+    ips = [f"10.0.{i // 256}.{i % 256}" for i in range(10_000)]
+    counter = iter(range(10**12))
+    upstream = UpstreamLimiter(calls_per_minute=10**9)
+
+    def reset_upstream() -> None:
+        upstream._timestamps = []
+
+    return [
+        Benchmark("limiter.memory.enforce", lambda: memory.enforce(ips[next(counter) % len(ips)])),
+        Benchmark("limiter.shared.enforce", lambda: shared.enforce(ips[next(counter) % len(ips)])),
+        # The fetcher limiter keeps a timestamp per call for 60s; time 1000 calls from empty
+        Benchmark("limiter.upstream.acquire[1000]", upstream.acquire, setup=reset_upstream, loops=1000),
+    ]
+
+
+def route_benchmarks(universe: int, bars: int, tmpdir: str) -> List[Benchmark]:
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from ..api import routes
+    from ..api.rate_limiter import RateLimiter
+    from ..data.bar_store import BarStore
+    from ..data.cache_manager import CacheManager
+
+    routes._fetcher = fixtures.FixtureFetcher(bars=bars)
+    routes._bar_store = BarStore()
+    routes._cache = CacheManager(cache_file=os.path.join(tmpdir, "routes_cache.json"))
+    routes._rate_limiter = RateLimiter(per_minute_limit=10**9, per_day_limit=10**12)
+    app = FastAPI()
+    app.include_router(routes.router)
+    client = TestClient(app)
+    tickers = fixtures.ticker_names(universe)
+    counter = iter(range(10**12))
+
+    def hit(path: str) -> Callable[[], object]:
+        def call():
+            response = client.get(path.format(ticker=tickers[0]))
+            assert response.status_code == 200, response.text
+        return call
+
+    def miss(path: str, prefix: str) -> Callable[[], object]:
+        def call():
+            ticker = tickers[next(counter) % len(tickers)]
+            # CacheManager stores keys upper-cased
+            routes._cache.cache.pop(f"{prefix}:{ticker}".upper(), None)
+            routes._cache._encoded.pop(f"{prefix}:{ticker}".upper(), None)
+            # A cold request also fetches and parses the bars
+            routes._bar_store.discard(routes._bars_key(ticker))
+            response = client.get(path.format(ticker=ticker))
+            assert response.status_code == 200, response.text
+        return call
+
+    benches = []
+    for path, prefix in (("/stock/{ticker}", "stock"), ("/indicators/{ticker}", "indicators"),
+                         ("/predict/{ticker}", "predict")):
+        benches.append(Benchmark(f"route.{prefix}.miss", miss(path, prefix)))
+        benches.append(Benchmark(f"route.{prefix}.hit", hit(path)))
+    return benches
+
+
+def mention_benchmarks(sizes: List[int], posts: int = 1000) -> List[Benchmark]:
+    import re
+    from ..reddit.mentions import MentionIndex
+
+    benches = []
+    for size in sizes:
+        symbols = fixtures.symbol_names(size)
+        texts = [p["text"] for p in fixtures.synthetic_posts(posts, symbols)]
+        index = MentionIndex(symbols)
+        # What the index replaces: one compiled pattern per symbol, scanned over every post
+        patterns = [(s, re.compile(rf"(?<![\w$])\$?{re.escape(s)}(?!\w)")) for s in symbols]
+        counter = iter(range(10**12))
+
+        def indexed(index=index, texts=texts, counter=counter):
+            return index.extract(texts[next(counter) % len(texts)])
+
+        def per_symbol(patterns=patterns, texts=texts, counter=counter):
+            text = texts[next(counter) % len(texts)]
+            return [s for s, pattern in patterns if pattern.search(text)]
+
+        benches.append(Benchmark(f"mentions.index.extract[{size}]", indexed))
+        benches.append(Benchmark(f"mentions.per_symbol_regex[{size}]", per_symbol))
+        benches.append(Benchmark(f"mentions.index.build[{size}]", lambda symbols=symbols: MentionIndex(symbols), loops=1))
+    return benches
+
+
+def startup_benchmarks() -> List[Benchmark]:
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    def importer(module: str) -> Callable[[], object]:
+        code = f"import {module}" if module else "pass"
+        return lambda: subprocess.run([sys.executable, "-c", code], cwd=root, check=True, capture_output=True)
+
+    # Each run pays interpreter start-up; "startup.python" is that floor
+    return [
+        Benchmark(f"startup.{name}", importer(module), loops=1)
+        for name, module in (("python", ""), ("import[backend.api.routes]", "backend.api.routes"),
+                             ("import[backend.main]", "backend.main"))
+    ]
+
+
+def build_suite(
+    bars: int, universe: int, cache_sizes: List[int], tmpdir: str, mention_sizes: Optional[List[int]] = None
+) -> List[Benchmark]:
+    df = fixtures.synthetic_ohlcv("T0000", bars)
+    return (
+        indicator_benchmarks(df)
+        + parsing_benchmarks(bars)
+        + cache_benchmarks(cache_sizes, tmpdir)
+        + limiter_benchmarks(tmpdir)
+        + route_benchmarks(universe, bars, tmpdir)
+        + mention_benchmarks(mention_sizes or [500, 5000])
+        + startup_benchmarks()
+    )
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> Dict[str, Dict]:
+    """Per-benchmark ratio against the baseline median; ``regression`` when slower than ``1 + threshold``."""
+    out = {}
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or not base.get("median_us"):
+            continue
+        ratio = result["median_us"] / base["median_us"]
+        out[name] = {"baseline_us": base["median_us"], "ratio": round(ratio, 3), "regression": ratio > 1 + threshold}
+    return out
+
+
+def _environment(args: argparse.Namespace) -> Dict:
+    return {
+        "timestamp": int(time.time()),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "bars": args.bars,
+        "universe": args.universe,
+        "cache_sizes": args.cache_sizes,
+        "mention_symbols": args.mention_symbols,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the backend hot paths.")
+    parser.add_argument("--bars", type=int, default=500, help="bars per synthetic series")
+    parser.add_argument("--universe", type=int, default=30, help="tickers used by the route benchmarks")
+    parser.add_argument("--cache-sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--mention-symbols", type=int, nargs="+", default=[500, 5000],
+                        help="symbol universe sizes for the mention extraction benchmarks")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.1, help="seconds per timed run")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="JSON results to compare against")
+    parser.add_argument("--no-baseline", action="store_true", help="skip the baseline comparison")
+    parser.add_argument("--update-baseline", action="store_true", help="save this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before flagging")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        try:
+            for bench in build_suite(args.bars, args.universe, args.cache_sizes, tmpdir, args.mention_symbols):
+                if args.filter not in bench.name:
+                    continue
+                try:
+                    results[bench.name] = measure(bench, args.repeat, args.min_time)
+                except Exception as e:
+                    print(f"{bench.name:<55} skipped: {e}", flush=True)
+                    continue
+                print(f"{bench.name:<55} {results[bench.name]['median_us']:>14,.1f} us", flush=True)
+        finally:
+            from ..api.executors import shutdown_pools
+            shutdown_pools()
+
+    report = {"environment": _environment(args), "results": results}
+    regressions = []
+    if args.baseline and not args.no_baseline and not args.update_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        saved = baseline.get("environment", {})
+        params = ("bars", "universe", "cache_sizes", "mention_symbols")
+        changed = [k for k in params if saved.get(k) != getattr(args, k)]
+        if changed:
+            print(f"\nNote: baseline was recorded with different {', '.join(changed)}")
+        report["comparison"] = compare(results, baseline.get("results", {}), args.threshold)
+        print(f"\nAgainst {args.baseline} (threshold {args.threshold:.0%}):")
+        for name, row in sorted(report["comparison"].items(), key=lambda kv: -kv[1]["ratio"]):
+            flag = "  REGRESSION" if row["regression"] else ""
+            print(f"{name:<55} x{row['ratio']:<7}{flag}")
+            if row["regression"]:
+                regressions.append(name)
+    for path in (args.output, BASELINE_PATH if args.update_baseline else None):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
@@ -3,9 +3,108 @@ import os
 
 class Settings:
     twelve_data_api_key: str = os.getenv("TWELVE_DATA_API_KEY", "")
+    # Point at a local mock provider for load tests
+    twelve_data_base_url: str = os.getenv("TWELVE_DATA_BASE_URL", "https://api.twelvedata.com")
+    twelve_data_calls_per_minute: int = int(os.getenv("TWELVE_DATA_CALLS_PER_MINUTE", "8"))
     frontend_url: str | None = os.getenv("FRONTEND_URL")
+    rate_limit_per_minute: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "10"))
+    rate_limit_per_day: int = int(os.getenv("RATE_LIMIT_PER_DAY", "1000"))
+    rate_limit_store: str | None = os.getenv("RATE_LIMIT_STORE") or None
+    rate_limit_max_clients: int = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "50000"))
+    io_pool_workers: int = int(os.getenv("IO_POOL_WORKERS", "16"))
+    io_pool_queue: int = int(os.getenv("IO_POOL_QUEUE", "64"))
+    cpu_pool_kind: str = os.getenv("CPU_POOL_KIND", "process")
+    cpu_pool_workers: int = int(os.getenv("CPU_POOL_WORKERS", "0"))
+    cpu_pool_queue: int = int(os.getenv("CPU_POOL_QUEUE", "32"))
+    batch_max_tickers: int = int(os.getenv("BATCH_MAX_TICKERS", "300"))
+    # Uncached tickers one batch request may compute; each is charged like a single request
+    batch_max_misses: int = int(os.getenv("BATCH_MAX_MISSES", "8"))
+    stream_poll_seconds: float = float(os.getenv("STREAM_POLL_SECONDS", "60"))
+    stream_queue_size: int = int(os.getenv("STREAM_QUEUE_SIZE", "100"))
+    stream_max_drops: int = int(os.getenv("STREAM_MAX_DROPS", "10"))
+    stream_max_tickers: int = int(os.getenv("STREAM_MAX_TICKERS", "50"))
+    # Distinct tickers streamed across all connections; each one reloads its bars once per bar store TTL
+    stream_max_feeds: int = int(os.getenv("STREAM_MAX_FEEDS", "30"))
+    performance_refresh_minutes: int = int(os.getenv("PERFORMANCE_REFRESH_MINUTES", "720"))
+    backtest_history_bars: int = int(os.getenv("BACKTEST_HISTORY_BARS", "500"))
+    # Symbols the background jobs cover: "SYMBOL[,Company name...]" lines; defaults to the built-in top 30
+    universe_path: str | None = os.getenv("UNIVERSE_PATH") or None
+    hot_tickers: list[str] = [t.strip().upper() for t in os.getenv("HOT_TICKERS", "").split(",") if t.strip()]
+    batch_prediction_check_minutes: int = int(os.getenv("BATCH_PREDICTION_CHECK_MINUTES", "15"))
+    scheduler_workers: int = int(os.getenv("SCHEDULER_WORKERS", "2"))
+    # Separate lane for short persistence jobs (spills, snapshots, saves)
+    scheduler_quick_workers: int = int(os.getenv("SCHEDULER_QUICK_WORKERS", "1"))
+    # Hot entries are recomputed this long before they expire, checked every prefetch interval
+    prefetch_interval_seconds: int = int(os.getenv("PREFETCH_INTERVAL_SECONDS", "60"))
+    prefetch_lead_seconds: int = int(os.getenv("PREFETCH_LEAD_SECONDS", "150"))
+    prefetch_max_keys: int = int(os.getenv("PREFETCH_MAX_KEYS", "20"))
+    prefetch_min_hits: int = int(os.getenv("PREFETCH_MIN_HITS", "3"))
+    access_decay_minutes: int = int(os.getenv("ACCESS_DECAY_MINUTES", "30"))
+    lstm_weights_path: str = os.getenv(
+        "LSTM_WEIGHTS_PATH", os.path.join(os.path.dirname(__file__), "lstm_weights.npz")
+    )
+    backtest_workers: int | None = int(os.getenv("BACKTEST_WORKERS", "0")) or None
+    bar_store_dir: str | None = os.getenv(
+        "BAR_STORE_DIR", os.path.join(os.path.dirname(__file__), "data", "bars")
+    ) or None
+    bar_store_ttl_minutes: int = int(os.getenv("BAR_STORE_TTL_MINUTES", "30"))
+    # Bars fetched per ticker on a miss; shorter requests are served from the same fetch
+    bar_store_min_bars: int = int(os.getenv("BAR_STORE_MIN_BARS", "200"))
+    # Social sentiment ingestion runs when Reddit credentials or a replay file are configured
+    reddit_client_id: str | None = os.getenv("REDDIT_CLIENT_ID") or None
+    reddit_subreddits: list[str] = [
+        s.strip() for s in os.getenv("REDDIT_SUBREDDITS", "stocks,wallstreetbets,investing").split(",") if s.strip()
+    ]
+    reddit_poll_seconds: float = float(os.getenv("REDDIT_POLL_SECONDS", "30"))
+    # "SYMBOL[,Company name...]" lines; defaults to UNIVERSE_PATH, then the built-in top 30
+    mention_universe_path: str | None = os.getenv("MENTION_UNIVERSE_PATH") or None
+    sentiment_replay_path: str | None = os.getenv("SENTIMENT_REPLAY_PATH") or None
+    sentiment_workers: int = int(os.getenv("SENTIMENT_WORKERS", "1"))
+    sentiment_batch_size: int = int(os.getenv("SENTIMENT_BATCH_SIZE", "64"))
+    sentiment_queue_size: int = int(os.getenv("SENTIMENT_QUEUE_SIZE", "1000"))
+    sentiment_store_path: str | None = os.getenv(
+        "SENTIMENT_STORE_PATH", os.path.join(os.path.dirname(__file__), "data", "sentiment.npz")
+    ) or None
+    sentiment_save_minutes: int = int(os.getenv("SENTIMENT_SAVE_MINUTES", "5"))
+    # Fundamentals change at most quarterly: loaded off-hours, served from memory
+    fundamentals_path: str | None = os.getenv(
+        "FUNDAMENTALS_PATH", os.path.join(os.path.dirname(__file__), "data", "fundamentals.npz")
+    ) or None
+    fundamentals_ttl_days: float = float(os.getenv("FUNDAMENTALS_TTL_DAYS", "7"))
+    fundamentals_refresh_hours: float = float(os.getenv("FUNDAMENTALS_REFRESH_HOURS", "20"))
+    fundamentals_check_minutes: int = int(os.getenv("FUNDAMENTALS_CHECK_MINUTES", "60"))
+    fundamentals_max_per_run: int = int(os.getenv("FUNDAMENTALS_MAX_PER_RUN", "200"))
+    # Screener snapshot: queued bars are folded in every refresh; universe rows older
+    # than the max age are reloaded, at most max_per_run per refresh
+    screener_refresh_seconds: int = int(os.getenv("SCREENER_REFRESH_SECONDS", "60"))
+    screener_closed_minutes: int = int(os.getenv("SCREENER_CLOSED_MINUTES", "60"))
+    screener_max_age_minutes: int = int(os.getenv("SCREENER_MAX_AGE_MINUTES", "30"))
+    screener_max_per_run: int = int(os.getenv("SCREENER_MAX_PER_RUN", "500"))
+    # Minimum gap between on-demand fills of trending members that are still missing
+    trending_fill_retry_minutes: int = int(os.getenv("TRENDING_FILL_RETRY_MINUTES", "5"))
+    # Intraday bars: one fixed ring per ticker (390 one-minute bars is a session); older bars
+    # spill to the bar store directory. Only the listed tickers are polled, and only while
+    # the market is open; polling is off while the list is empty
+    intraday_tickers: list[str] = [
+        t.strip().upper() for t in os.getenv("INTRADAY_TICKERS", "").split(",") if t.strip()
+    ]
+    # Provider credits per minute each poll leaves for user requests
+    intraday_reserve_credits: int = int(os.getenv("INTRADAY_RESERVE_CREDITS", "4"))
+    intraday_interval: str = os.getenv("INTRADAY_INTERVAL", "1min")
+    intraday_capacity: int = int(os.getenv("INTRADAY_CAPACITY", "390"))
+    intraday_max_tickers: int = int(os.getenv("INTRADAY_MAX_TICKERS", "2000"))
+    intraday_poll_seconds: int = int(os.getenv("INTRADAY_POLL_SECONDS", "60"))
+    intraday_spill_minutes: int = int(os.getenv("INTRADAY_SPILL_MINUTES", "15"))
+    intraday_history_bars: int = int(os.getenv("INTRADAY_HISTORY_BARS", "1950"))
+    # Computed state (bars, screener rows, intraday rings) mapped back in at startup
+    warm_snapshot_path: str | None = os.getenv(
+        "WARM_SNAPSHOT_PATH", os.path.join(os.path.dirname(__file__), "data", "warm_state.bin")
+    ) or None
+    warm_snapshot_minutes: int = int(os.getenv("WARM_SNAPSHOT_MINUTES", "10"))
+    # Admin endpoints (profiling) are disabled unless a token is configured
+    admin_token: str | None = os.getenv("ADMIN_TOKEN") or None
+    profile_dir: str = os.getenv("PROFILE_DIR", os.path.join(os.path.dirname(__file__), "profiles"))
+    profile_sample_interval_ms: float = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
 
 
 settings = Settings()
-
-
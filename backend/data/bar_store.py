@@ -0,0 +1,232 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class BarStore:
+    """
+    Shared OHLCV bars keyed by source, interval and ticker.
+
+    - In-memory LRU of parsed frames, bounded to ``max_entries``
+    - Optional NumPy ``.npz`` copy on disk so restarts start warm
+    - Entries expire after ``ttl_minutes``
+    - Concurrent misses for the same key trigger a single upstream load
+
+    Each entry remembers how many bars were requested, so a request for a
+    shorter window is served from a longer one. Listeners registered with
+    ``subscribe`` see every frame as it is stored or read back from disk.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl_minutes: int = 30, max_entries: int = 2000) -> None:
+        self.directory = directory
+        self.ttl_seconds = ttl_minutes * 60
+        self.max_entries = max_entries
+        # key -> (frame, requested size, loaded at)
+        self._frames: "OrderedDict[str, Tuple[pd.DataFrame, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+        self._listeners: List[Callable[[str, pd.DataFrame], None]] = []
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.disk_hits = 0
+
+    def _path(self, key: str) -> Optional[str]:
+        if not self.directory:
+            return None
+        return os.path.join(self.directory, re.sub(r"[^A-Za-z0-9._-]+", "_", key) + ".npz")
+
+    def _fresh(self, loaded_at: float) -> bool:
+        return time.time() - loaded_at < self.ttl_seconds
+
+    def get(self, key: str, size: int = 0) -> Optional[pd.DataFrame]:
+        """Bars for ``key`` if fresh and loaded with at least ``size`` bars requested."""
+        df = self._lookup(key, size)
+        if df is None:
+            self.misses += 1
+        return df
+
+    def _lookup(self, key: str, size: int) -> Optional[pd.DataFrame]:
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is not None and self._fresh(entry[2]) and entry[1] >= size:
+                self._frames.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        entry = self._read(key)
+        if entry is not None and self._fresh(entry[2]) and entry[1] >= size:
+            with self._lock:
+                self._remember(key, entry)
+                self.disk_hits += 1
+            self._notify(key, entry[0])
+            return entry[0]
+        return None
+
+    def put(self, key: str, df: pd.DataFrame, size: int) -> None:
+        entry = (df, size, time.time())
+        with self._lock:
+            self._remember(key, entry)
+        self._write(key, entry)
+        self._notify(key, df)
+
+    def _notify(self, key: str, df: pd.DataFrame) -> None:
+        for listener in self._listeners:
+            try:
+                listener(key, df)
+            except Exception:
+                # A listener must never fail the load that fed it
+                pass
+
+    def subscribe(self, listener: Callable[[str, pd.DataFrame], None]) -> None:
+        """Call ``listener(key, frame)`` on the calling thread whenever a frame is stored or read from disk."""
+        self._listeners.append(listener)
+
+    def loaded_at(self, key: str) -> Optional[float]:
+        """When ``key`` was loaded (epoch seconds), or None when it is not stored."""
+        with self._lock:
+            entry = self._frames.get(key)
+        if entry is None:
+            entry = self._read(key)
+        return entry[2] if entry is not None else None
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._frames.pop(key, None)
+        path = self._path(key)
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+    def get_or_load(self, key: str, size: int, loader: Callable[[int], pd.DataFrame]) -> pd.DataFrame:
+        """Cached bars, or ``loader(size)`` run once even when several threads miss together."""
+        df = self._lookup(key, size)
+        if df is not None:
+            return df
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        with key_lock:
+            # Another thread may have loaded it while we waited
+            df = self._lookup(key, size)
+            if df is not None:
+                return df
+            self.misses += 1
+            df = loader(size)
+            self.loads += 1
+            if not df.empty:
+                self.put(key, df, size)
+            return df
+
+    def _remember(self, key: str, entry: Tuple[pd.DataFrame, int, float]) -> None:
+        self._frames[key] = entry
+        self._frames.move_to_end(key)
+        while len(self._frames) > self.max_entries:
+            evicted, _ = self._frames.popitem(last=False)
+            self._loading.pop(evicted, None)
+
+    def _write(self, key: str, entry: Tuple[pd.DataFrame, int, float]) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        df, size, loaded_at = entry
+        index = pd.DatetimeIndex(df.index)
+        meta = {
+            "size": size,
+            "loaded_at": loaded_at,
+            "columns": list(map(str, df.columns)),
+            "index_name": index.name,
+            "tz": str(index.tz) if index.tz is not None else None,
+        }
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                np.savez(
+                    f,
+                    meta=np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8),
+                    index=index.as_unit("ns").asi8,
+                    values=df.to_numpy(dtype=np.float64, na_value=np.nan),
+                )
+            os.replace(tmp, path)
+        except Exception:
+            # The disk copy is only a warm-start aid
+            pass
+
+    def _read(self, key: str) -> Optional[Tuple[pd.DataFrame, int, float]]:
+        path = self._path(key)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                meta = json.loads(data["meta"].tobytes())
+                index = pd.DatetimeIndex(data["index"].astype("datetime64[ns]"), name=meta["index_name"])
+                if meta["tz"]:
+                    index = index.tz_localize("UTC").tz_convert(meta["tz"])
+                df = pd.DataFrame(data["values"], index=index, columns=meta["columns"])
+            return df, int(meta["size"]), float(meta["loaded_at"])
+        except Exception:
+            return None
+
+    def export_state(self) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        """Fresh in-memory frames flattened into two arrays, for a warm-start snapshot."""
+        with self._lock:
+            entries = [(k, e) for k, e in self._frames.items() if self._fresh(e[2])]
+        meta, values, times = [], [], []
+        rows = 0
+        for key, (df, size, loaded_at) in entries:
+            index = pd.DatetimeIndex(df.index)
+            meta.append({
+                "key": key,
+                "size": size,
+                "loaded_at": loaded_at,
+                "rows": len(df),
+                "start": rows,
+                "columns": list(map(str, df.columns)),
+                "index_name": index.name,
+                "tz": str(index.tz) if index.tz is not None else None,
+            })
+            # One float64 row block per frame; frames may differ in width
+            values.append(df.to_numpy(dtype=np.float64, na_value=np.nan).ravel())
+            times.append(index.as_unit("ns").asi8)
+            rows += len(df)
+        return {"entries": meta}, {
+            "values": np.concatenate(values) if values else np.empty(0),
+            "times": np.concatenate(times) if times else np.empty(0, dtype=np.int64),
+        }
+
+    def restore_state(self, meta: Dict, arrays: Dict[str, np.ndarray]) -> None:
+        """
+        Adopt frames from ``export_state`` that are still fresh. The frames
+        view ``arrays`` directly, so a memory-mapped snapshot is not copied.
+        """
+        values, times = arrays["values"], arrays["times"]
+        offset = 0
+        for e in meta["entries"]:
+            width = len(e["columns"])
+            block = values[offset:offset + e["rows"] * width].reshape(e["rows"], width)
+            offset += e["rows"] * width
+            if not self._fresh(e["loaded_at"]):
+                continue
+            index = pd.DatetimeIndex(times[e["start"]:e["start"] + e["rows"]].view("M8[ns]"), copy=False,
+                                     name=e["index_name"])
+            if e["tz"]:
+                index = index.tz_localize("UTC").tz_convert(e["tz"])
+            df = pd.DataFrame(block, index=index, columns=e["columns"], copy=False)
+            with self._lock:
+                self._remember(e["key"], (df, int(e["size"]), float(e["loaded_at"])))
+            self._notify(e["key"], df)
+
+    def get_stats(self) -> Dict:
+        return {
+            "entries": len(self._frames),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "loads": self.loads,
+        }
+
@@ -1,8 +1,12 @@
 import json
 import os
+import threading
 import time
 from datetime import timedelta
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+
+from ..utils.metrics import CACHE_LATENCY
+from ..utils.serialization import content_etag, encode_json
 
 
 class CacheManager:
@@ -12,12 +16,21 @@ class CacheManager:
     - Default 30-minute TTL
     - Persistent storage (JSON)
     - Cache hit/miss tracking
+    - Pre-encoded response bodies with content ETags, kept in memory
     """
 
     def __init__(self, cache_file: str = "stock_cache.json", ttl_minutes: int = 30) -> None:
         self.cache_file = os.path.join(os.path.dirname(__file__), cache_file)
+        # Metrics label, e.g. "stock_cache"
+        self.name = os.path.splitext(os.path.basename(cache_file))[0]
         self.ttl = timedelta(minutes=ttl_minutes)
         self.cache: Dict[str, Any] = self._load_cache()
+        # Writers may run on executor or scheduler threads
+        self._lock = threading.RLock()
+        # key -> (encoded body, ETag); filled on write, or lazily for entries loaded from disk
+        self._encoded: Dict[str, Tuple[bytes, str]] = {}
+        # Memory-only binary bodies: key -> (body, etag, timestamp)
+        self._raw: Dict[str, Tuple[bytes, str, int]] = {}
         self.hits = 0
         self.misses = 0
 
@@ -33,7 +46,7 @@ class CacheManager:
     def _save_cache(self) -> None:
         try:
             os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-            with open(self.cache_file, "w") as f:
+            with CACHE_LATENCY.time(cache=self.name, op="save"), self._lock, open(self.cache_file, "w") as f:
                 json.dump(self.cache, f)
         except Exception:
             # Fail silently for now; logging will be added later
@@ -50,20 +63,98 @@ class CacheManager:
         self.hits += 1
         return self.cache.get(ticker, {}).get("data")
 
-    def set(self, ticker: str, data: Dict) -> None:
-        ticker = ticker.upper()
-        self.cache[ticker] = {"data": data, "timestamp": self._now()}
+    def get_encoded(self, ticker: str) -> Optional[Tuple[bytes, str, int]]:
+        """``(body, etag, ttl_remaining)`` for a valid, non-empty entry."""
+        with CACHE_LATENCY.time(cache=self.name, op="get"):
+            return self._get_encoded(ticker.upper())
+
+    def _get_encoded(self, ticker: str) -> Optional[Tuple[bytes, str, int]]:
+        if not self.is_valid(ticker) or not self.cache[ticker].get("data"):
+            self.misses += 1
+            return None
+        self.hits += 1
+        encoded = self._encoded.get(ticker)
+        if encoded is None:
+            encoded = self._encode(ticker, self.cache[ticker]["data"])
+        return encoded[0], encoded[1], self.ttl_remaining(ticker)
+
+    def get_bytes(self, key: str) -> Optional[Tuple[bytes, str, int]]:
+        """``(body, etag, ttl_remaining)`` for a binary body stored with ``set_bytes``."""
+        raw = self._raw.get(key)
+        remaining = int(self.ttl.total_seconds()) - (self._now() - raw[2]) if raw else 0
+        if remaining <= 0:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return raw[0], raw[1], remaining
+
+    def set_bytes(self, key: str, body: bytes) -> Tuple[bytes, str, int]:
+        """Keep an already-encoded binary body in memory; not persisted."""
+        etag = content_etag(body)
+        with self._lock:
+            self._raw[key] = (body, etag, self._now())
+            # Drop expired bodies so the memory-only store stays bounded by the working set
+            expired = [k for k, v in self._raw.items() if self._now() - v[2] >= self.ttl.total_seconds()]
+            for k in expired:
+                del self._raw[k]
+        return body, etag, int(self.ttl.total_seconds())
+
+    def get_many(self, tickers: List[str]) -> Dict[str, Dict]:
+        """Valid entries among ``tickers``, keyed as requested."""
+        found = {}
+        with CACHE_LATENCY.time(cache=self.name, op="get_many"):
+            for ticker in tickers:
+                if self.is_valid(ticker):
+                    data = self.cache[ticker.upper()].get("data")
+                    if data:
+                        found[ticker] = data
+        self.hits += len(found)
+        self.misses += len(tickers) - len(found)
+        return found
+
+    def set(self, ticker: str, data: Dict, ttl_seconds: Optional[int] = None) -> Tuple[bytes, str, int]:
+        with CACHE_LATENCY.time(cache=self.name, op="set"):
+            body, etag = self._put(ticker, data, ttl_seconds)
+        self._save_cache()
+        return body, etag, self.ttl_remaining(ticker)
+
+    def set_many(self, items: Dict[str, Dict], ttl_seconds: Optional[int] = None) -> None:
+        """Store several entries with a single write to disk."""
+        with CACHE_LATENCY.time(cache=self.name, op="set_many"):
+            for ticker, data in items.items():
+                self._put(ticker, data, ttl_seconds)
         self._save_cache()
 
+    def _put(self, ticker: str, data: Dict, ttl_seconds: Optional[int]) -> Tuple[bytes, str]:
+        entry = {"data": data, "timestamp": self._now()}
+        if ttl_seconds is not None:
+            entry["ttl"] = int(ttl_seconds)
+        with self._lock:
+            self.cache[ticker.upper()] = entry
+        return self._encode(ticker.upper(), data)
+
+    def _encode(self, ticker: str, data: Any) -> Tuple[bytes, str]:
+        body = encode_json(data)
+        encoded = (body, content_etag(body))
+        self._encoded[ticker] = encoded
+        return encoded
+
     def is_valid(self, ticker: str) -> bool:
         ticker = ticker.upper()
         entry = self.cache.get(ticker)
         if not entry or "timestamp" not in entry:
             return False
         age_seconds = self._now() - int(entry["timestamp"])
-        return age_seconds < int(self.ttl.total_seconds())
+        return age_seconds < int(entry.get("ttl", self.ttl.total_seconds()))
+
+    def ttl_remaining(self, ticker: str) -> int:
+        entry = self.cache.get(ticker.upper())
+        if not entry or "timestamp" not in entry:
+            return 0
+        ttl = int(entry.get("ttl", self.ttl.total_seconds()))
+        return max(0, ttl - (self._now() - int(entry["timestamp"])))
 
     def get_stats(self) -> Dict:
-        return {"hits": self.hits, "misses": self.misses, "size": len(self.cache)}
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.cache), "binary_entries": len(self._raw)}
 
 
@@ -1,42 +1,74 @@
 import os
+import threading
 from typing import Dict, List
 import time
 import requests
 
+from ..utils.metrics import UPSTREAM_LATENCY, UPSTREAM_QUOTA, UPSTREAM_REQUESTS, UPSTREAM_THROTTLE
+
 
 class RateLimiter:
     def __init__(self, calls_per_minute: int = 8) -> None:
         self.calls_per_minute = calls_per_minute
         self._timestamps: List[float] = []
+        # Fetches run on pool threads; waiting callers queue behind the lock
+        self._lock = threading.Lock()
+
+    def acquire(self, credits: int = 1) -> None:
+        """Wait until ``credits`` fit in the last minute's budget; one timestamp is kept per credit."""
+        credits = max(1, min(credits, self.calls_per_minute))
+        started = time.perf_counter()
+        with self._lock:
+            now = time.time()
+            # Prune timestamps older than 60 seconds
+            self._timestamps = [t for t in self._timestamps if now - t < 60]
+            excess = len(self._timestamps) + credits - self.calls_per_minute
+            if excess > 0:
+                # Wait for the oldest ``excess`` credits to leave the window
+                sleep_time = 60 - (now - self._timestamps[excess - 1])
+                if sleep_time > 0:
+                    time.sleep(sleep_time)
+                self._timestamps = self._timestamps[excess:]
+            self._timestamps.extend([time.time()] * credits)
+            UPSTREAM_QUOTA.set(self.remaining(), source="local")
+        # Includes time queued behind other callers on the lock
+        UPSTREAM_THROTTLE.observe(time.perf_counter() - started)
 
-    def acquire(self) -> None:
+    def remaining(self) -> int:
         now = time.time()
-        # Prune timestamps older than 60 seconds
-        self._timestamps = [t for t in self._timestamps if now - t < 60]
-        if len(self._timestamps) >= self.calls_per_minute:
-            sleep_time = 60 - (now - self._timestamps[0])
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-        self._timestamps.append(time.time())
+        return max(0, self.calls_per_minute - sum(1 for t in self._timestamps if now - t < 60))
 
 
 class TwelveDataFetcher:
-    def __init__(self, api_key: str | None = None) -> None:
+    def __init__(self, api_key: str | None = None, base_url: str | None = None, calls_per_minute: int = 8) -> None:
         self.api_key = api_key or os.getenv("TWELVE_DATA_API_KEY", "")
-        self.rate_limiter = RateLimiter(calls_per_minute=8)
-        self.base_url = "https://api.twelvedata.com"
+        self.rate_limiter = RateLimiter(calls_per_minute=calls_per_minute)
+        self.base_url = (base_url or os.getenv("TWELVE_DATA_BASE_URL") or "https://api.twelvedata.com").rstrip("/")
 
-    def _get(self, path: str, params: Dict) -> Dict:
-        self.rate_limiter.acquire()
+    def _get(self, path: str, params: Dict, credits: int = 1) -> Dict:
+        self.rate_limiter.acquire(credits)
         params = {"apikey": self.api_key, **params}
         url = f"{self.base_url}/{path}"
-        resp = requests.get(url, params=params, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
-        # Twelve Data returns {"code":..., "message":...} on error
-        if isinstance(data, dict) and data.get("code"):
-            raise RuntimeError(data.get("message", "Twelve Data API error"))
-        return data
+        outcome = "exception"
+        started = time.perf_counter()
+        try:
+            resp = requests.get(url, params=params, timeout=15)
+            credits_left = resp.headers.get("api-credits-left")
+            if credits_left is not None and credits_left.isdigit():
+                UPSTREAM_QUOTA.set(int(credits_left), source="provider")
+            outcome = "http_error"
+            resp.raise_for_status()
+            outcome = "invalid_response"
+            data = resp.json()
+            # Twelve Data returns {"code":..., "message":...} on error
+            if isinstance(data, dict) and data.get("code"):
+                outcome = "api_error"
+                raise RuntimeError(data.get("message", "Twelve Data API error"))
+            outcome = "ok"
+            return data
+        finally:
+            UPSTREAM_LATENCY.observe(time.perf_counter() - started, endpoint=path)
+            UPSTREAM_REQUESTS.inc(endpoint=path, outcome=outcome)
 
     def get_quote(self, ticker: str) -> Dict:
         return self._get("quote", {"symbol": ticker})
@@ -45,6 +77,44 @@ class TwelveDataFetcher:
         data = self._get("time_series", {"symbol": ticker, "interval": interval, "outputsize": outputsize})
         return data.get("values", []) if isinstance(data, dict) else data
 
+    def get_time_series_batch(
+        self, tickers: List[str], interval: str = "1day", outputsize: int = 90, chunk_size: int = 8
+    ) -> Dict[str, List[Dict]]:
+        """
+        Fetch several symbols with one request per ``chunk_size`` tickers.
+
+        The provider charges a credit per symbol, so each chunk acquires one
+        credit per ticker and is never larger than the per-minute budget.
+        Symbols the API rejects, or whose chunk failed, are left out of the
+        result; only when every chunk fails is the error raised.
+        """
+        out: Dict[str, List[Dict]] = {}
+        chunk_size = max(1, min(chunk_size, self.rate_limiter.calls_per_minute))
+        error: Exception | None = None
+        failed = 0
+        chunks = [tickers[i : i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+        for chunk in chunks:
+            try:
+                data = self._get(
+                    "time_series",
+                    {"symbol": ",".join(chunk), "interval": interval, "outputsize": outputsize},
+                    credits=len(chunk),
+                )
+            except Exception as e:
+                # Keep what earlier chunks returned
+                error = e
+                failed += 1
+                continue
+            # A single symbol comes back unwrapped; several are keyed by symbol
+            per_symbol = {chunk[0]: data} if len(chunk) == 1 else data
+            for t in chunk:
+                entry = per_symbol.get(t) if isinstance(per_symbol, dict) else None
+                if isinstance(entry, dict) and entry.get("status", "ok") == "ok" and "values" in entry:
+                    out[t] = entry["values"]
+        if chunks and failed == len(chunks):
+            raise error
+        return out
+
     def get_fundamentals(self, ticker: str) -> Dict:
         return self._get("fundamentals", {"symbol": ticker})
 
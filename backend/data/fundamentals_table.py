@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..indicators.fundamental import FIELDS
+
+
+class FundamentalsTable:
+    """
+    Per-ticker fundamentals held as typed columns in memory.
+
+    One ``float64`` array per field (NaN for unknown) plus the load time,
+    indexed by a ticker -> row map; rows grow by doubling. Entries are
+    served for ``ttl_days`` and reported as due for refresh after
+    ``refresh_hours``, so a failed refresh keeps the previous values. The
+    columns persist to a single ``.npz`` file.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_days: float = 7, refresh_hours: float = 20,
+                 capacity: int = 256) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        self.refresh_seconds = refresh_hours * 3600
+        self._columns: Dict[str, np.ndarray] = {f: np.full(capacity, np.nan) for f in FIELDS}
+        self._loaded_at = np.zeros(capacity)
+        self._rows: Dict[str, int] = {}
+        self._tickers: List[str] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if path:
+            self.load()
+
+    def _grow(self) -> None:
+        size = len(self._loaded_at) * 2
+        for field, column in self._columns.items():
+            grown = np.full(size, np.nan)
+            grown[: len(column)] = column
+            self._columns[field] = grown
+        loaded_at = np.zeros(size)
+        loaded_at[: len(self._loaded_at)] = self._loaded_at
+        self._loaded_at = loaded_at
+
+    def upsert(self, ticker: str, values: Dict[str, Optional[float]], loaded_at: Optional[float] = None) -> None:
+        ticker = ticker.upper()
+        with self._lock:
+            row = self._rows.get(ticker)
+            if row is None:
+                if len(self._tickers) == len(self._loaded_at):
+                    self._grow()
+                row = self._rows[ticker] = len(self._tickers)
+                self._tickers.append(ticker)
+            for field, column in self._columns.items():
+                value = values.get(field)
+                column[row] = np.nan if value is None else value
+            self._loaded_at[row] = time.time() if loaded_at is None else loaded_at
+
+    def get(self, ticker: str) -> Optional[Dict]:
+        """Fields for ``ticker`` (``None`` for unknown values), or None when missing or expired."""
+        row = self._rows.get(ticker.upper())
+        if row is None or time.time() - self._loaded_at[row] >= self.ttl_seconds:
+            self.misses += 1
+            return None
+        self.hits += 1
+        out = {f: (None if np.isnan(c[row]) else float(c[row])) for f, c in self._columns.items()}
+        out["as_of"] = int(self._loaded_at[row])
+        return out
+
+    def get_many(self, tickers: Iterable[str]) -> Dict[str, Dict]:
+        out = {}
+        for t in tickers:
+            values = self.get(t)
+            if values is not None:
+                out[t.upper()] = values
+        return out
+
+    def due(self, tickers: Iterable[str]) -> List[str]:
+        """Tickers never loaded or loaded more than ``refresh_hours`` ago, oldest first."""
+        now = time.time()
+        ages = {}
+        for t in dict.fromkeys(t.upper() for t in tickers):
+            row = self._rows.get(t)
+            age = now - self._loaded_at[row] if row is not None else float("inf")
+            if age >= self.refresh_seconds:
+                ages[t] = age
+        return sorted(ages, key=ages.get, reverse=True)
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            used = len(self._tickers)
+            arrays = {f"col_{f}": c[:used].copy() for f, c in self._columns.items()}
+            arrays["loaded_at"] = self._loaded_at[:used].copy()
+            arrays["meta"] = np.frombuffer(json.dumps({"tickers": self._tickers}).encode(), dtype=np.uint8)
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, self.path)
+        except Exception:
+            # The next off-hours run reloads anything lost
+            pass
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as data:
+                tickers = json.loads(data["meta"].tobytes())["tickers"]
+                columns = {f: data[f"col_{f}"] if f"col_{f}" in data else None for f in FIELDS}
+                loaded_at = data["loaded_at"]
+        except Exception:
+            return
+        for i, t in enumerate(tickers):
+            values = {f: (None if c is None or np.isnan(c[i]) else float(c[i])) for f, c in columns.items()}
+            self.upsert(t, values, loaded_at=float(loaded_at[i]))
+
+    def get_stats(self) -> Dict:
+        now = time.time()
+        used = len(self._tickers)
+        fresh = int(np.sum(now - self._loaded_at[:used] < self.ttl_seconds))
+        return {"tickers": used, "fresh": fresh, "hits": self.hits, "misses": self.misses}
+
@@ -0,0 +1,246 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .bar_store import BarStore
+
+
+FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+
+class IntradayRing:
+    """
+    Fixed-capacity bar buffer for one ticker.
+
+    Struct-of-arrays layout: one ``(5, 2 * capacity)`` float64 block for
+    OHLCV and an int64 array of bar times (ns). Every bar is written twice,
+    at ``i`` and ``i + capacity``, so the newest ``n`` bars are always one
+    contiguous slice and ``frame`` can wrap them in a DataFrame without
+    copying. A view of ``n`` bars is left untouched by the next
+    ``capacity - n`` appends.
+    """
+
+    __slots__ = ("capacity", "values", "times", "total", "spilled", "updated_at")
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.values = np.full((len(FIELDS), 2 * capacity), np.nan)
+        self.times = np.zeros(2 * capacity, dtype=np.int64)
+        # Bars ever appended, and how many of them have been spilled
+        self.total = 0
+        self.spilled = 0
+        self.updated_at = 0.0
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    @property
+    def last_time(self) -> Optional[int]:
+        return int(self.times[(self.total - 1) % self.capacity]) if self.total else None
+
+    def append(self, ts: int, bar) -> None:
+        i = self.total % self.capacity
+        self.values[:, i] = self.values[:, i + self.capacity] = bar
+        self.times[i] = self.times[i + self.capacity] = ts
+        self.total += 1
+
+    def revise(self, bar) -> None:
+        """Overwrite the newest bar in place (the provider revises the bar still forming)."""
+        i = (self.total - 1) % self.capacity
+        self.values[:, i] = self.values[:, i + self.capacity] = bar
+
+    def frame(self, n: Optional[int] = None, copy: bool = False) -> pd.DataFrame:
+        """The newest ``n`` bars (all held by default), sharing the ring's memory unless ``copy``."""
+        n = len(self) if n is None else min(n, len(self))
+        end = self.total % self.capacity + self.capacity
+        times, values = self.times[end - n:end], self.values[:, end - n:end]
+        if copy:
+            # DataFrame.copy() would still share the index, which pandas assumes immutable
+            times, values = times.copy(), values.copy()
+        index = pd.DatetimeIndex(times.view("M8[ns]"), copy=False, name="Date")
+        return pd.DataFrame(values.T, index=index, columns=list(FIELDS), copy=False)
+
+
+class IntradayStore:
+    """
+    Memory-bounded intraday bars for many tickers.
+
+    - One ``IntradayRing`` of ``capacity`` bars per ticker (390 one-minute
+      bars is a regular session), O(1) per appended bar
+    - At most ``max_tickers`` rings; the least recently updated one is
+      spilled and dropped first
+    - ``spill`` copies bars not yet spilled into ``bar_store`` under
+      ``intraday:<interval>:<ticker>``, merged with what was spilled before
+      and capped at ``history_bars``, so ``history`` can serve windows
+      longer than the ring
+
+    Memory is ``96 * capacity`` bytes per ticker (mirrored OHLCV and
+    times), about 37 KB for a 390-bar ring.
+    """
+
+    def __init__(
+        self,
+        bar_store: Optional[BarStore] = None,
+        interval: str = "1min",
+        capacity: int = 390,
+        max_tickers: int = 2000,
+        history_bars: int = 1950,
+    ) -> None:
+        self.bar_store = bar_store
+        self.interval = interval
+        self.capacity = capacity
+        self.max_tickers = max_tickers
+        self.history_bars = history_bars
+        self._rings: "OrderedDict[str, IntradayRing]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.appended = 0
+        self.revised = 0
+        self.spills = 0
+        # Bars overwritten in a ring before they were spilled
+        self.lost = 0
+        self.evictions = 0
+
+    def _key(self, ticker: str) -> str:
+        return f"intraday:{self.interval}:{ticker}"
+
+    def _ring(self, ticker: str) -> IntradayRing:
+        ring = self._rings.get(ticker)
+        if ring is None:
+            if len(self._rings) >= self.max_tickers:
+                evicted, old = self._rings.popitem(last=False)
+                self._spill_ring(evicted, old)
+                self.evictions += 1
+            ring = self._rings[ticker] = IntradayRing(self.capacity)
+        self._rings.move_to_end(ticker)
+        return ring
+
+    def extend(self, ticker: str, df: pd.DataFrame) -> int:
+        """Append the bars of ``df`` newer than the ring's last; returns how many were added."""
+        if df.empty:
+            return 0
+        ticker = ticker.upper()
+        times = pd.DatetimeIndex(df.index).as_unit("ns").asi8
+        bars = df.reindex(columns=list(FIELDS)).to_numpy(dtype=np.float64, na_value=np.nan)
+        added = 0
+        with self._lock:
+            ring = self._ring(ticker)
+            for ts, bar in zip(times, bars):
+                last = ring.last_time
+                if last is None or ts > last:
+                    if ring.total - ring.spilled >= ring.capacity:
+                        self.lost += 1
+                        ring.spilled += 1
+                    ring.append(ts, bar)
+                    added += 1
+                elif ts == last:
+                    ring.revise(bar)
+                    self.revised += 1
+            ring.updated_at = time.time()
+            self.appended += added
+        return added
+
+    def window(self, ticker: str, n: Optional[int] = None) -> pd.DataFrame:
+        """
+        The newest ``n`` bars held in memory as a zero-copy view, empty when
+        unknown. The view aliases the ring: compute on it, copy to keep it.
+        """
+        with self._lock:
+            ring = self._rings.get(ticker.upper())
+            if ring is None or not len(ring):
+                return pd.DataFrame(columns=list(FIELDS))
+            return ring.frame(n)
+
+    def history(self, ticker: str, n: int) -> pd.DataFrame:
+        """
+        A copy of the newest ``n`` bars, reaching into spilled history when
+        the ring holds fewer. Safe to keep, unlike ``window``.
+        """
+        with self._lock:
+            ring = self._rings.get(ticker.upper())
+            empty = ring is None or not len(ring)
+            recent = pd.DataFrame(columns=list(FIELDS)) if empty else ring.frame(n, copy=True)
+        if len(recent) >= n or self.bar_store is None:
+            return recent
+        spilled = self.bar_store.get(self._key(ticker.upper()))
+        if spilled is None or spilled.empty:
+            return recent
+        if len(recent):
+            spilled = spilled[spilled.index < recent.index[0]]
+        return pd.concat([spilled, recent]).tail(n)
+
+    def _spill_ring(self, ticker: str, ring: IntradayRing) -> bool:
+        pending = ring.total - ring.spilled
+        if self.bar_store is None or pending <= 0:
+            return False
+        # Include the last spilled bar again in case it was revised since
+        fresh = ring.frame(min(pending + 1, len(ring)), copy=True)
+        previous = self.bar_store.get(self._key(ticker))
+        if previous is not None and not previous.empty:
+            fresh = pd.concat([previous[previous.index < fresh.index[0]], fresh])
+        fresh = fresh.tail(self.history_bars)
+        self.bar_store.put(self._key(ticker), fresh, len(fresh))
+        ring.spilled = ring.total
+        return True
+
+    def spill(self) -> int:
+        """Write every ticker's unspilled bars to the bar store; returns tickers written."""
+        written = 0
+        with self._lock:
+            items = list(self._rings.items())
+        for ticker, ring in items:
+            with self._lock:
+                written += self._spill_ring(ticker, ring)
+        self.spills += 1
+        return written
+
+    def export_state(self) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        with self._lock:
+            items = list(self._rings.items())
+            arrays = {
+                "values": np.stack([r.values for _, r in items]) if items else np.empty((0, len(FIELDS), 0)),
+                "times": np.stack([r.times for _, r in items]) if items else np.empty((0, 0), dtype=np.int64),
+                "counters": np.array([(r.total, r.spilled) for _, r in items], dtype=np.int64).reshape(-1, 2),
+                "updated_at": np.array([r.updated_at for _, r in items]),
+            }
+        return {"tickers": [t for t, _ in items], "capacity": self.capacity, "interval": self.interval}, arrays
+
+    def restore_state(self, meta: Dict, arrays: Dict[str, np.ndarray]) -> None:
+        """Rebuild rings from ``export_state``, copied out of the snapshot since rings are written to."""
+        if meta["capacity"] != self.capacity or meta["interval"] != self.interval:
+            return
+        with self._lock:
+            tickers = meta["tickers"]
+            # Rings were exported least recently updated first; keep the newest
+            for i in range(max(0, len(tickers) - self.max_tickers), len(tickers)):
+                ring = IntradayRing(self.capacity)
+                ring.values[:] = arrays["values"][i]
+                ring.times[:] = arrays["times"][i]
+                ring.total, ring.spilled = (int(x) for x in arrays["counters"][i])
+                ring.updated_at = float(arrays["updated_at"][i])
+                self._rings[tickers[i]] = ring
+
+    def last_time(self, ticker: str) -> Optional[pd.Timestamp]:
+        ring = self._rings.get(ticker.upper())
+        last = ring.last_time if ring is not None else None
+        return pd.Timestamp(last) if last is not None else None
+
+    def get_stats(self) -> Dict:
+        rings = list(self._rings.values())
+        return {
+            "tickers": len(rings),
+            "max_tickers": self.max_tickers,
+            "capacity": self.capacity,
+            "bars": sum(len(r) for r in rings),
+            "appended": self.appended,
+            "revised": self.revised,
+            "unspilled": sum(r.total - r.spilled for r in rings),
+            "lost": self.lost,
+            "spills": self.spills,
+            "evictions": self.evictions,
+            "memory_bytes": sum(r.values.nbytes + r.times.nbytes for r in rings),
+        }
+
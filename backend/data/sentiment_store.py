@@ -0,0 +1,216 @@
+import json
+import math
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+class SentimentStore:
+    """
+    Rolling per-ticker sentiment over a fixed time window.
+
+    Each ticker owns one row of ring buffers with ``buckets`` slots of
+    ``bucket_seconds`` (24h of 15-minute buckets by default) holding the
+    mention count and the sum and sum of squares of compound scores. Running
+    totals per row are kept alongside, and buckets are cleared as the row's
+    clock advances, so both updates and reads cost O(1) in the number of
+    tickers and amortised O(1) in the number of buckets.
+
+    At most ``max_tickers`` rows exist; a new ticker reuses the row of the
+    one updated least recently. ``save``/``load`` keep the arrays in one
+    ``.npz`` file.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_tickers: int = 2000,
+        buckets: int = 96,
+        bucket_seconds: int = 900,
+        velocity_buckets: int = 4,
+        threshold: float = 0.05,
+    ) -> None:
+        self.path = path
+        self.max_tickers = max_tickers
+        self.buckets = buckets
+        self.bucket_seconds = bucket_seconds
+        # Recent buckets compared against the window average for mention velocity
+        self.velocity_buckets = velocity_buckets
+        self.threshold = threshold
+        self._counts = np.zeros((max_tickers, buckets), dtype=np.uint32)
+        self._sums = np.zeros((max_tickers, buckets), dtype=np.float32)
+        self._squares = np.zeros((max_tickers, buckets), dtype=np.float32)
+        self._totals = np.zeros((max_tickers, 3), dtype=np.float64)
+        # Newest bucket epoch written per row; -1 for an unused row
+        self._heads = np.full(max_tickers, -1, dtype=np.int64)
+        self._rows: Dict[str, int] = {}
+        self._tickers: List[Optional[str]] = [None] * max_tickers
+        self._lock = threading.Lock()
+        self.updates = 0
+        self.evictions = 0
+        if path:
+            self.load()
+
+    def _epoch(self, now: Optional[float]) -> int:
+        return int((time.time() if now is None else now) // self.bucket_seconds)
+
+    def _advance(self, row: int, epoch: int) -> None:
+        # Clear the slots of every bucket that fell out of the window since the last write
+        head = int(self._heads[row])
+        if head < 0 or epoch <= head:
+            return
+        stale = range(head + 1, head + 1 + min(epoch - head, self.buckets))
+        slots = [e % self.buckets for e in stale]
+        self._totals[row, 0] -= self._counts[row, slots].sum()
+        self._totals[row, 1] -= self._sums[row, slots].sum(dtype=np.float64)
+        self._totals[row, 2] -= self._squares[row, slots].sum(dtype=np.float64)
+        self._counts[row, slots] = 0
+        self._sums[row, slots] = 0.0
+        self._squares[row, slots] = 0.0
+        if epoch - head >= self.buckets:
+            # Whole window expired; drop float drift along with it
+            self._totals[row] = 0.0
+        self._heads[row] = epoch
+
+    def _row(self, ticker: str, epoch: int) -> int:
+        row = self._rows.get(ticker)
+        if row is not None:
+            return row
+        if len(self._rows) < self.max_tickers:
+            row = len(self._rows)
+        else:
+            row = int(np.argmin(self._heads))
+            self._rows.pop(self._tickers[row], None)
+            self.evictions += 1
+        self._rows[ticker] = row
+        self._tickers[row] = ticker
+        self._counts[row] = 0
+        self._sums[row] = 0.0
+        self._squares[row] = 0.0
+        self._totals[row] = 0.0
+        self._heads[row] = epoch
+        return row
+
+    def update(self, ticker: str, compound: float, now: Optional[float] = None) -> None:
+        epoch = self._epoch(now)
+        with self._lock:
+            row = self._row(ticker.upper(), epoch)
+            self._advance(row, epoch)
+            slot = epoch % self.buckets
+            self._counts[row, slot] += 1
+            self._sums[row, slot] += compound
+            self._squares[row, slot] += compound * compound
+            self._totals[row] += (1, compound, compound * compound)
+            self.updates += 1
+
+    def add(self, post) -> None:
+        """Pipeline sink: one update per ticker mentioned by a scored post, at ingestion time."""
+        now = time.time()
+        for ticker in post.mentions:
+            self.update(ticker, post.compound, now)
+
+    def features(self, ticker: str, now: Optional[float] = None) -> Optional[Dict]:
+        """Window features for ``ticker``, or None when it has no mentions in the window."""
+        epoch = self._epoch(now)
+        with self._lock:
+            row = self._rows.get(ticker.upper())
+            if row is None:
+                return None
+            self._advance(row, epoch)
+            count, total, squares = (float(x) for x in self._totals[row])
+            recent = [e % self.buckets for e in range(epoch - self.velocity_buckets + 1, epoch + 1)]
+            recent_count = int(self._counts[row, recent].sum())
+        if count < 0.5:
+            return None
+        mean = total / count
+        variance = max(0.0, squares / count - mean * mean)
+        window_rate = count / self.buckets
+        recent_rate = recent_count / self.velocity_buckets
+        # Agreement of the scores, shrunk towards the neutral 0.5 while mentions are few
+        weight = count / (count + 5)
+        consistency = weight * (1 - min(1.0, math.sqrt(variance))) + (1 - weight) * 0.5
+        label = "Neutral"
+        if mean >= self.threshold:
+            label = "Bullish"
+        elif mean <= -self.threshold:
+            label = "Bearish"
+        return {
+            "ticker": ticker.upper(),
+            "mentions": int(round(count)),
+            "mean_compound": round(mean, 4),
+            "std_compound": round(math.sqrt(variance), 4),
+            "mention_velocity": round(recent_rate / window_rate, 2) if window_rate else 0.0,
+            "consistency": round(consistency, 4),
+            "label": label,
+            "window_hours": self.buckets * self.bucket_seconds / 3600,
+        }
+
+    def features_many(self, tickers: Iterable[str], now: Optional[float] = None) -> Dict[str, Dict]:
+        out = {}
+        for t in tickers:
+            f = self.features(t, now)
+            if f is not None:
+                out[t.upper()] = f
+        return out
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            meta = {
+                "buckets": self.buckets,
+                "bucket_seconds": self.bucket_seconds,
+                "tickers": self._tickers[: len(self._rows)],
+            }
+            used = len(self._rows)
+            arrays = {
+                "meta": np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8),
+                "counts": self._counts[:used].copy(),
+                "sums": self._sums[:used].copy(),
+                "squares": self._squares[:used].copy(),
+                "totals": self._totals[:used].copy(),
+                "heads": self._heads[:used].copy(),
+            }
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(tmp, self.path)
+        except Exception:
+            # Losing the snapshot only costs a cold window after restart
+            pass
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as data:
+                meta = json.loads(data["meta"].tobytes())
+                if meta["buckets"] != self.buckets or meta["bucket_seconds"] != self.bucket_seconds:
+                    return
+                tickers = meta["tickers"][: self.max_tickers]
+                used = len(tickers)
+                with self._lock:
+                    self._counts[:used] = data["counts"][:used]
+                    self._sums[:used] = data["sums"][:used]
+                    self._squares[:used] = data["squares"][:used]
+                    self._totals[:used] = data["totals"][:used]
+                    self._heads[:used] = data["heads"][:used]
+                    self._rows = {t: i for i, t in enumerate(tickers)}
+                    self._tickers[:used] = tickers
+        except Exception:
+            return
+
+    def get_stats(self) -> Dict:
+        return {
+            "tickers": len(self._rows),
+            "max_tickers": self.max_tickers,
+            "updates": self.updates,
+            "evictions": self.evictions,
+            "memory_bytes": self._counts.nbytes + self._sums.nbytes + self._squares.nbytes + self._totals.nbytes,
+        }
+
@@ -0,0 +1,234 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+# Comparison operators accepted in filters
+OPERATORS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+Filter = Tuple[str, str, Union[float, str]]
+
+
+class SnapshotTable:
+    """
+    Latest indicator values for a whole universe, one ``float64`` column each.
+
+    Rows are addressed by a ticker -> row map and grow by doubling; unknown
+    values are NaN. Each row remembers the last bar it was computed from, so
+    an unchanged frame is not recomputed.
+
+    Columns listed in ``indexed`` keep a sorted index (row ids ordered by
+    value, NaNs left out), rebuilt lazily on the first query after a write.
+    A query resolves its most selective range filter on an indexed column
+    with a binary search, applies the remaining filters as vectorized masks
+    over those candidates only, and ranks with a partial sort when a limit
+    is given.
+    """
+
+    def __init__(self, columns: Sequence[str], indexed: Iterable[str] = (), capacity: int = 1024) -> None:
+        self.columns = tuple(columns)
+        self.indexed = tuple(c for c in indexed if c in self.columns)
+        self._data: Dict[str, np.ndarray] = {c: np.full(capacity, np.nan) for c in self.columns}
+        # Last bar time (epoch seconds) and close each row was computed from, and when
+        self._bar_time = np.full(capacity, np.nan)
+        self._bar_close = np.full(capacity, np.nan)
+        self._updated_at = np.zeros(capacity)
+        self._rows: Dict[str, int] = {}
+        self._tickers: List[str] = []
+        # column -> (row ids sorted by value, the sorted values)
+        self._indexes: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._dirty = True
+        self._lock = threading.Lock()
+        self.upserts = 0
+        self.index_builds = 0
+        self.queries = 0
+
+    def __len__(self) -> int:
+        return len(self._tickers)
+
+    def _grow(self) -> None:
+        size = len(self._updated_at) * 2
+
+        def grown(column: np.ndarray, fill: float) -> np.ndarray:
+            out = np.full(size, fill)
+            out[: len(column)] = column
+            return out
+
+        self._data = {c: grown(v, np.nan) for c, v in self._data.items()}
+        self._bar_time = grown(self._bar_time, np.nan)
+        self._bar_close = grown(self._bar_close, np.nan)
+        self._updated_at = grown(self._updated_at, 0.0)
+
+    def is_current(self, ticker: str, bar_time: float, bar_close: float) -> bool:
+        """True when ``ticker`` was last computed from this same bar."""
+        row = self._rows.get(ticker.upper())
+        return row is not None and self._bar_time[row] == bar_time and self._bar_close[row] == bar_close
+
+    def upsert(self, ticker: str, values: Dict[str, Optional[float]], bar_time: float = np.nan,
+               bar_close: float = np.nan) -> None:
+        ticker = ticker.upper()
+        with self._lock:
+            row = self._rows.get(ticker)
+            if row is None:
+                if len(self._tickers) == len(self._updated_at):
+                    self._grow()
+                row = self._rows[ticker] = len(self._tickers)
+                self._tickers.append(ticker)
+            for column, data in self._data.items():
+                value = values.get(column)
+                data[row] = np.nan if value is None else value
+            self._bar_time[row] = bar_time
+            self._bar_close[row] = bar_close
+            self._updated_at[row] = time.time()
+            self._dirty = True
+            self.upserts += 1
+
+    def update_columns(self, ticker: str, values: Dict[str, Optional[float]]) -> bool:
+        """
+        Overwrite only the given columns of an existing row, leaving its other
+        values and bar version alone; False when ``ticker`` has no row yet.
+        """
+        with self._lock:
+            row = self._rows.get(ticker.upper())
+            if row is None:
+                return False
+            for column, value in values.items():
+                if column in self._data:
+                    self._data[column][row] = np.nan if value is None else value
+            self._updated_at[row] = time.time()
+            self._dirty = True
+            self.upserts += 1
+        return True
+
+    def _index(self, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        if self._dirty:
+            used = len(self._tickers)
+            for c in self.indexed:
+                values = self._data[c][:used]
+                rows = np.flatnonzero(~np.isnan(values))
+                order = rows[np.argsort(values[rows], kind="stable")]
+                self._indexes[c] = (order, values[order])
+            self._dirty = False
+            self.index_builds += 1
+        return self._indexes[column]
+
+    def _operand(self, value: Union[float, str], rows: np.ndarray) -> Union[float, np.ndarray]:
+        return self._data[value][rows] if isinstance(value, str) else value
+
+    def _candidates(self, filters: List[Filter]) -> Tuple[np.ndarray, List[Filter]]:
+        # Narrow to the smallest range one indexed filter allows; the rest become masks
+        best: Optional[np.ndarray] = None
+        best_filter: Optional[Filter] = None
+        for f in filters:
+            column, op, value = f
+            if column not in self.indexed or isinstance(value, str) or op == "!=":
+                continue
+            order, values = self._index(column)
+            lo, hi = 0, len(values)
+            if op in (">", ">=", "=="):
+                lo = np.searchsorted(values, value, side="right" if op == ">" else "left")
+            if op in ("<", "<=", "=="):
+                hi = np.searchsorted(values, value, side="left" if op == "<" else "right")
+            if best is None or hi - lo < len(best):
+                best, best_filter = order[lo:hi], f
+        if best is None:
+            return np.arange(len(self._tickers)), filters
+        return np.sort(best), [f for f in filters if f is not best_filter]
+
+    def query(
+        self,
+        filters: Sequence[Filter] = (),
+        sort: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict:
+        """
+        Rows matching every ``(column, op, value)`` filter, where ``value`` is
+        a number or another column name. NaN never matches. Results are
+        ordered by ``sort`` (NaNs last) and cut to ``limit``.
+        """
+        for column, op, value in filters:
+            if column not in self._data or (isinstance(value, str) and value not in self._data):
+                raise KeyError(value if column in self._data else column)
+            if op not in OPERATORS:
+                raise ValueError(f"Unknown operator: {op}")
+        if sort is not None and sort not in self._data:
+            raise KeyError(sort)
+        columns = list(columns) if columns else list(self.columns)
+        for c in columns:
+            if c not in self._data:
+                raise KeyError(c)
+        with self._lock:
+            self.queries += 1
+            rows, remaining = self._candidates(list(filters))
+            for column, op, value in remaining:
+                if not len(rows):
+                    break
+                left = self._data[column][rows]
+                right = self._operand(value, rows)
+                with np.errstate(invalid="ignore"):
+                    mask = OPERATORS[op](left, right) & ~np.isnan(left) & ~np.isnan(right)
+                rows = rows[mask]
+            matched = len(rows)
+            if sort is not None and len(rows):
+                keys = self._data[sort][rows]
+                keys = np.where(np.isnan(keys), np.inf, -keys if descending else keys)
+                if limit is not None and limit < len(rows):
+                    top = np.argpartition(keys, limit - 1)[:limit]
+                    rows = rows[top[np.argsort(keys[top], kind="stable")]]
+                else:
+                    rows = rows[np.argsort(keys, kind="stable")]
+            if limit is not None:
+                rows = rows[:limit]
+            values = {c: self._data[c][rows] for c in columns}
+            bar_time = self._bar_time[rows]
+            results = []
+            for i, row in enumerate(rows):
+                item = {"ticker": self._tickers[row]}
+                item.update({c: (None if np.isnan(v[i]) else float(v[i])) for c, v in values.items()})
+                item["as_of"] = None if np.isnan(bar_time[i]) else int(bar_time[i])
+                results.append(item)
+        return {"results": results, "matched": matched, "universe": len(self._tickers)}
+
+    def export_state(self) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        with self._lock:
+            used = len(self._tickers)
+            return {"tickers": list(self._tickers), "columns": list(self.columns)}, {
+                "values": np.stack([self._data[c][:used] for c in self.columns]) if used else np.empty((0, 0)),
+                "bar_time": self._bar_time[:used].copy(),
+                "bar_close": self._bar_close[:used].copy(),
+                "updated_at": self._updated_at[:used].copy(),
+            }
+
+    def restore_state(self, meta: Dict, arrays: Dict[str, np.ndarray]) -> None:
+        """Load rows from ``export_state``; columns no longer in the table are dropped, new ones stay NaN."""
+        positions = {c: i for i, c in enumerate(meta["columns"])}
+        values = arrays["values"]
+        for i, ticker in enumerate(meta["tickers"]):
+            row = {c: float(values[positions[c], i]) for c in self.columns if c in positions}
+            self.upsert(ticker, row, float(arrays["bar_time"][i]), float(arrays["bar_close"][i]))
+            self._updated_at[self._rows[ticker]] = arrays["updated_at"][i]
+
+    def get_stats(self) -> Dict:
+        used = len(self._tickers)
+        return {
+            "tickers": used,
+            "columns": len(self.columns),
+            "indexed": list(self.indexed),
+            "upserts": self.upserts,
+            "index_builds": self.index_builds,
+            "queries": self.queries,
+            "oldest_update": int(self._updated_at[:used].min()) if used else None,
+            "memory_bytes": sum(c.nbytes for c in self._data.values()) + 3 * self._updated_at.nbytes,
+        }
+
@@ -0,0 +1,157 @@
+import bisect
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class SortedRanking:
+    """
+    One metric for many tickers, kept sorted as values change.
+
+    ``(value, ticker)`` pairs live in a list ordered by value; an update is a
+    binary search to drop the old pair and another to insert the new one,
+    so the top or bottom ``k`` is a slice.
+    """
+
+    def __init__(self) -> None:
+        self._pairs: List[Tuple[float, str]] = []
+        self._values: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def set(self, ticker: str, value: Optional[float]) -> None:
+        old = self._values.pop(ticker, None)
+        if old is not None:
+            del self._pairs[bisect.bisect_left(self._pairs, (old, ticker))]
+        if value is not None and np.isfinite(value):
+            self._values[ticker] = value
+            bisect.insort(self._pairs, (value, ticker))
+
+    def top(self, k: int) -> List[Tuple[str, float]]:
+        return [(t, v) for v, t in reversed(self._pairs[-k:])] if k > 0 else []
+
+    def bottom(self, k: int) -> List[Tuple[str, float]]:
+        return [(t, v) for v, t in self._pairs[:k]]
+
+
+class TrendingBoard:
+    """
+    Live trending rankings, updated as bars arrive instead of per request.
+
+    For every ticker fed to ``update`` it keeps:
+
+    - ``change_5d_pct``: close versus five bars earlier
+    - ``volume_spike``: last volume over the mean of the previous ``lookback``
+    - ``volatility_breakout``: last 1-bar return in standard deviations of the
+      previous ``lookback`` returns (signed)
+
+    Each metric has its own ``SortedRanking``, so a ranking is served in
+    O(k) and a new bar costs O(log n) comparisons per metric. Frames whose
+    last bar was already seen are skipped. With ``members`` set, ``on_bars``
+    ranks only those tickers, so whatever users happen to request does not
+    crowd the board.
+    """
+
+    METRICS = ("change_5d_pct", "volume_spike", "volatility_breakout")
+
+    def __init__(
+        self,
+        lookback: int = 20,
+        key_prefix: str = "twelvedata:1day:",
+        members: Optional[Iterable[str]] = None,
+    ) -> None:
+        self.lookback = lookback
+        self.key_prefix = key_prefix
+        self.members = frozenset(t.upper() for t in members) if members is not None else None
+        self._rankings: Dict[str, SortedRanking] = {m: SortedRanking() for m in self.METRICS}
+        # ticker -> (last bar time, last close, volume, metric values)
+        self._latest: Dict[str, Tuple[pd.Timestamp, float, Optional[float], Dict[str, Optional[float]]]] = {}
+        self._lock = threading.Lock()
+        self.updates = 0
+        self.unchanged = 0
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+    def on_bars(self, key: str, df: pd.DataFrame) -> None:
+        """Bar store listener for daily frames."""
+        if key.startswith(self.key_prefix):
+            ticker = key[len(self.key_prefix):].upper()
+            if self.members is None or ticker in self.members:
+                self.update(ticker, df)
+
+    def missing(self) -> List[str]:
+        """Members not ranked yet."""
+        return sorted(t for t in self.members or () if t not in self._latest)
+
+    def _metrics(self, close: np.ndarray, volume: Optional[np.ndarray]) -> Dict[str, Optional[float]]:
+        out: Dict[str, Optional[float]] = dict.fromkeys(self.METRICS)
+        if len(close) > 5 and close[-6]:
+            out["change_5d_pct"] = (close[-1] / close[-6] - 1) * 100
+        if volume is not None and len(volume) > self.lookback:
+            base = volume[-self.lookback - 1:-1].mean()
+            if base > 0:
+                out["volume_spike"] = volume[-1] / base
+        if len(close) > self.lookback + 1:
+            returns = np.diff(close[-self.lookback - 2:]) / close[-self.lookback - 2:-1]
+            std = returns[:-1].std()
+            if std > 0:
+                out["volatility_breakout"] = returns[-1] / std
+        return {m: (float(v) if v is not None and np.isfinite(v) else None) for m, v in out.items()}
+
+    def update(self, ticker: str, df: pd.DataFrame) -> bool:
+        """Re-rank ``ticker`` from its bars; False when the last bar is unchanged."""
+        if df.empty or "Close" not in df:
+            return False
+        ticker = ticker.upper()
+        tail = df.tail(self.lookback + 2)
+        bar_time, last_close = tail.index[-1], float(tail["Close"].iloc[-1])
+        known = self._latest.get(ticker)
+        if known is not None and known[0] == bar_time and known[1] == last_close:
+            self.unchanged += 1
+            return False
+        close = tail["Close"].to_numpy(dtype=np.float64)
+        volume = tail["Volume"].to_numpy(dtype=np.float64) if "Volume" in tail else None
+        with np.errstate(divide="ignore", invalid="ignore"):
+            metrics = self._metrics(close, volume)
+        with self._lock:
+            current = self._latest.get(ticker)
+            if current is not None and current[0] > bar_time:
+                # A newer frame was ranked while this one was computed
+                return False
+            for name, ranking in self._rankings.items():
+                ranking.set(ticker, metrics[name])
+            last_volume = float(volume[-1]) if volume is not None and np.isfinite(volume[-1]) else None
+            self._latest[ticker] = (bar_time, last_close, last_volume, metrics)
+            self.updates += 1
+        return True
+
+    def _item(self, ticker: str) -> Dict:
+        bar_time, close, volume, metrics = self._latest[ticker]
+        return {
+            "ticker": ticker,
+            **{m: (round(v, 2) if v is not None else None) for m, v in metrics.items()},
+            "close": close,
+            "volume": volume,
+            "as_of": str(bar_time),
+        }
+
+    def top(self, metric: str = "change_5d_pct", k: int = 10, ascending: bool = False) -> List[Dict]:
+        """The ``k`` tickers with the highest (or, with ``ascending``, lowest) ``metric``."""
+        ranking = self._rankings[metric]
+        with self._lock:
+            ranked = ranking.bottom(k) if ascending else ranking.top(k)
+            return [self._item(t) for t, _ in ranked]
+
+    def get_stats(self) -> Dict:
+        return {
+            "tickers": len(self._latest),
+            "members": len(self.members) if self.members is not None else None,
+            "ranked": {m: len(r) for m, r in self._rankings.items()},
+            "updates": self.updates,
+            "unchanged": self.unchanged,
+        }
+
@@ -0,0 +1,184 @@
+"""
+Warm-start snapshots of computed in-memory state.
+
+One binary file holds every registered section: a fixed header, a JSON
+manifest and the sections' arrays, each 64-byte aligned so a reader can map
+the file and view the arrays in place::
+
+    magic (8) | format version (u32) | manifest length (u32) | manifest | arrays...
+
+Each section records its own version, so changing one component's layout
+invalidates only that section. Files are replaced atomically; a worker that
+still maps the previous file keeps reading it unharmed.
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from ..utils.logger import get_logger
+
+
+_logger = get_logger(__name__)
+
+MAGIC = b"TBWARM\x00\x00"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sII")
+_ALIGN = 64
+
+# A section's state: JSON-serializable metadata plus named arrays
+State = Tuple[Dict, Dict[str, np.ndarray]]
+Restore = Callable[[Dict, Dict[str, np.ndarray]], None]
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def write_snapshot(path: str, sections: Dict[str, Dict]) -> int:
+    """
+    Write ``{name: {"version", "meta", "arrays"}}`` to ``path``; returns bytes written.
+    """
+    layout: Dict[str, Dict] = {}
+    blobs = []
+    offset = 0
+    for name, section in sections.items():
+        arrays = {}
+        for key, array in section["arrays"].items():
+            array = np.ascontiguousarray(array)
+            offset = _aligned(offset)
+            arrays[key] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            blobs.append((offset, array))
+            offset += array.nbytes
+        layout[name] = {"version": section["version"], "meta": section["meta"], "arrays": arrays}
+    manifest = json.dumps({"created_at": time.time(), "sections": layout}).encode()
+    data_start = _aligned(_HEADER.size + len(manifest))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(manifest)))
+        f.write(manifest)
+        for start, array in blobs:
+            f.seek(data_start + start)
+            f.write(array.tobytes())
+        size = f.tell()
+    os.replace(tmp, path)
+    return size
+
+
+class SnapshotFile:
+    """
+    A snapshot mapped read-only; ``arrays`` are zero-copy views of the mapping.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, length = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a version {FORMAT_VERSION} warm snapshot: {path}")
+        manifest = json.loads(self._map[_HEADER.size:_HEADER.size + length])
+        self.created_at: float = manifest["created_at"]
+        self.size = len(self._map)
+        self._data_start = _aligned(_HEADER.size + length)
+        self._sections: Dict[str, Dict] = manifest["sections"]
+
+    def section(self, name: str, version: int) -> Optional[State]:
+        """``(meta, arrays)`` for ``name``, or None when missing or written by another version."""
+        section = self._sections.get(name)
+        if section is None or section["version"] != version:
+            return None
+        arrays = {}
+        for key, spec in section["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            count = int(np.prod(spec["shape"], dtype=np.int64))
+            if not count:
+                arrays[key] = np.empty(spec["shape"], dtype=dtype)
+                continue
+            arrays[key] = np.frombuffer(
+                self._map, dtype=dtype, count=count, offset=self._data_start + spec["offset"]
+            ).reshape(spec["shape"])
+        return section["meta"], arrays
+
+
+class WarmState:
+    """
+    Periodic snapshot of registered components' computed state.
+
+    Each component registers an ``export`` returning ``(meta, arrays)`` and
+    a ``restore`` taking the same, plus a version bumped whenever that
+    layout changes. ``save`` runs on the scheduler; ``restore`` runs once at
+    startup, before any job can go upstream for the same data.
+    """
+
+    def __init__(self, path: Optional[str]) -> None:
+        self.path = path
+        self._sections: Dict[str, Tuple[int, Callable[[], State], Restore]] = {}
+        self.last_save: Dict = {}
+        self.last_restore: Dict = {}
+
+    def register(
+        self,
+        name: str,
+        export: Callable[[], State],
+        restore: Restore,
+        version: int = 1,
+    ) -> None:
+        self._sections[name] = (version, export, restore)
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        started = time.perf_counter()
+        sections = {}
+        for name, (version, export, _) in self._sections.items():
+            meta, arrays = export()
+            sections[name] = {"version": version, "meta": meta, "arrays": arrays}
+        size = write_snapshot(self.path, sections)
+        self.last_save = {
+            "bytes": size,
+            "seconds": round(time.perf_counter() - started, 3),
+            "finished_at": int(time.time()),
+        }
+
+    def restore(self) -> None:
+        # Startup hooks may fire more than once; restore a single time
+        if self.last_restore or not self.path or not os.path.exists(self.path):
+            return
+        started = time.perf_counter()
+        try:
+            snapshot = SnapshotFile(self.path)
+        except Exception as e:
+            _logger.warning("warm snapshot unreadable, starting cold: %s", e)
+            return
+        restored, skipped = [], []
+        for name, (version, _, restore) in self._sections.items():
+            state = snapshot.section(name, version)
+            if state is None:
+                skipped.append(name)
+                continue
+            try:
+                restore(*state)
+                restored.append(name)
+            except Exception as e:
+                _logger.warning("warm snapshot section %s not restored: %s", name, e)
+                skipped.append(name)
+        self.last_restore = {
+            "restored": restored,
+            "skipped": skipped,
+            "snapshot_age_seconds": int(time.time() - snapshot.created_at),
+            "bytes": snapshot.size,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        _logger.info(
+            "warm snapshot: restored %s in %.3fs", ", ".join(restored) or "nothing", self.last_restore["seconds"]
+        )
+
+    def get_stats(self) -> Dict:
+        return {"path": self.path, "last_save": self.last_save, "last_restore": self.last_restore}
+
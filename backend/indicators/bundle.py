@@ -0,0 +1,229 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+from . import volatility as vol_mod
+from . import momentum as mom_mod
+from . import risk as risk_mod
+from . import extreme_value as evt_mod
+from . import trend as trend_mod
+from . import volume as vol_ind
+from .fundamental import compute_basic_fundamentals
+
+
+# Module-level, picklable entry points so the API can run them in a worker process
+
+
+def stock_payload(tkr: str, df: pd.DataFrame, fundamentals: Optional[Dict] = None) -> Dict:
+    """
+    Latest values of every indicator shown by ``/stock``.
+
+    ``fundamentals`` comes from the in-memory fundamentals table; it is read
+    by the caller, never fetched here.
+    """
+    atr = vol_mod.calculate_atr(df)
+    bb = vol_mod.calculate_bollinger_bands(df["Close"]) if "Close" in df else {}
+    hv = vol_mod.calculate_historical_volatility(df["Close"].pct_change().dropna()) if "Close" in df else None
+    macdv = mom_mod.calculate_macd_v(df)
+    rsi = mom_mod.calculate_rsi(df["Close"]) if "Close" in df else {"rsi": None}
+    stoch = mom_mod.calculate_stochastic(df)
+    mdd = risk_mod.calculate_max_drawdown(df["Close"]) if "Close" in df else {"max_drawdown": None}
+    var = risk_mod.calculate_var(df["Close"].pct_change().dropna()) if "Close" in df else {"var": None, "cvar": None}
+    tail = evt_mod.calculate_tail_risk(df["Close"].pct_change().dropna()) if "Close" in df else {}
+
+    return {
+        "ticker": tkr,
+        "current_price": float(df["Close"].iloc[-1]) if "Close" in df and not df.empty else None,
+        "volatility": {
+            "atr": float(atr.iloc[-1]) if len(atr) else None,
+            "bollinger": {k: (float(v.iloc[-1]) if hasattr(v, "iloc") else None) for k, v in bb.items()} if bb else {},
+            "historical_volatility": hv,
+        },
+        "momentum": {
+            "macd_v": float(macdv["macd_v"].iloc[-1]) if len(macdv["macd_v"]) else None,
+            "signal": float(macdv["signal"].iloc[-1]) if len(macdv["signal"]) else None,
+            "hist": float(macdv["hist"].iloc[-1]) if len(macdv["hist"]) else None,
+            "rsi": float(rsi.get("rsi").iloc[-1]) if rsi.get("rsi") is not None else None,
+            "stochastic": {
+                "k": float(stoch["%K"].iloc[-1]) if len(stoch["%K"]) else None,
+                "d": float(stoch["%D"].iloc[-1]) if len(stoch["%D"]) else None,
+            },
+        },
+        "risk": {
+            "max_drawdown": mdd.get("max_drawdown"),
+            "var": var.get("var"),
+            "cvar": var.get("cvar"),
+            "tail_risk": tail,
+        },
+        "fundamentals": fundamentals or {**compute_basic_fundamentals({}), "as_of": None},
+    }
+
+
+def stock_payloads(frames: Dict[str, pd.DataFrame], fundamentals: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+    """
+    ``stock_payload`` for many tickers in one worker call.
+
+    Failures are reported per ticker as ``{"error": message}``.
+    """
+    out = {}
+    for tkr, df in frames.items():
+        try:
+            out[tkr] = stock_payload(tkr, df, (fundamentals or {}).get(tkr))
+        except Exception as e:
+            out[tkr] = {"error": str(e)}
+    return out
+
+
+def analysis_snapshot(df: pd.DataFrame) -> Dict:
+    """
+    Latest values behind the legacy ``/api/v1/analyze`` response, each computed once.
+
+    Keeps that route's definitions: MACD from adjusted EMAs, and an RSI of
+    100 when there were no losses over the window.
+    """
+    close = df["Close"]
+    returns = close.pct_change().dropna()
+    rsi = mom_mod.calculate_rsi(close)["rsi"].iloc[-1]
+    if pd.isna(rsi) and len(close) > 14 and (close.diff().iloc[-14:] >= 0).all():
+        rsi = 100.0
+    macd = trend_mod.ema(close, 12, adjust=True) - trend_mod.ema(close, 26, adjust=True)
+    std = returns.std()
+    return {
+        "sma_20": float(trend_mod.sma(close, 20).iloc[-1]),
+        "sma_50": float(trend_mod.sma(close, 50).iloc[-1]),
+        "rsi": float(rsi),
+        "macd": float(macd.iloc[-1]),
+        "annual_volatility": float(std * np.sqrt(252)) if len(returns) else 0.0,
+        "var_99": float(returns.quantile(0.01)) if len(returns) else None,
+        "sharpe_ratio": float(returns.mean() / std * np.sqrt(252)) if len(returns) and std else 0.0,
+    }
+
+
+SCREENER_COLUMNS = (
+    "close", "change_1d_pct", "change_5d_pct", "volume",
+    "sma_20", "sma_50", "sma_200", "ema_20", "ema_50", "ema_200",
+    "rsi", "macd_v", "macd_signal", "macd_hist", "stoch_k", "stoch_d",
+    "atr", "bb_upper", "bb_middle", "bb_lower", "bb_bandwidth", "bb_percent_b", "hist_volatility",
+    "vwap", "obv", "volume_roc",
+    "max_drawdown", "var", "cvar", "sharpe_ratio", "tail_risk_prob", "skew", "kurtosis",
+)
+
+
+def _last(series: pd.Series) -> float:
+    value = series.iloc[-1] if len(series) else np.nan
+    return float(value) if pd.notna(value) else np.nan
+
+
+def screener_row(df: pd.DataFrame) -> Dict[str, float]:
+    """
+    Latest value of every indicator in ``backend/indicators`` as flat floats,
+    keyed by ``SCREENER_COLUMNS``; NaN where there is not enough history.
+    """
+    close = df["Close"]
+    returns = close.pct_change().dropna()
+    bb = vol_mod.calculate_bollinger_bands(close)
+    stoch = mom_mod.calculate_stochastic(df)
+    macdv = mom_mod.calculate_macd_v(df)
+    var = risk_mod.calculate_var(returns)
+    tail = evt_mod.calculate_tail_risk(returns)
+    dist = evt_mod.calculate_return_distribution(returns)
+    row = {
+        "close": _last(close),
+        "change_1d_pct": _last(close.pct_change() * 100),
+        "change_5d_pct": _last(close.pct_change(5) * 100),
+        "volume": _last(df["Volume"]),
+        "sma_20": _last(trend_mod.sma(close, 20)),
+        "sma_50": _last(trend_mod.sma(close, 50)),
+        "sma_200": _last(trend_mod.sma(close, 200)),
+        "ema_20": _last(trend_mod.ema(close, 20)),
+        "ema_50": _last(trend_mod.ema(close, 50)),
+        "ema_200": _last(trend_mod.ema(close, 200)),
+        "rsi": _last(mom_mod.calculate_rsi(close)["rsi"]),
+        "macd_v": _last(macdv["macd_v"]),
+        "macd_signal": _last(macdv["signal"]),
+        "macd_hist": _last(macdv["hist"]),
+        "stoch_k": _last(stoch["%K"]),
+        "stoch_d": _last(stoch["%D"]),
+        "atr": _last(vol_mod.calculate_atr(df)),
+        "bb_upper": _last(bb["upper"]),
+        "bb_middle": _last(bb["middle"]),
+        "bb_lower": _last(bb["lower"]),
+        "bb_bandwidth": _last(bb["bandwidth"]),
+        "bb_percent_b": _last(bb["%b"]),
+        "hist_volatility": vol_mod.calculate_historical_volatility(returns) if len(returns) else np.nan,
+        "vwap": _last(pd.to_numeric(vol_ind.vwap(df), errors="coerce")),
+        "obv": _last(vol_ind.obv(df)),
+        "volume_roc": _last(vol_ind.volume_roc(df)),
+        "max_drawdown": risk_mod.calculate_max_drawdown(close)["max_drawdown"] if len(close) else np.nan,
+        "var": var["var"],
+        "cvar": var["cvar"],
+        "sharpe_ratio": risk_mod.calculate_sharpe_ratio(returns) if len(returns) else np.nan,
+        "tail_risk_prob": tail["tail_risk_prob"],
+        "skew": dist["skew"],
+        "kurtosis": dist["kurtosis"],
+    }
+    return {k: (np.nan if v is None else float(v)) for k, v in row.items()}
+
+
+def _series(df: pd.DataFrame) -> Dict[str, pd.Series]:
+    # Full-length chart series keyed by flat column name; each indicator is computed once
+    close = df["Close"]
+    bb = vol_mod.calculate_bollinger_bands(close)
+    stoch = mom_mod.calculate_stochastic(df)
+    return {
+        "close": close,
+        "atr": vol_mod.calculate_atr(df),
+        "bollinger.upper": bb["upper"],
+        "bollinger.middle": bb["middle"],
+        "bollinger.lower": bb["lower"],
+        "rsi": mom_mod.calculate_rsi(close)["rsi"],
+        "stochastic.k": stoch["%K"],
+        "stochastic.d": stoch["%D"],
+        "ema.ema20": trend_mod.ema(close, 20),
+        "ema.ema50": trend_mod.ema(close, 50),
+        "ema.ema200": trend_mod.ema(close, 200),
+        "sma.sma20": trend_mod.sma(close, 20),
+        "sma.sma50": trend_mod.sma(close, 50),
+        "sma.sma200": trend_mod.sma(close, 200),
+    }
+
+
+def indicator_series(tkr: str, df: pd.DataFrame, points: int = 120) -> Dict:
+    """Trailing series for the ``/indicators`` chart payload; NaN warm-up values are dropped per series."""
+    payload: Dict = {"ticker": tkr}
+    for name, series in _series(df).items():
+        values = series.dropna().tail(points).tolist()
+        group, _, key = name.partition(".")
+        if key:
+            payload.setdefault(group, {})[key] = values
+        else:
+            payload[group] = values
+    return payload
+
+
+def indicator_arrays(df: pd.DataFrame, points: int = 120) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    The same series as ``indicator_series`` as aligned float32 columns.
+
+    All columns share the last ``points`` timestamps (epoch seconds); warm-up
+    values stay as NaN instead of being dropped.
+    """
+    index = df.index[-points:]
+    timestamps = np.asarray(index, dtype="datetime64[s]").astype(np.int64)
+    columns = {
+        name: np.ascontiguousarray(series.to_numpy(dtype=np.float32, na_value=np.nan)[-points:])
+        for name, series in _series(df).items()
+    }
+    return timestamps, columns
+
+
+def screener_rows(frames: Dict[str, pd.DataFrame]) -> Dict[str, Dict]:
+    """``screener_row`` for many tickers in one worker call; failures report ``{"error": message}``."""
+    out = {}
+    for tkr, df in frames.items():
+        try:
+            out[tkr] = screener_row(df)
+        except Exception as e:
+            out[tkr] = {"error": str(e)}
+    return out
+
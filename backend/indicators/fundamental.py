@@ -1,14 +1,38 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+
+FIELDS = ("pe_ratio", "pb_ratio", "eps", "market_cap", "dividend_yield")
+
+
+def _number(*values: Any) -> Optional[float]:
+    # First value that parses as a finite number; the API sends numbers, strings or nulls
+    for value in values:
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            continue
+        if number == number and abs(number) != float("inf"):
+            return number
+    return None
 
 
 def compute_basic_fundamentals(raw: Dict[str, Any]) -> Dict:
-    # Placeholder to map Twelve Data fundamentals response later
+    """
+    Map a Twelve Data ``statistics``/``fundamentals`` response to the fields
+    shown with a quote. Missing or unparsable values come back as ``None``.
+    """
+    stats = (raw or {}).get("statistics", raw or {})
+    valuation = stats.get("valuations_metrics") or {}
+    financials = stats.get("financials") or {}
+    income = financials.get("income_statement") or {}
+    dividends = stats.get("dividends_and_splits") or {}
     return {
-        "pe_ratio": None,
-        "pb_ratio": None,
-        "eps": None,
-        "market_cap": None,
-        "dividend_yield": None,
+        "pe_ratio": _number(valuation.get("trailing_pe"), valuation.get("forward_pe")),
+        "pb_ratio": _number(valuation.get("price_to_book_mrq")),
+        "eps": _number(financials.get("diluted_eps_ttm"), income.get("diluted_eps_ttm")),
+        "market_cap": _number(valuation.get("market_capitalization")),
+        "dividend_yield": _number(
+            dividends.get("forward_annual_dividend_yield"), dividends.get("trailing_annual_dividend_yield")
+        ),
     }
 
-
@@ -0,0 +1,132 @@
+from collections import deque
+from typing import Dict, Optional
+
+import pandas as pd
+
+
+class RollingMean:
+    """O(1) rolling mean over the last ``window`` values (matches ``rolling().mean()``)."""
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self._values: deque = deque(maxlen=window)
+        self._sum = 0.0
+
+    def update(self, value: float) -> Optional[float]:
+        if len(self._values) == self.window:
+            self._sum -= self._values[0]
+        self._values.append(value)
+        self._sum += value
+        return self.value
+
+    def revise(self, value: float) -> Optional[float]:
+        """Replace the newest value instead of appending one."""
+        if not self._values:
+            return self.update(value)
+        self._sum += value - self._values[-1]
+        self._values[-1] = value
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._sum / self.window if len(self._values) == self.window else None
+
+
+class EMA:
+    """Recursive EMA matching ``ewm(span=span, adjust=False)``."""
+
+    def __init__(self, span: int) -> None:
+        self.alpha = 2.0 / (span + 1)
+        self.value: Optional[float] = None
+        # Value before the newest update, so that update can be revised
+        self._previous: Optional[float] = None
+
+    def update(self, value: float) -> float:
+        self._previous = self.value
+        self.value = value if self.value is None else self.alpha * value + (1 - self.alpha) * self.value
+        return self.value
+
+    def revise(self, value: float) -> float:
+        """Redo the newest update with ``value``."""
+        previous = self._previous
+        self.value = value if previous is None else self.alpha * value + (1 - self.alpha) * previous
+        return self.value
+
+
+class IncrementalIndicators:
+    """
+    Indicator state advanced one bar at a time.
+
+    Uses the same definitions as ``indicators.trend`` and
+    ``indicators.momentum.calculate_rsi`` (simple-average RSI), so values
+    agree with a full recomputation over the same bars.
+    """
+
+    def __init__(self, rsi_period: int = 14) -> None:
+        self.sma20 = RollingMean(20)
+        self.sma50 = RollingMean(50)
+        self.ema20 = EMA(20)
+        self.ema50 = EMA(50)
+        self._gain = RollingMean(rsi_period)
+        self._loss = RollingMean(rsi_period)
+        self.last_close: Optional[float] = None
+        self.last_time: Optional[str] = None
+        self._previous_close: Optional[float] = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "IncrementalIndicators":
+        state = cls()
+        for ts, close in df["Close"].dropna().items():
+            state.update(str(ts), float(close))
+        return state
+
+    def update(self, timestamp: str, close: float) -> Dict:
+        if self.last_close is not None:
+            delta = close - self.last_close
+            self._gain.update(max(delta, 0.0))
+            self._loss.update(max(-delta, 0.0))
+        self.sma20.update(close)
+        self.sma50.update(close)
+        self.ema20.update(close)
+        self.ema50.update(close)
+        self._previous_close = self.last_close
+        self.last_close = close
+        self.last_time = timestamp
+        return self.snapshot()
+
+    def revise(self, close: float) -> Dict:
+        """
+        Re-apply the newest bar with a revised ``close``, as if it had been
+        passed to ``update`` in the first place.
+        """
+        if self.last_close is None:
+            raise ValueError("No bar to revise")
+        if self._previous_close is not None:
+            delta = close - self._previous_close
+            self._gain.revise(max(delta, 0.0))
+            self._loss.revise(max(-delta, 0.0))
+        self.sma20.revise(close)
+        self.sma50.revise(close)
+        self.ema20.revise(close)
+        self.ema50.revise(close)
+        self.last_close = close
+        return self.snapshot()
+
+    @property
+    def rsi(self) -> Optional[float]:
+        gain, loss = self._gain.value, self._loss.value
+        if gain is None or loss is None or loss == 0:
+            return None
+        return 100 - (100 / (1 + gain / loss))
+
+    def snapshot(self) -> Dict:
+        return {
+            "time": self.last_time,
+            "close": self.last_close,
+            "sma20": self.sma20.value,
+            "sma50": self.sma50.value,
+            "ema20": self.ema20.value,
+            "ema50": self.ema50.value,
+            "rsi": self.rsi,
+        }
+
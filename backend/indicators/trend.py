@@ -1,8 +1,8 @@
 import pandas as pd
 
 
-def ema(series: pd.Series, span: int) -> pd.Series:
-    return series.ewm(span=span, adjust=False).mean()
+def ema(series: pd.Series, span: int, adjust: bool = False) -> pd.Series:
+    return series.ewm(span=span, adjust=adjust).mean()
 
 
 def sma(series: pd.Series, window: int) -> pd.Series:
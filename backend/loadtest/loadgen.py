@@ -0,0 +1,175 @@
+"""
+Closed-loop load generator for the backend API.
+
+Each of ``--concurrency`` workers issues requests back to back, picking
+tickers from a Zipf distribution (rank ``r`` has weight ``1 / r**s``) so a
+few names are hot, as in real traffic. The endpoint mix is configurable.
+Typical run against the mock provider::
+
+    python -m backend.loadtest.mock_provider --port 8099 &
+    TWELVE_DATA_BASE_URL=http://127.0.0.1:8099 TWELVE_DATA_CALLS_PER_MINUTE=100000 \\
+        RATE_LIMIT_PER_MINUTE=1000000 RATE_LIMIT_PER_DAY=100000000 uvicorn backend.main:app --port 8000 &
+    python -m backend.loadtest.loadgen --target http://127.0.0.1:8000 --mock http://127.0.0.1:8099 \\
+        --concurrency 32 --duration 60 --universe 200 --zipf 1.1
+
+The report gives throughput, status counts, latency percentiles overall and
+per endpoint, and (with ``--mock``) how many upstream calls the run caused.
+"""
+import argparse
+import bisect
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from ..benchmarks.fixtures import ticker_names
+
+
+ENDPOINTS = {
+    "stock": "/stock/{ticker}",
+    "predict": "/predict/{ticker}",
+    "indicators": "/indicators/{ticker}",
+}
+
+
+class ZipfSampler:
+    """Draws ``items`` with probability proportional to ``1 / rank**s``."""
+
+    def __init__(self, items: List[str], s: float, seed: int = 0) -> None:
+        self.items = items
+        self._cumulative = list(itertools.accumulate(1.0 / (rank ** s) for rank in range(1, len(items) + 1)))
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> str:
+        with self._lock:
+            x = self._rng.random() * self._cumulative[-1]
+        return self.items[bisect.bisect_left(self._cumulative, x)]
+
+
+def parse_mix(spec: str) -> List[Tuple[str, float]]:
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint in mix: {name}")
+        mix.append((name.strip(), float(weight or 1)))
+    return mix
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float]) -> Dict:
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1000, 2) if values else None,
+        **{f"p{q}_ms": round(percentile(values, q) * 1000, 2) if values else None for q in (50, 90, 95, 99)},
+        "max_ms": round(values[-1] * 1000, 2) if values else None,
+    }
+
+
+def _mock_stats(mock: Optional[str]) -> Optional[Dict]:
+    if not mock:
+        return None
+    try:
+        return requests.get(f"{mock.rstrip('/')}/_stats", timeout=5).json()
+    except requests.RequestException:
+        return None
+
+
+def run(target: str, concurrency: int, duration: float, max_requests: Optional[int], sampler: ZipfSampler,
+        mix: List[Tuple[str, float]], timeout: float = 30.0, seed: int = 0) -> Dict:
+    deadline = time.perf_counter() + duration
+    budget = itertools.count()
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Counter = Counter()
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    lock = threading.Lock()
+
+    def worker(index: int) -> None:
+        rng = random.Random(seed * 1000 + index)
+        session = requests.Session()
+        while time.perf_counter() < deadline:
+            if max_requests is not None and next(budget) >= max_requests:
+                return
+            name = rng.choices(names, weights)[0]
+            url = target.rstrip("/") + ENDPOINTS[name].format(ticker=sampler.sample())
+            started = time.perf_counter()
+            try:
+                status = str(session.get(url, timeout=timeout).status_code)
+            except requests.RequestException as e:
+                status = type(e).__name__
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies[name].append(elapsed)
+                statuses[status] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    wall = time.perf_counter() - started
+    total = sum(statuses.values())
+    return {
+        "requests": total,
+        "wall_seconds": round(wall, 2),
+        "throughput_rps": round(total / wall, 2) if wall else None,
+        "status": dict(statuses),
+        "latency": summarize([x for values in latencies.values() for x in values]),
+        "per_endpoint": {name: summarize(values) for name, values in latencies.items()},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Drive the API with skewed, concurrent traffic.")
+    parser.add_argument("--target", default="http://127.0.0.1:8000", help="backend base URL")
+    parser.add_argument("--mock", help="mock provider base URL, to count upstream calls")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--requests", type=int, help="stop after this many requests")
+    parser.add_argument("--universe", type=int, default=100, help="number of synthetic tickers")
+    parser.add_argument("--tickers", help="comma-separated tickers instead of a synthetic universe")
+    parser.add_argument("--zipf", type=float, default=1.1, help="popularity skew exponent; 0 is uniform")
+    parser.add_argument("--mix", default="stock=5,predict=3,indicators=2", help="endpoint weights")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    tickers = [t.strip().upper() for t in args.tickers.split(",")] if args.tickers else ticker_names(args.universe)
+    sampler = ZipfSampler(tickers, args.zipf, args.seed)
+    before = _mock_stats(args.mock)
+    report = run(args.target, args.concurrency, args.duration, args.requests, sampler,
+                 parse_mix(args.mix), seed=args.seed)
+    after = _mock_stats(args.mock)
+    if before is not None and after is not None:
+        calls = sum(after["calls"].values()) - sum(before["calls"].values())
+        report["upstream"] = {
+            "calls": calls,
+            "calls_per_request": round(calls / report["requests"], 4) if report["requests"] else None,
+            "throttled": after["throttled"] - before["throttled"],
+            "injected_errors": after["injected_errors"] - before["injected_errors"],
+        }
+    report["config"] = {k: v for k, v in vars(args).items() if k != "output"}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
@@ -0,0 +1,240 @@
+"""
+Local stand-in for the Twelve Data REST API.
+
+Serves ``time_series``, ``quote`` and ``fundamentals`` in the shapes
+``TwelveDataFetcher`` parses, with deterministic synthetic bars, simulated
+latency, injected errors and a per-key credit limit like the free plan's
+8 calls/minute. Point the backend at it with::
+
+    python -m backend.loadtest.mock_provider --port 8099 --latency-ms 150 --error-rate 0.01
+    TWELVE_DATA_BASE_URL=http://127.0.0.1:8099 uvicorn backend.main:app
+
+``GET /_stats`` reports calls, credits, throttled and failed requests;
+``POST /_reset`` clears them.
+"""
+import argparse
+import asyncio
+import random
+import threading
+import time
+from collections import Counter, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from ..benchmarks import fixtures
+
+
+# Provider interval name -> pandas frequency used for the synthetic index
+INTERVALS = {
+    "1min": "min", "5min": "5min", "15min": "15min", "30min": "30min", "45min": "45min",
+    "1h": "60min", "2h": "120min", "4h": "240min", "1day": "B", "1week": "W-FRI", "1month": "M",
+}
+# End of the synthetic history; fixed so runs are reproducible
+END = "2024-12-31 16:00"
+
+
+class ProviderSimulator:
+    """
+    Latency, error and credit-limit model shared by the mock endpoints.
+
+    Credits are charged per symbol, as the provider does for batch
+    requests, within a sliding 60-second window per API key.
+    """
+
+    def __init__(self, latency_ms: float = 150.0, jitter_ms: float = 50.0, error_rate: float = 0.0,
+                 calls_per_minute: int = 8, bars: int = 5000, seed: int = 0) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.calls_per_minute = calls_per_minute
+        self.bars = bars
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._credits: Dict[str, Deque[Tuple[float, int]]] = {}
+        self._series: Dict[Tuple[str, str], List[Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls: Counter = Counter()
+            self.symbols: Counter = Counter()
+            self.throttled = 0
+            self.errors = 0
+            self._credits.clear()
+
+    async def delay(self) -> None:
+        latency = max(0.0, self._rng.gauss(self.latency_ms, self.jitter_ms)) / 1000
+        await asyncio.sleep(latency)
+
+    def charge(self, apikey: str, credits: int) -> Optional[int]:
+        """Credits left after charging, or ``None`` when the minute's budget is spent."""
+        now = time.time()
+        with self._lock:
+            window = self._credits.setdefault(apikey, deque())
+            while window and now - window[0][0] >= 60:
+                window.popleft()
+            used = sum(c for _, c in window)
+            if used + credits > self.calls_per_minute:
+                self.throttled += 1
+                return None
+            window.append((now, credits))
+            return self.calls_per_minute - used - credits
+
+    def fail(self) -> bool:
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.errors += 1
+            return True
+        return False
+
+    def coin(self) -> bool:
+        return self._rng.random() < 0.5
+
+    def values(self, symbol: str, interval: str, outputsize: int) -> List[Dict[str, str]]:
+        key = (symbol, interval)
+        series = self._series.get(key)
+        if series is None:
+            df = fixtures.synthetic_ohlcv(symbol, self.bars, self.seed, end=END, freq=INTERVALS[interval])
+            series = self._series[key] = fixtures.to_provider_values(df)
+        return series[:outputsize]
+
+    def get_stats(self) -> Dict:
+        return {
+            "calls": dict(self.calls),
+            "symbols_requested": sum(self.symbols.values()),
+            "distinct_symbols": len(self.symbols),
+            "throttled": self.throttled,
+            "injected_errors": self.errors,
+        }
+
+
+def _error(code: int, message: str, headers: Optional[Dict] = None) -> JSONResponse:
+    # The provider reports most errors in the body with HTTP 200
+    return JSONResponse({"code": code, "message": message, "status": "error"}, headers=headers)
+
+
+def _meta(symbol: str, interval: str) -> Dict:
+    return {
+        "symbol": symbol, "interval": interval, "currency": "USD",
+        "exchange_timezone": "America/New_York", "exchange": "NASDAQ", "type": "Common Stock",
+    }
+
+
+def create_app(sim: ProviderSimulator) -> FastAPI:
+    app = FastAPI(title="Mock market data provider")
+
+    async def guard(request: Request, endpoint: str, symbols: List[str]) -> Tuple[Optional[JSONResponse], Dict]:
+        await sim.delay()
+        sim.calls[endpoint] += 1
+        sim.symbols.update(symbols)
+        apikey = request.query_params.get("apikey", "")
+        left = sim.charge(apikey, max(1, len(symbols)))
+        if left is None:
+            message = (f"You have run out of API credits for the current minute. "
+                       f"{sim.calls_per_minute} API credits are allowed per minute.")
+            return _error(429, message), {}
+        headers = {"api-credits-used": str(sim.calls_per_minute - left), "api-credits-left": str(left)}
+        if sim.fail():
+            if sim.coin():
+                return JSONResponse({"detail": "Internal error"}, status_code=500, headers=headers), headers
+            return _error(500, "Internal error, please try again later", headers), headers
+        return None, headers
+
+    @app.get("/time_series")
+    async def time_series(request: Request, symbol: str, interval: str = "1day", outputsize: int = 30) -> JSONResponse:
+        symbols = [s.strip().upper() for s in symbol.split(",") if s.strip()]
+        rejected, headers = await guard(request, "time_series", symbols)
+        if rejected is not None:
+            return rejected
+        if interval not in INTERVALS:
+            return _error(400, f"**interval** must be one of {', '.join(INTERVALS)}", headers)
+        outputsize = max(1, min(outputsize, 5000))
+        per_symbol = {}
+        for s in symbols:
+            if s.startswith("INVALID"):
+                per_symbol[s] = {"code": 404, "message": f"**symbol** {s} not found", "status": "error"}
+            else:
+                per_symbol[s] = {"meta": _meta(s, interval), "values": sim.values(s, interval, outputsize), "status": "ok"}
+        if len(symbols) == 1:
+            body = per_symbol[symbols[0]]
+            return JSONResponse(body, headers=headers)
+        return JSONResponse(per_symbol, headers=headers)
+
+    @app.get("/quote")
+    async def quote(request: Request, symbol: str) -> JSONResponse:
+        symbol = symbol.upper()
+        rejected, headers = await guard(request, "quote", [symbol])
+        if rejected is not None:
+            return rejected
+        last, prev = sim.values(symbol, "1day", 2)
+        close, prev_close = float(last["close"]), float(prev["close"])
+        closes = [float(v["close"]) for v in sim.values(symbol, "1day", 252)]
+        return JSONResponse({
+            "symbol": symbol, "name": f"{symbol} Inc", "exchange": "NASDAQ", "currency": "USD",
+            "datetime": last["datetime"], "timestamp": int(time.time()),
+            "open": last["open"], "high": last["high"], "low": last["low"], "close": last["close"],
+            "volume": last["volume"], "previous_close": prev["close"],
+            "change": f"{close - prev_close:.5f}", "percent_change": f"{(close / prev_close - 1) * 100:.5f}",
+            "is_market_open": False,
+            "fifty_two_week": {"low": f"{min(closes):.5f}", "high": f"{max(closes):.5f}"},
+        }, headers=headers)
+
+    @app.get("/fundamentals")
+    async def fundamentals(request: Request, symbol: str) -> JSONResponse:
+        symbol = symbol.upper()
+        rejected, headers = await guard(request, "fundamentals", [symbol])
+        if rejected is not None:
+            return rejected
+        rng = random.Random(fixtures.ticker_seed(symbol, sim.seed))
+        price = float(sim.values(symbol, "1day", 1)[0]["close"])
+        eps = round(price / rng.uniform(8, 45), 2)
+        shares = rng.randint(200_000_000, 15_000_000_000)
+        book_per_share = price / rng.uniform(1, 12)
+        return JSONResponse({
+            "meta": _meta(symbol, "1day"),
+            "statistics": {
+                "valuations_metrics": {
+                    "market_capitalization": round(price * shares),
+                    "trailing_pe": round(price / eps, 2),
+                    "price_to_book_mrq": round(price / book_per_share, 2),
+                },
+                "financials": {"diluted_eps_ttm": eps},
+                "stock_statistics": {"shares_outstanding": shares},
+                "dividends_and_splits": {"forward_annual_dividend_yield": round(rng.uniform(0, 0.04), 4)},
+            },
+        }, headers=headers)
+
+    @app.get("/_stats")
+    async def stats() -> Dict:
+        return sim.get_stats()
+
+    @app.post("/_reset")
+    async def reset() -> Dict:
+        sim.reset()
+        return sim.get_stats()
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a mock Twelve Data server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with an error")
+    parser.add_argument("--calls-per-minute", type=int, default=8, help="credits per API key per minute")
+    parser.add_argument("--bars", type=int, default=5000, help="history length per symbol")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sim = ProviderSimulator(args.latency_ms, args.jitter_ms, args.error_rate, args.calls_per_minute, args.bars, args.seed)
+    uvicorn.run(create_app(sim), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
+
@@ -1,26 +1,57 @@
 import os
+import sys
+import importlib
+import threading
 import pandas as pd
 import numpy as np
-import yfinance as yf
-import alpaca_trade_api as tradeapi
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Dict, Any
-import tensorflow as tf
-from sklearn.preprocessing import MinMaxScaler
 import warnings
 warnings.filterwarnings('ignore')
 
 app = FastAPI(title="TraderBlockAI API", version="1.0.0")
 
+
+def _backend_module(name: str):
+    """Import a backend module through its package, however this file was launched.
+
+    ``uvicorn main:app`` runs this file outside the package, where the
+    modular code's relative imports fail; importing via the parent directory
+    keeps a single copy of shared state (executor pools, caches).
+    """
+    package = __package__
+    if not package:
+        root = os.path.dirname(os.path.abspath(__file__))
+        if os.path.dirname(root) not in sys.path:
+            sys.path.append(os.path.dirname(root))
+        package = os.path.basename(root)
+    return importlib.import_module(f"{package}.{name}")
+
+
+# TensorFlow, scikit-learn and the Alpaca SDK are imported on first use (or by the
+# background warm-up) so a worker can start serving light traffic in well under a second
+executors = _backend_module("api.executors")
+warmup = _backend_module("utils.warmup").warmup
+bundle = _backend_module("indicators.bundle")
+
 # Include new modular API routes
 try:
-    from api.routes import router as api_router  # type: ignore
-    app.include_router(api_router)
+    routes = _backend_module("api.routes")
+    app.include_router(routes.router)
 except Exception:
     # Keep legacy-only if modular router not available
-    pass
+    routes = None
+
+# Bars and responses are shared with the modular routes when they are available
+if routes is not None:
+    bar_store, analysis_cache = routes._bar_store, routes._cache
+else:
+    bar_store = _backend_module("data.bar_store").BarStore()
+    analysis_cache = _backend_module("data.cache_manager").CacheManager()
+http_cache = _backend_module("api.http_cache")
 
 # Get the frontend URL from an environment variable for flexibility
 # Fallback to localhost for local development
@@ -31,7 +62,7 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=[frontend_url],  # This is the crucial security change
     allow_credentials=True,
-    allow_methods=["GET"], # Only allow GET requests for security
+    allow_methods=["GET", "POST"], # GET plus POST for the batch endpoints
     allow_headers=["*"],
 )
 
@@ -56,12 +87,30 @@ class AnalysisResponse(BaseModel):
 
 class StockAnalyzer:
     def __init__(self):
-        self.scaler = MinMaxScaler()
+        self._scaler = None
         self.model = None
-        self.load_or_create_model()
+        self._api = None
+        self._api_lock = threading.Lock()
+        self._model_lock = threading.Lock()
+    
+    @property
+    def scaler(self):
+        if self._scaler is None:
+            from sklearn.preprocessing import MinMaxScaler
+            self._scaler = MinMaxScaler()
+        return self._scaler
+    
+    def ensure_model(self):
+        """Load the Keras model once; run by the background warm-up, or on first use"""
+        if self.model is None:
+            with self._model_lock:
+                if self.model is None:
+                    self.load_or_create_model()
+        return self.model
     
     def load_or_create_model(self):
         """Load existing model or create a new one"""
+        import tensorflow as tf
         try:
             self.model = tf.keras.models.load_model('lstm_model.h5')
             print("Loaded existing LSTM model")
@@ -71,6 +120,7 @@ class StockAnalyzer:
     
     def create_model(self):
         """Create a simple LSTM model for demonstration"""
+        import tensorflow as tf
         model = tf.keras.Sequential([
             tf.keras.layers.LSTM(50, return_sequences=True, input_shape=(60, 1)),
             tf.keras.layers.Dropout(0.2),
@@ -83,12 +133,32 @@ class StockAnalyzer:
         model.compile(optimizer='adam', loss='mean_squared_error')
         self.model = model
     
+    def export_weights(self, path: str = 'lstm_weights.npz'):
+        """Export the LSTM weights for the TensorFlow-free NumPy runtime"""
+        return _backend_module("ml.models.lstm_model").export_keras_weights(self.ensure_model(), path)
+    
+    @property
+    def api(self):
+        """Long-lived Alpaca client; its HTTP session keeps connections pooled across requests"""
+        if self._api is None:
+            with self._api_lock:
+                if self._api is None:
+                    import alpaca_trade_api as tradeapi
+                    # The Alpaca library automatically reads the API keys (APCA_API_KEY_ID
+                    # and APCA_API_SECRET_KEY) from the environment variables we set on Render.
+                    self._api = tradeapi.REST(data_feed='iex')
+        return self._api
+    
     def get_stock_data(self, ticker: str, period: str = "1y") -> pd.DataFrame:
+        """Daily bars from the shared bar store, fetched from Alpaca on a miss"""
+        days = 365 if period == "1y" else 500
+        return bar_store.get_or_load(f"alpaca:1day:{ticker}", days, lambda _: self.fetch_stock_data(ticker, period))
+    
+    def fetch_stock_data(self, ticker: str, period: str = "1y") -> pd.DataFrame:
         """Fetch stock data using the Alpaca Market Data API"""
         try:
-            # The Alpaca library automatically reads the API keys (APCA_API_KEY_ID
-            # and APCA_API_SECRET_KEY) from the environment variables we set on Render.
-            api = tradeapi.REST(data_feed='iex')
+            api = self.api
+            from alpaca_trade_api import TimeFrame
             
             # Determine the correct date range for the data fetch
             end_date = pd.Timestamp.now(tz='America/New_York')
@@ -100,7 +170,7 @@ class StockAnalyzer:
             # Fetch the historical data (called "bars") from Alpaca's API
             data = api.get_bars(
                 ticker,
-                tradeapi.TimeFrame.Day,
+                TimeFrame.Day,
                 start=start_date.isoformat(),
                 end=end_date.isoformat()
             ).df
@@ -117,29 +187,8 @@ class StockAnalyzer:
             raise ValueError(f"Error fetching data for {ticker} from Alpaca: {str(e)}")
     
     def calculate_technical_indicators(self, data: pd.DataFrame) -> Dict[str, float]:
-        """Calculate technical indicators"""
-        # Simple Moving Averages
-        sma_20 = data['Close'].rolling(window=20).mean().iloc[-1]
-        sma_50 = data['Close'].rolling(window=50).mean().iloc[-1]
-        
-        # RSI calculation
-        delta = data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs)).iloc[-1]
-        
-        # MACD calculation
-        ema_12 = data['Close'].ewm(span=12).mean()
-        ema_26 = data['Close'].ewm(span=26).mean()
-        macd = (ema_12 - ema_26).iloc[-1]
-        
-        return {
-            'sma_20': float(sma_20),
-            'sma_50': float(sma_50),
-            'rsi': float(rsi),
-            'macd': float(macd)
-        }
+        """Calculate technical indicators (shared engine; returns and volatility are computed once)"""
+        return bundle.analysis_snapshot(data)
     
     def generate_forecast(self, data: pd.DataFrame) -> Dict[str, float]:
         """Generate 3-day price forecast using LSTM"""
@@ -214,10 +263,9 @@ class StockAnalyzer:
         else:
             return "Negative"
     
-    def analyze_volatility(self, data: pd.DataFrame) -> str:
+    def analyze_volatility(self, indicators: Dict[str, float]) -> str:
         """Analyze volatility"""
-        returns = data['Close'].pct_change().dropna()
-        volatility = returns.std() * np.sqrt(252)  # Annualized volatility
+        volatility = indicators['annual_volatility']
         
         if volatility > 0.3:
             return "High"
@@ -226,16 +274,15 @@ class StockAnalyzer:
         else:
             return "Low"
     
-    def calculate_extreme_risk(self, data: pd.DataFrame) -> dict:
+    def calculate_extreme_risk(self, data: pd.DataFrame, indicators: Dict[str, float]) -> dict:
         """
         Calculates the 1-day 99% Value at Risk (VaR) using historical simulation.
         This estimates the plausible worst-case single-day loss.
         """
-        returns = data['Close'].pct_change().dropna()
-        if returns.empty:
+        var_99 = indicators['var_99']
+        if var_99 is None:
             return {"var_99_percent": 0.0, "max_expected_loss_usd": 0.0}
         
-        var_99 = returns.quantile(0.01)
         current_price = data['Close'].iloc[-1]
         max_expected_loss_dollar = current_price * var_99
         
@@ -244,20 +291,14 @@ class StockAnalyzer:
             "max_expected_loss_usd": round(max_expected_loss_dollar, 2)
         }
 
-    def calculate_sharpe_ratio(self, data: pd.DataFrame) -> dict:
+    def calculate_sharpe_ratio(self, indicators: Dict[str, float]) -> dict:
         """
         Calculates the annualized Sharpe Ratio.
         This measures the return of an investment compared to its risk.
         """
-        returns = data['Close'].pct_change().dropna()
-        if returns.empty or returns.std() == 0:
-            return {"sharpe_ratio": 0.0}
-            
         # Assuming a risk-free rate of 0 for simplicity in this context
-        sharpe_ratio = (returns.mean() / returns.std()) * np.sqrt(252)
-        
         return {
-            "sharpe_ratio": round(sharpe_ratio, 2)
+            "sharpe_ratio": round(indicators['sharpe_ratio'], 2)
         }
 
     def calculate_beta(self, data: pd.DataFrame) -> dict:
@@ -266,7 +307,9 @@ class StockAnalyzer:
         This measures the stock's volatility in relation to the overall market.
         """
         try:
-            market_data = yf.download('SPY', start=data.index.min(), end=data.index.max(), progress=False)
+            # SPY comes from the same pooled client and bar store, so it is fetched once per
+            # refresh window and its timestamps align with the stock's bars
+            market_data = self.get_stock_data('SPY')
             if market_data.empty:
                 return {"beta": 1.0} # Default to market beta if no data
                 
@@ -328,61 +371,92 @@ class StockAnalyzer:
         return f"{trend_explanation} {momentum_explanation} {volatility_explanation}{professional_metrics} Remember, this analysis is for educational purposes only and should not be considered as financial advice."
 
 analyzer = StockAnalyzer()
+warmup.register("alpaca_client", lambda: analyzer.api)
+# Predictions run on the NumPy LSTM runtime; warming it never imports TensorFlow
+if routes is not None:
+    lstm_runtime = routes._predictor.lstm
+else:
+    lstm_runtime = _backend_module("ml.models.lstm_model").LSTMModel.load_if_exists(
+        _backend_module("config").settings.lstm_weights_path
+    )
+warmup.register("lstm_model", lambda: lstm_runtime.forecast(np.linspace(1.0, 2.0, 60)[None, :]))
+warmup.register("sklearn", lambda: analyzer.scaler)
 
-@app.get("/api/v1/analyze/{ticker}")
-async def analyze_stock(ticker: str) -> AnalysisResponse:
+def run_analysis(ticker: str) -> AnalysisResponse:
+    """Blocking analysis pipeline: shared bar store (Alpaca on a miss) plus the indicator engine"""
+    # Fetch stock data
+    data = analyzer.get_stock_data(ticker.upper())
+    
+    # Calculate technical indicators (once; the metrics below reuse them)
+    indicators = analyzer.calculate_technical_indicators(data)
+    
+    # Generate forecast
+    forecast = analyzer.generate_forecast(data)
+    
+    # Analyze components
+    trend = analyzer.analyze_trend(data, indicators)
+    momentum = analyzer.analyze_momentum(indicators)
+    volatility = analyzer.analyze_volatility(indicators)
+    
+    # Calculate professional-grade metrics
+    extreme_risk = analyzer.calculate_extreme_risk(data, indicators)
+    sharpe_ratio = analyzer.calculate_sharpe_ratio(indicators)
+    beta = analyzer.calculate_beta(data)
+    
+    # Generate educational explanation
+    educational_explanation = analyzer.generate_educational_explanation(
+        ticker.upper(), trend, momentum, volatility, indicators
+    )
+    
+    # Calculate confidence (simplified)
+    confidence = 0.75  # Placeholder confidence score
+    
+    return AnalysisResponse(
+        ticker=ticker.upper(),
+        current_price=float(data['Close'].iloc[-1]),
+        trend=trend,
+        momentum=momentum,
+        volatility=volatility,
+        confidence=confidence,
+        forecast=forecast,
+        sma_20=indicators['sma_20'],
+        sma_50=indicators['sma_50'],
+        rsi=indicators['rsi'],
+        macd=indicators['macd'],
+        # --- NEW PROFESSIONAL-GRADE METRICS ---
+        extreme_risk=extreme_risk,
+        risk_adjusted_return=sharpe_ratio,
+        market_correlation=beta,
+        # -------------------------------------
+        educational_explanation=educational_explanation
+    )
+
+def cached_analysis(ticker: str):
+    """Encoded analysis from the shared response cache, computed and stored on a miss"""
+    key = f"analyze:{ticker.upper()}"
+    entry = analysis_cache.get_encoded(key)
+    if entry is None:
+        entry = analysis_cache.set(key, run_analysis(ticker).model_dump())
+    return entry
+
+@app.get("/api/v1/analyze/{ticker}", response_model=AnalysisResponse)
+async def analyze_stock(ticker: str, request: Request) -> Response:
     """Analyze a stock and return comprehensive analysis"""
     try:
-        # Fetch stock data
-        data = analyzer.get_stock_data(ticker.upper())
-        
-        # Calculate technical indicators
-        indicators = analyzer.calculate_technical_indicators(data)
-        
-        # Generate forecast
-        forecast = analyzer.generate_forecast(data)
-        
-        # Analyze components
-        trend = analyzer.analyze_trend(data, indicators)
-        momentum = analyzer.analyze_momentum(indicators)
-        volatility = analyzer.analyze_volatility(data)
-        
-        # Calculate professional-grade metrics
-        extreme_risk = analyzer.calculate_extreme_risk(data)
-        sharpe_ratio = analyzer.calculate_sharpe_ratio(data)
-        beta = analyzer.calculate_beta(data)
-        
-        # Generate educational explanation
-        educational_explanation = analyzer.generate_educational_explanation(
-            ticker.upper(), trend, momentum, volatility, indicators
-        )
-        
-        # Calculate confidence (simplified)
-        confidence = 0.75  # Placeholder confidence score
-        
-        return AnalysisResponse(
-            ticker=ticker.upper(),
-            current_price=float(data['Close'].iloc[-1]),
-            trend=trend,
-            momentum=momentum,
-            volatility=volatility,
-            confidence=confidence,
-            forecast=forecast,
-            sma_20=indicators['sma_20'],
-            sma_50=indicators['sma_50'],
-            rsi=indicators['rsi'],
-            macd=indicators['macd'],
-            # --- NEW PROFESSIONAL-GRADE METRICS ---
-            extreme_risk=extreme_risk,
-            risk_adjusted_return=sharpe_ratio,
-            market_correlation=beta,
-            # -------------------------------------
-            educational_explanation=educational_explanation
-        )
-    
+        entry = analysis_cache.get_encoded(f"analyze:{ticker.upper()}")
+        if entry is None:
+            entry = await executors.io_pool.run(cached_analysis, ticker)
+        return http_cache.cached_json_response(request, entry)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.on_event("startup")
+async def start_warmup():
+    # Also started by the modular router; only the first call runs the tasks
+    warmup.start()
+
 @app.get("/")
 async def root():
     return {"message": "TraderBlockAI API is running"}
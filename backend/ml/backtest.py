@@ -0,0 +1,194 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .predictor import ThreeDayPredictor
+from .models.lstm_model import LSTMModel
+
+
+CONFIDENCE_LEVELS = ["Low", "Medium", "High"]
+
+
+def trend_forecast(close: np.ndarray, horizon: int = 3, min_history: int = 61) -> np.ndarray:
+    """
+    Vectorized replay of ``StockAnalyzer.generate_forecast`` for every date.
+
+    Row ``t`` holds the day_1..day_N forecast made with bars ``0..t``: the last
+    close plus the mean of the last four daily differences per day, or a flat
+    forecast while fewer than ``min_history`` bars are available.
+    """
+    n = len(close)
+    trend = np.zeros(n)
+    if n > 4:
+        trend[4:] = (close[4:] - close[:-4]) / 4.0
+    trend[: min(min_history - 1, n)] = 0.0
+    steps = np.arange(1, horizon + 1)
+    return close[:, None] + trend[:, None] * steps[None, :]
+
+
+def _replay_predictor(ticker: str, df: pd.DataFrame, start: int, stop: int, horizon: int,
+                      lstm_weights_path: Optional[str]) -> Dict[str, np.ndarray]:
+    predictor = ThreeDayPredictor(lstm=LSTMModel.load_if_exists(lstm_weights_path))
+
+    async def run() -> List[Dict]:
+        return [await predictor.predict(ticker, df.iloc[: t + 1]) for t in range(start, stop)]
+
+    results = asyncio.run(run())
+    count = len(results)
+    forecast = np.full((count, horizon), np.nan)
+    confidence = np.full(count, np.nan)
+    levels = np.empty(count, dtype=object)
+    for i, res in enumerate(results):
+        for d in range(horizon):
+            price = res["predictions"].get(f"day_{d + 1}", {}).get("price")
+            if price is not None:
+                forecast[i, d] = price
+        confidence[i] = res.get("confidence_score", np.nan)
+        levels[i] = res.get("confidence_level")
+    return {"forecast": forecast, "confidence": confidence, "level": levels}
+
+
+def backtest_ticker(ticker: str, df: pd.DataFrame, min_history: int = 60, horizon: int = 3,
+                    lstm_weights_path: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Replay one ticker's bars and return per-date forecasts aligned with outcomes.
+
+    Module-level so it can be shipped to a worker process.
+    """
+    close = df["Close"].to_numpy(dtype=float)
+    start, stop = min_history - 1, len(close) - horizon
+    if stop <= start:
+        empty = np.empty((0, horizon))
+        return {"base": np.empty(0), "actual": empty, "model": empty, "trend": empty,
+                "confidence": np.empty(0), "level": np.empty(0, dtype=object)}
+    idx = np.arange(start, stop)
+    actual = np.stack([close[idx + d] for d in range(1, horizon + 1)], axis=1)
+    replay = _replay_predictor(ticker, df, start, stop, horizon, lstm_weights_path)
+    return {
+        "base": close[idx],
+        "actual": actual,
+        "model": replay["forecast"],
+        "trend": trend_forecast(close, horizon)[idx],
+        "confidence": replay["confidence"],
+        "level": replay["level"],
+    }
+
+
+def score_forecasts(base: np.ndarray, forecast: np.ndarray, actual: np.ndarray) -> Dict:
+    """
+    Directional accuracy and MAE at the final horizon, computed over all dates at once.
+
+    A flat forecast calls no direction, so it counts as an abstention rather
+    than a miss; accuracy is None when the model never calls one.
+    """
+    valid = ~np.isnan(forecast[:, -1])
+    if not valid.any():
+        return {"directional_accuracy": None, "mae": None, "mae_pct": None, "samples": 0, "abstentions": 0}
+    b, f, a = base[valid], forecast[valid, -1], actual[valid, -1]
+    called = np.sign(f - b) != 0
+    hits = np.sign(f - b)[called] == np.sign(a - b)[called]
+    err = np.abs(f - a)
+    return {
+        "directional_accuracy": round(float(hits.mean()), 4) if called.any() else None,
+        "mae": round(float(err.mean()), 4),
+        "mae_pct": round(float((err / b).mean() * 100), 4),
+        "samples": int(valid.sum()),
+        "abstentions": int((~called).sum()),
+    }
+
+
+def score_calibration(base: np.ndarray, forecast: np.ndarray, actual: np.ndarray,
+                      confidence: np.ndarray, levels: np.ndarray) -> Dict:
+    """Compare stated confidence with the realised hit rate per confidence level."""
+    # Flat forecasts abstain from a direction and are left out, as in score_forecasts
+    valid = ~np.isnan(forecast[:, -1]) & ~np.isnan(confidence) & (np.sign(forecast[:, -1] - base) != 0)
+    hits = np.sign(forecast[:, -1] - base) == np.sign(actual[:, -1] - base)
+    buckets = {}
+    ece = 0.0
+    total = int(valid.sum())
+    for level in CONFIDENCE_LEVELS:
+        mask = valid & (levels == level)
+        count = int(mask.sum())
+        if not count:
+            continue
+        mean_conf = float(confidence[mask].mean())
+        hit_rate = float(hits[mask].mean())
+        buckets[level] = {"count": count, "avg_confidence": round(mean_conf, 4), "hit_rate": round(hit_rate, 4)}
+        ece += count / total * abs(mean_conf - hit_rate)
+    return {"levels": buckets, "expected_calibration_error": round(ece, 4) if total else None}
+
+
+class WalkForwardBacktester:
+    """
+    Walk-forward backtest of the 3-day forecasts.
+
+    Every historical date is replayed through ``ThreeDayPredictor`` and the
+    legacy trend forecast using only the bars available at that date; scoring
+    runs vectorized over all dates. Tickers are replayed in parallel processes.
+    """
+
+    def __init__(self, min_history: int = 60, horizon: int = 3, max_workers: Optional[int] = None,
+                 lstm_weights_path: Optional[str] = None) -> None:
+        self.min_history = min_history
+        self.horizon = horizon
+        self.max_workers = max_workers
+        self.lstm_weights_path = lstm_weights_path
+
+    def _replay_all(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, Dict[str, np.ndarray]]:
+        tickers = [t for t, df in frames.items() if not df.empty and "Close" in df]
+        if not tickers:
+            return {}
+        if self.max_workers == 1 or len(tickers) == 1:
+            return {
+                t: backtest_ticker(t, frames[t], self.min_history, self.horizon, self.lstm_weights_path)
+                for t in tickers
+            }
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                t: pool.submit(backtest_ticker, t, frames[t], self.min_history, self.horizon, self.lstm_weights_path)
+                for t in tickers
+            }
+            return {t: f.result() for t, f in futures.items()}
+
+    def run(self, frames: Dict[str, pd.DataFrame]) -> Dict:
+        started = time.time()
+        replays = self._replay_all(frames)
+        per_ticker = {}
+        for t, r in replays.items():
+            per_ticker[t] = {
+                "model": score_forecasts(r["base"], r["model"], r["actual"]),
+                "trend": score_forecasts(r["base"], r["trend"], r["actual"]),
+            }
+        if replays:
+            merged = {k: np.concatenate([r[k] for r in replays.values()]) for k in next(iter(replays.values()))}
+        else:
+            merged = {"base": np.empty(0), "actual": np.empty((0, self.horizon)),
+                      "model": np.empty((0, self.horizon)), "trend": np.empty((0, self.horizon)),
+                      "confidence": np.empty(0), "level": np.empty(0, dtype=object)}
+        model = score_forecasts(merged["base"], merged["model"], merged["actual"])
+        trend = score_forecasts(merged["base"], merged["trend"], merged["actual"])
+        moved = merged["actual"][:, -1] != merged["base"]
+        up = merged["actual"][:, -1] > merged["base"]
+        conf = merged["confidence"][~np.isnan(merged["confidence"])]
+        return {
+            "strategy_accuracy_3d": model["directional_accuracy"],
+            "trend_accuracy_3d": trend["directional_accuracy"],
+            # Always-up baseline over the same dates
+            "baseline_accuracy": round(float(up[moved].mean()), 4) if moved.any() else None,
+            "avg_confidence": round(float(conf.mean()), 4) if len(conf) else None,
+            "model": model,
+            "trend": trend,
+            "calibration": score_calibration(
+                merged["base"], merged["model"], merged["actual"], merged["confidence"], merged["level"]
+            ),
+            "per_ticker": per_ticker,
+            "tickers": len(replays),
+            "horizon_days": self.horizon,
+            "generated_at": int(time.time()),
+            "duration_seconds": round(time.time() - started, 2),
+        }
+
@@ -1,6 +1,159 @@
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)
+
+
 class LSTMModel:
-    # Placeholder class for future implementation
+    """
+    NumPy inference runtime for the stacked LSTM built by ``StockAnalyzer.create_model``.
+
+    Weights come from ``export_keras_weights`` as a flat ``.npz`` file, so
+    serving predictions never imports TensorFlow. Dropout layers are identity
+    at inference and are not exported.
+    """
+
+    def __init__(self, layers: Optional[List[Dict]] = None) -> None:
+        self.layers = layers or []
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self.layers)
+
+    @classmethod
+    def from_keras(cls, model) -> "LSTMModel":
+        layers = []
+        for layer in model.layers:
+            kind = type(layer).__name__
+            if kind == "Dropout":
+                continue
+            weights = [w.astype(np.float32) for w in layer.get_weights()]
+            if kind == "LSTM":
+                cfg = layer.get_config()
+                if cfg.get("activation") != "tanh" or cfg.get("recurrent_activation") != "sigmoid":
+                    raise ValueError(f"Unsupported LSTM activations in layer {layer.name}")
+                layers.append({
+                    "kind": "lstm",
+                    "kernel": weights[0],
+                    "recurrent": weights[1],
+                    "bias": weights[2] if len(weights) > 2 else np.zeros(weights[0].shape[1], np.float32),
+                    "return_sequences": bool(cfg.get("return_sequences")),
+                })
+            elif kind == "Dense":
+                if layer.get_config().get("activation") != "linear":
+                    raise ValueError(f"Unsupported Dense activation in layer {layer.name}")
+                layers.append({
+                    "kind": "dense",
+                    "kernel": weights[0],
+                    "bias": weights[1] if len(weights) > 1 else np.zeros(weights[0].shape[1], np.float32),
+                })
+            else:
+                raise ValueError(f"Unsupported layer type: {kind}")
+        return cls(layers)
+
+    def save(self, path: str) -> None:
+        arrays = {"kinds": np.array([layer["kind"] for layer in self.layers])}
+        for i, layer in enumerate(self.layers):
+            for key, value in layer.items():
+                if key != "kind":
+                    arrays[f"{i}_{key}"] = np.asarray(value)
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "LSTMModel":
+        with np.load(path, allow_pickle=False) as data:
+            layers = []
+            for i, kind in enumerate(data["kinds"]):
+                layer = {"kind": str(kind)}
+                prefix = f"{i}_"
+                for key in data.files:
+                    if key.startswith(prefix):
+                        value = data[key]
+                        layer[key[len(prefix):]] = bool(value) if value.dtype == bool else value
+                layers.append(layer)
+        return cls(layers)
+
+    @classmethod
+    def load_if_exists(cls, path: Optional[str]) -> "LSTMModel":
+        return cls.load(path) if path and os.path.exists(path) else cls()
+
+    @staticmethod
+    def _lstm(x: np.ndarray, layer: Dict) -> np.ndarray:
+        kernel, recurrent, bias = layer["kernel"], layer["recurrent"], layer["bias"]
+        batch, steps, _ = x.shape
+        units = recurrent.shape[0]
+        # Input projection for every timestep in one matmul; only h @ U stays in the loop
+        projected = x @ kernel + bias
+        h = np.zeros((batch, units), dtype=np.float32)
+        c = np.zeros((batch, units), dtype=np.float32)
+        outputs = np.empty((batch, steps, units), dtype=np.float32) if layer["return_sequences"] else None
+        for t in range(steps):
+            z = projected[:, t] + h @ recurrent
+            # Keras gate order: input, forget, cell, output
+            i = _sigmoid(z[:, :units])
+            f = _sigmoid(z[:, units : 2 * units])
+            g = np.tanh(z[:, 2 * units : 3 * units])
+            o = _sigmoid(z[:, 3 * units :])
+            c = f * c + i * g
+            h = o * np.tanh(c)
+            if outputs is not None:
+                outputs[:, t] = h
+        return outputs if outputs is not None else h
+
     def predict(self, X):
-        return None
+        """Forward pass for a batch shaped ``(batch, timesteps, features)``."""
+        if not self.layers:
+            return None
+        out = np.asarray(X, dtype=np.float32)
+        for layer in self.layers:
+            if layer["kind"] == "lstm":
+                out = self._lstm(out, layer)
+            else:
+                out = out @ layer["kernel"] + layer["bias"]
+        return out
+
+    def forecast(self, closes: np.ndarray, steps: int = 3, lookback: int = 60) -> Optional[np.ndarray]:
+        """
+        Roll the model forward ``steps`` days for a batch of close histories.
+
+        Each row of ``closes`` is min-max scaled over its own window, matching
+        the scaler fit in ``StockAnalyzer.generate_forecast``.
+        """
+        if not self.layers:
+            return None
+        closes = np.asarray(closes, dtype=np.float32)
+        lo = closes.min(axis=1, keepdims=True)
+        span = closes.max(axis=1, keepdims=True) - lo
+        span[span == 0] = 1.0
+        window = ((closes[:, -lookback:] - lo) / span)[:, :, None]
+        preds = np.empty((closes.shape[0], steps), dtype=np.float32)
+        for d in range(steps):
+            nxt = self.predict(window)[:, 0]
+            preds[:, d] = nxt
+            window = np.concatenate([window[:, 1:], nxt[:, None, None]], axis=1)
+        return preds * span + lo
+
+
+def export_keras_weights(model, path: str, check: bool = True, atol: float = 1e-4) -> LSTMModel:
+    """
+    Save a trained Keras model for the NumPy runtime.
 
+    With ``check`` the exported runtime is compared against ``model.predict`` on
+    a random batch and a ``ValueError`` is raised if the outputs diverge.
+    """
+    runtime = LSTMModel.from_keras(model)
+    runtime.save(path)
+    if check:
+        runtime = LSTMModel.load(path)
+        _, steps, features = model.input_shape
+        X = np.random.default_rng(0).random((8, steps, features), dtype=np.float32)
+        expected = np.asarray(model.predict(X, verbose=0))
+        diff = float(np.max(np.abs(runtime.predict(X) - expected)))
+        if diff > atol:
+            raise ValueError(f"NumPy runtime differs from Keras output by {diff:.2e}")
+    return runtime
 
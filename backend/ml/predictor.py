@@ -1,26 +1,61 @@
+import numpy as np
 import pandas as pd
-from typing import Dict
+from typing import Dict, List, Optional
 
 from .confidence import calculate_confidence_score
+from .models.lstm_model import LSTMModel
+
+
+LOOKBACK = 60
 
 
 class ThreeDayPredictor:
-    def __init__(self) -> None:
-        # Placeholder; models will be wired in later
-        pass
+    def __init__(self, lstm: LSTMModel | None = None) -> None:
+        # Without exported LSTM weights the forecast stays flat
+        self.lstm = lstm or LSTMModel()
+
+    def _forecast(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, np.ndarray]:
+        """Run the NumPy LSTM once for every ticker with enough history, grouped by length."""
+        if not self.lstm.loaded:
+            return {}
+        by_length: Dict[int, List[str]] = {}
+        for ticker, df in frames.items():
+            if "Close" in df and df["Close"].notna().sum() > LOOKBACK:
+                by_length.setdefault(int(df["Close"].notna().sum()), []).append(ticker)
+        out = {}
+        for tickers in by_length.values():
+            closes = np.stack([frames[t]["Close"].dropna().to_numpy(dtype=float) for t in tickers])
+            preds = self.lstm.forecast(closes, steps=3, lookback=LOOKBACK)
+            out.update(zip(tickers, preds))
+        return out
+
+    # ``sentiment`` arguments are ``SentimentStore.features`` dicts, read by the
+    # caller so the predictor stays picklable for process pools
+
+    async def predict(self, ticker: str, historical_data: pd.DataFrame, sentiment: Optional[Dict] = None) -> Dict:
+        return self.predict_sync(ticker, historical_data, sentiment)
 
-    async def predict(self, ticker: str, historical_data: pd.DataFrame) -> Dict:
-        # Minimal stub to keep API functional until models are implemented
+    def predict_sync(self, ticker: str, historical_data: pd.DataFrame, sentiment: Optional[Dict] = None) -> Dict:
+        # Synchronous entry point for executor pools
+        forecast = self._forecast({ticker: historical_data}).get(ticker)
+        return self._build(ticker, historical_data, forecast, sentiment)
+
+    def _build(
+        self, ticker: str, historical_data: pd.DataFrame, forecast: np.ndarray | None, sentiment: Optional[Dict] = None
+    ) -> Dict:
         current_price = float(historical_data["Close"].iloc[-1]) if not historical_data.empty else None
-        score = calculate_confidence_score(0.5, 0.8, 0.5, 0.5, 0.5)
+        # Without recent mentions sentiment stays neutral
+        consistency = sentiment["consistency"] if sentiment else 0.5
+        score = calculate_confidence_score(0.5, 0.8, 0.5, consistency, 0.5)
+        predictions = {}
+        for d in range(3):
+            price = float(forecast[d]) if forecast is not None else current_price
+            change = ((price - current_price) / current_price) * 100 if current_price else 0.0
+            predictions[f"day_{d + 1}"] = {"price": price, "change_pct": round(change, 2)}
         return {
             "ticker": ticker.upper(),
             "current_price": current_price,
-            "predictions": {
-                "day_1": {"price": current_price, "change_pct": 0.0},
-                "day_2": {"price": current_price, "change_pct": 0.0},
-                "day_3": {"price": current_price, "change_pct": 0.0},
-            },
+            "predictions": predictions,
             "confidence_score": score["confidence_score"],
             "confidence_level": score["confidence_level"],
             "recommendation": "HOLD",
@@ -31,7 +66,7 @@ class ThreeDayPredictor:
                     "momentum": "Neutral",
                     "volatility": "Unknown",
                     "risk": "Unknown",
-                    "sentiment": "Neutral",
+                    "sentiment": sentiment["label"] if sentiment else "Neutral",
                 },
             },
             "risk_metrics": {
@@ -42,4 +77,20 @@ class ThreeDayPredictor:
             },
         }
 
+    async def predict_batch(
+        self, frames: Dict[str, pd.DataFrame], sentiment: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, Dict]:
+        return self.predict_frames(frames, sentiment)
+
+    def predict_frames(
+        self, frames: Dict[str, pd.DataFrame], sentiment: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, Dict]:
+        """Predict every ticker in ``frames`` in one pass, skipping empty frames."""
+        frames = {t: df for t, df in frames.items() if not df.empty}
+        forecasts = self._forecast(frames)
+        sentiment = sentiment or {}
+        return {
+            t.upper(): self._build(t, df, forecasts.get(t), sentiment.get(t.upper()))
+            for t, df in frames.items()
+        }
 
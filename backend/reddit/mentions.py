@@ -0,0 +1,149 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Symbols that are also everyday words or slang; counted only as cashtags ("$IT")
+AMBIGUOUS_WORDS = frozenset({
+    "A", "I", "AM", "AN", "ANY", "ARE", "AS", "AT", "BE", "BIG", "BY", "CAN", "CEO", "CFO", "DD", "DO", "EOD",
+    "EPS", "FOR", "FREE", "GO", "GOOD", "HAS", "HE", "IF", "IN", "IPO", "IS", "IT", "ALL", "LOVE", "ME", "MY",
+    "NEW", "NOW", "OF", "ON", "ONE", "OR", "OUT", "PM", "REAL", "SO", "TV", "TO", "UK", "UP", "US", "USA",
+    "WE", "YOLO", "ATH", "IMO", "OP", "EV", "AI", "PE", "FUD", "HODL", "GDP", "SEC", "FED", "CPI", "ETF",
+})
+
+# Company names for the default universe; matched case-insensitively
+COMPANY_NAMES: Dict[str, Tuple[str, ...]] = {
+    "AAPL": ("Apple",), "MSFT": ("Microsoft",), "AMZN": ("Amazon",), "GOOGL": ("Alphabet", "Google"),
+    "META": ("Meta Platforms", "Facebook"), "NVDA": ("Nvidia",), "TSLA": ("Tesla",),
+    "BRK.B": ("Berkshire Hathaway",), "JPM": ("JPMorgan", "JP Morgan"), "V": ("Visa",),
+    "UNH": ("UnitedHealth",), "HD": ("Home Depot",), "MA": ("Mastercard",), "PG": ("Procter & Gamble",),
+    "XOM": ("ExxonMobil", "Exxon"), "AVGO": ("Broadcom",), "LLY": ("Eli Lilly",),
+    "JNJ": ("Johnson & Johnson",), "WMT": ("Walmart",), "CVX": ("Chevron",), "KO": ("Coca-Cola",),
+    "PFE": ("Pfizer",), "BAC": ("Bank of America",), "DIS": ("Disney",), "PEP": ("PepsiCo",),
+    "ABBV": ("AbbVie",), "COST": ("Costco",), "CSCO": ("Cisco",), "ADBE": ("Adobe",), "NFLX": ("Netflix",),
+}
+
+_CASHTAG, _BARE, _NAME = 0, 1, 2
+
+# ASCII-only lower-casing keeps offsets aligned with the original text
+_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class MentionIndex:
+    """
+    Ticker mentions in free text, found in one pass over the text.
+
+    Built once from the symbol universe as an Aho-Corasick automaton over
+    three pattern kinds, all lower-cased:
+
+    - cashtags (``$aapl``), any case in the text
+    - bare symbols (``AAPL``), only when upper-case in the text and not in
+      ``ambiguous`` or shorter than ``min_bare_length``
+    - company names (``apple``), any case
+
+    A match counts only at word boundaries, so ``MAX`` does not match inside
+    ``MAXIMUM``. Extraction is linear in the text length plus the number of
+    raw matches, independent of the universe size.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        names: Optional[Dict[str, Iterable[str]]] = None,
+        ambiguous: Iterable[str] = AMBIGUOUS_WORDS,
+        min_bare_length: int = 2,
+    ) -> None:
+        self.symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+        ambiguous = {w.upper() for w in ambiguous}
+        # Trie as parallel lists: goto[state] maps a character to the next state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # state -> ((symbol, kind, length), ...) for every pattern ending there
+        self._out: List[Tuple[Tuple[str, int, int], ...]] = [()]
+        patterns: List[Tuple[str, str, int]] = []
+        for symbol in self.symbols:
+            patterns.append(("$" + symbol.lower(), symbol, _CASHTAG))
+            if len(symbol) >= min_bare_length and symbol not in ambiguous:
+                patterns.append((symbol.lower(), symbol, _BARE))
+        for symbol, aliases in (names or {}).items():
+            if symbol.upper() in self.symbols:
+                patterns.extend((alias.translate(_LOWER), symbol.upper(), _NAME) for alias in aliases if alias)
+        for text, symbol, kind in patterns:
+            self._insert(text, (symbol, kind, len(text)))
+        self._link()
+        self.patterns = len(patterns)
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "MentionIndex":
+        """Universe from a file of ``SYMBOL`` or ``SYMBOL,Company name[,alias...]`` lines."""
+        symbols: List[str] = []
+        names: Dict[str, List[str]] = {}
+        with open(path, "r") as f:
+            for line in f:
+                parts = [p.strip() for p in line.split(",")]
+                if not parts[0] or parts[0].startswith("#"):
+                    continue
+                symbols.append(parts[0].upper())
+                if len(parts) > 1:
+                    names[parts[0].upper()] = [p for p in parts[1:] if p]
+        return cls(symbols, names, **kwargs)
+
+    def _insert(self, text: str, output: Tuple[str, int, int]) -> None:
+        state = 0
+        for ch in text:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] += (output,)
+
+    def _link(self) -> None:
+        # Breadth-first so each fail target is final before its children use it
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def extract(self, text: str) -> List[str]:
+        """Distinct symbols mentioned in ``text``, in order of first mention."""
+        if not text:
+            return []
+        lowered = text.translate(_LOWER)
+        goto, fail, out = self._goto, self._fail, self._out
+        end = len(text)
+        found: Dict[str, None] = {}
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            for symbol, kind, length in out[state]:
+                start = i - length + 1
+                if i + 1 < end and _is_word_char(text[i + 1]):
+                    continue
+                if kind != _CASHTAG and start > 0 and (_is_word_char(text[start - 1]) or text[start - 1] == "$"):
+                    continue
+                if kind == _BARE and not text[start:i + 1].isupper():
+                    continue
+                found[symbol] = None
+        return list(found)
+
+    __call__ = extract
+
+    def get_stats(self) -> Dict:
+        return {"symbols": len(self.symbols), "patterns": self.patterns, "states": len(self._goto)}
+
@@ -0,0 +1,356 @@
+"""
+Streaming sentiment ingestion: source -> dedupe -> mention extraction ->
+batched VADER scoring -> aggregation.
+
+Stages are coroutines joined by bounded ``asyncio.Queue``s, so a slow stage
+pushes back on the source instead of buffering without limit. Scoring runs
+in batches on a worker pool; everything else is cheap enough for the event
+loop. Replay a recorded or synthetic stream to measure throughput::
+
+    python -m backend.reddit.pipeline --synthetic 50000 --symbols 2000
+    python -m backend.reddit.pipeline --replay posts.jsonl --workers 2
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from ..utils.logger import get_logger
+from .mentions import MentionIndex
+from .sentiment import score_texts
+from .sources import IterableSource, Post, PostSource, ReplaySource
+
+
+_logger = get_logger(__name__)
+
+_DONE = object()
+
+_CASHTAG = re.compile(r"\$([A-Za-z]{1,5})(?![A-Za-z])")
+
+
+def extract_cashtags(text: str) -> List[str]:
+    """Distinct ``$TICKER`` mentions in ``text``, in order of appearance."""
+    return list(dict.fromkeys(m.upper() for m in _CASHTAG.findall(text)))
+
+
+class ExpiringSet:
+    """
+    Recently seen keys, forgotten after ``ttl_seconds``.
+
+    Stores 8-byte digests rather than the keys, in insertion order (which is
+    also expiry order), bounded to ``max_entries``.
+    """
+
+    def __init__(self, ttl_seconds: float = 86400, max_entries: int = 200_000) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._seen: "OrderedDict[bytes, float]" = OrderedDict()
+
+    def add(self, key: str, now: Optional[float] = None) -> bool:
+        """Remember ``key``; False if it was already seen and not expired."""
+        now = time.time() if now is None else now
+        while self._seen:
+            oldest, expires = next(iter(self._seen.items()))
+            if expires > now and len(self._seen) < self.max_entries:
+                break
+            del self._seen[oldest]
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        if digest in self._seen:
+            return False
+        self._seen[digest] = now + self.ttl_seconds
+        return True
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+
+class SentimentTally:
+    """
+    Running per-ticker totals of scored mentions.
+
+    Bounded to ``max_tickers``; the least recently mentioned ticker is
+    dropped first.
+    """
+
+    def __init__(self, max_tickers: int = 10_000, threshold: float = 0.05) -> None:
+        self.max_tickers = max_tickers
+        self.threshold = threshold
+        # ticker -> [mentions, compound sum, positive, negative, last seen]
+        self._totals: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def add(self, post: Post) -> None:
+        for ticker in post.mentions:
+            totals = self._totals.get(ticker)
+            if totals is None:
+                totals = self._totals[ticker] = [0, 0.0, 0, 0, 0.0]
+                if len(self._totals) > self.max_tickers:
+                    self._totals.popitem(last=False)
+            else:
+                self._totals.move_to_end(ticker)
+            totals[0] += 1
+            totals[1] += post.compound
+            totals[2] += post.compound >= self.threshold
+            totals[3] += post.compound <= -self.threshold
+            totals[4] = post.created_utc
+
+    def snapshot(self, ticker: str) -> Optional[Dict]:
+        totals = self._totals.get(ticker.upper())
+        if totals is None:
+            return None
+        mentions, compound, positive, negative, last_seen = totals
+        return {
+            "ticker": ticker.upper(),
+            "mentions": int(mentions),
+            "mean_compound": round(compound / mentions, 4),
+            "positive": int(positive),
+            "negative": int(negative),
+            "last_seen": last_seen,
+        }
+
+    def top(self, n: int = 10) -> List[Dict]:
+        ranked = sorted(self._totals, key=lambda t: self._totals[t][0], reverse=True)
+        return [self.snapshot(t) for t in ranked[:n]]
+
+    def __len__(self) -> int:
+        return len(self._totals)
+
+
+class SentimentPipeline:
+    """
+    Bounded streaming pipeline from a ``PostSource`` to per-ticker sentiment.
+
+    - Duplicate posts (same id, or same text when there is no id) are
+      dropped for ``dedupe_ttl`` seconds
+    - Posts mentioning no ticker are dropped before scoring
+    - Scoring batches up to ``batch_size`` posts, waiting at most
+      ``batch_wait`` seconds to fill one, with at most two batches per worker
+      in flight
+    - Scored posts go to the built-in ``tally`` and to each of ``sinks``
+    """
+
+    def __init__(
+        self,
+        extract: Callable[[str], List[str]] = extract_cashtags,
+        sinks: Iterable[Callable[[Post], None]] = (),
+        queue_size: int = 1000,
+        batch_size: int = 64,
+        batch_wait: float = 0.2,
+        workers: int = 1,
+        kind: str = "process",
+        max_chars: int = 2000,
+        dedupe_ttl: float = 86400,
+        dedupe_max: int = 200_000,
+    ) -> None:
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.extract = extract
+        self.tally = SentimentTally()
+        self.sinks = [self.tally.add, *sinks]
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.workers = workers
+        self.kind = kind
+        self.max_chars = max_chars
+        self.seen = ExpiringSet(dedupe_ttl, dedupe_max)
+        self._executor: Executor | None = None
+        self._queues: List[asyncio.Queue] = []
+        self._task: asyncio.Task | None = None
+        self._started: float | None = None
+        self.received = 0
+        self.duplicates = 0
+        self.unmentioned = 0
+        self.scored = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.sink_errors = 0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="sentiment")
+        return self._executor
+
+    async def run(self, source: PostSource) -> Dict:
+        """Process ``source`` until it is exhausted and every stage has drained."""
+        raw, unique, mentioned, scored = (asyncio.Queue(self.queue_size) for _ in range(4))
+        self._queues = [raw, unique, mentioned, scored]
+        self._started = time.perf_counter()
+        await asyncio.gather(
+            self._produce(source, raw),
+            self._dedupe(raw, unique),
+            self._extract(unique, mentioned),
+            self._score(mentioned, scored),
+            self._aggregate(scored),
+        )
+        return self.get_stats()
+
+    def start(self, source: PostSource) -> None:
+        """Run ``source`` in the background on the current event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run_logged(source))
+
+    async def _run_logged(self, source: PostSource) -> None:
+        try:
+            await self.run(source)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            _logger.exception("sentiment pipeline stopped")
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _produce(self, source: PostSource, out: asyncio.Queue) -> None:
+        try:
+            async for post in source.stream():
+                self.received += 1
+                await out.put(post)
+        finally:
+            await out.put(_DONE)
+
+    async def _dedupe(self, inp: asyncio.Queue, out: asyncio.Queue) -> None:
+        while (post := await inp.get()) is not _DONE:
+            if self.seen.add(post.id or post.text):
+                await out.put(post)
+            else:
+                self.duplicates += 1
+        await out.put(_DONE)
+
+    async def _extract(self, inp: asyncio.Queue, out: asyncio.Queue) -> None:
+        while (post := await inp.get()) is not _DONE:
+            post.mentions = self.extract(post.text)
+            if post.mentions:
+                await out.put(post)
+            else:
+                self.unmentioned += 1
+        await out.put(_DONE)
+
+    async def _score(self, inp: asyncio.Queue, out: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(2 * self.workers)
+        pending = set()
+
+        async def score(batch: List[Post]) -> None:
+            try:
+                texts = [p.text[: self.max_chars] for p in batch]
+                compounds = await loop.run_in_executor(self.executor, score_texts, texts)
+            except Exception as e:
+                self.failed_batches += 1
+                _logger.warning("sentiment batch of %d failed: %s", len(batch), e)
+                return
+            finally:
+                slots.release()
+            self.batches += 1
+            for post, compound in zip(batch, compounds):
+                post.compound = compound
+                await out.put(post)
+
+        done = False
+        while not done:
+            first = await inp.get()
+            if first is _DONE:
+                break
+            batch = [first]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                try:
+                    item = inp.get_nowait() if inp.qsize() else await asyncio.wait_for(
+                        inp.get(), max(0.0, deadline - loop.time())
+                    )
+                except asyncio.TimeoutError:
+                    break
+                if item is _DONE:
+                    done = True
+                    break
+                batch.append(item)
+            await slots.acquire()
+            task = asyncio.ensure_future(score(batch))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+        await out.put(_DONE)
+
+    async def _aggregate(self, inp: asyncio.Queue) -> None:
+        while (post := await inp.get()) is not _DONE:
+            self.scored += 1
+            for sink in self.sinks:
+                try:
+                    sink(post)
+                except Exception:
+                    self.sink_errors += 1
+
+    def get_stats(self) -> Dict:
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "received": self.received,
+            "duplicates": self.duplicates,
+            "unmentioned": self.unmentioned,
+            "scored": self.scored,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "sink_errors": self.sink_errors,
+            "avg_batch": round(self.scored / self.batches, 1) if self.batches else None,
+            "posts_per_minute": round(self.received / elapsed * 60) if elapsed else None,
+            "queue_depths": [q.qsize() for q in self._queues],
+            "dedupe_entries": len(self.seen),
+            "tickers": len(self.tally),
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from ..benchmarks.fixtures import symbol_names, synthetic_posts
+
+    parser = argparse.ArgumentParser(description="Run the sentiment pipeline over a replayed stream.")
+    parser.add_argument("--replay", help="JSON-lines file of posts")
+    parser.add_argument("--synthetic", type=int, default=20000, help="synthetic posts when no --replay is given")
+    parser.add_argument("--symbols", type=int, default=500, help="symbols mentioned in synthetic posts")
+    parser.add_argument("--universe", help="symbol universe file for mention matching (default: cashtags only)")
+    parser.add_argument("--rate", type=float, help="replay rate cap in posts per second")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--kind", choices=("process", "thread"), default="process")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--queue-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    extract: Callable[[str], List[str]] = extract_cashtags
+    if args.universe:
+        extract = MentionIndex.from_file(args.universe)
+    if args.replay:
+        source: PostSource = ReplaySource(args.replay, rate=args.rate)
+    else:
+        symbols = symbol_names(args.symbols)
+        source = IterableSource(synthetic_posts(args.synthetic, symbols))
+        if not args.universe:
+            extract = MentionIndex(symbols)
+    pipeline = SentimentPipeline(
+        extract, workers=args.workers, kind=args.kind, batch_size=args.batch_size, queue_size=args.queue_size
+    )
+    try:
+        stats = asyncio.run(pipeline.run(source))
+    finally:
+        pipeline.stop()
+    stats["top"] = pipeline.tally.top(5)
+    print(json.dumps(stats, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
@@ -1,8 +1,35 @@
-from typing import List
+import os
+from typing import Dict, List
 
 
-def fetch_recent_posts(subreddits: List[str], limit: int = 50) -> List[str]:
-    # Placeholder to avoid PRAW setup during initial scaffolding
-    return []
+def fetch_recent_posts(subreddits: List[str], limit: int = 50) -> List[Dict]:
+    """
+    Newest submissions across ``subreddits`` as plain dicts
+    (``id``, ``text``, ``created_utc``, ``subreddit``).
 
+    Uses PRAW with ``REDDIT_CLIENT_ID``/``REDDIT_CLIENT_SECRET``; returns an
+    empty list when the credentials are not configured.
+    """
+    client_id = os.getenv("REDDIT_CLIENT_ID")
+    client_secret = os.getenv("REDDIT_CLIENT_SECRET")
+    if not client_id or not client_secret or not subreddits:
+        return []
+    # Imported on first use so the API starts without PRAW installed
+    import praw
+
+    reddit = praw.Reddit(
+        client_id=client_id,
+        client_secret=client_secret,
+        user_agent=os.getenv("REDDIT_USER_AGENT", "traderblock-sentiment/1.0"),
+        check_for_async=False,
+    )
+    posts = []
+    for submission in reddit.subreddit("+".join(subreddits)).new(limit=limit):
+        posts.append({
+            "id": submission.id,
+            "text": f"{submission.title}\n{submission.selftext or ''}",
+            "created_utc": float(submission.created_utc),
+            "subreddit": str(submission.subreddit),
+        })
+    return posts
 
@@ -1,3 +1,5 @@
+from typing import List
+
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 
@@ -9,3 +11,7 @@ def score_text(text: str) -> float:
     return float(scores.get("compound", 0.0))
 
 
+def score_texts(texts: List[str]) -> List[float]:
+    """Compound scores for a batch; module-level so a process pool can run it."""
+    return [score_text(t) for t in texts]
+
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+from ..utils.logger import get_logger
+from .scraper import fetch_recent_posts
+
+
+_logger = get_logger(__name__)
+
+
+class Post:
+    """One social post moving through the sentiment pipeline."""
+
+    __slots__ = ("id", "text", "created_utc", "subreddit", "mentions", "compound")
+
+    def __init__(self, id: str, text: str, created_utc: float = 0.0, subreddit: str = "") -> None:
+        self.id = id
+        self.text = text
+        self.created_utc = created_utc
+        self.subreddit = subreddit
+        self.mentions: List[str] = []
+        self.compound = 0.0
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Post":
+        text = data.get("text")
+        if text is None:
+            text = f"{data.get('title', '')}\n{data.get('selftext', '')}"
+        return cls(
+            str(data.get("id", "")),
+            text,
+            float(data.get("created_utc") or time.time()),
+            str(data.get("subreddit", "")),
+        )
+
+
+class PostSource:
+    """
+    Base class for pipeline inputs.
+
+    Subclasses implement ``stream``, an async iterator of ``Post``. The
+    pipeline applies backpressure by awaiting its bounded queue, so a source
+    simply yields as fast as it can.
+    """
+
+    name = "source"
+
+    def stream(self) -> AsyncIterator[Post]:
+        raise NotImplementedError
+
+
+class IterableSource(PostSource):
+    """Posts from an in-memory iterable of dicts; for tests and benchmarks."""
+
+    name = "iterable"
+
+    def __init__(self, items: Iterable[Dict]) -> None:
+        self.items = items
+
+    async def stream(self) -> AsyncIterator[Post]:
+        for i, item in enumerate(self.items):
+            yield Post.from_dict(item)
+            if i % 1000 == 999:
+                # Let the downstream stages run between large bursts
+                await asyncio.sleep(0)
+
+
+class ReplaySource(PostSource):
+    """
+    Replays posts recorded as JSON lines (one post dict per line).
+
+    ``rate`` caps replay speed in posts per second (``None`` for as fast as
+    the pipeline accepts); ``loop`` restarts at the end of the file.
+    Blocking file reads happen in chunks on a worker thread.
+    """
+
+    name = "replay"
+
+    def __init__(self, path: str, rate: Optional[float] = None, loop: bool = False, chunk: int = 1000) -> None:
+        self.path = path
+        self.rate = rate
+        self.loop = loop
+        self.chunk = chunk
+
+    def _read_chunks(self) -> Iterable[List[str]]:
+        with open(self.path, "r") as f:
+            while True:
+                lines = [line for line in (f.readline() for _ in range(self.chunk)) if line]
+                if not lines:
+                    return
+                yield lines
+
+    async def stream(self) -> AsyncIterator[Post]:
+        started = time.perf_counter()
+        emitted = 0
+        while True:
+            chunks = iter(self._read_chunks())
+            while True:
+                lines = await asyncio.to_thread(next, chunks, None)
+                if lines is None:
+                    break
+                for line in lines:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield Post.from_dict(json.loads(line))
+                    except (ValueError, TypeError):
+                        continue
+                    emitted += 1
+                    if self.rate:
+                        ahead = emitted / self.rate - (time.perf_counter() - started)
+                        if ahead > 0:
+                            await asyncio.sleep(ahead)
+                await asyncio.sleep(0)
+            if not self.loop:
+                return
+
+
+class RedditSource(PostSource):
+    """Polls the newest submissions of ``subreddits`` every ``poll_seconds``."""
+
+    name = "reddit"
+
+    def __init__(
+        self,
+        subreddits: List[str],
+        poll_seconds: float = 30.0,
+        limit: int = 100,
+        fetch: Callable[[List[str], int], List[Dict]] = fetch_recent_posts,
+    ) -> None:
+        self.subreddits = subreddits
+        self.poll_seconds = poll_seconds
+        self.limit = limit
+        self.fetch = fetch
+
+    async def stream(self) -> AsyncIterator[Post]:
+        while True:
+            try:
+                items = await asyncio.to_thread(self.fetch, self.subreddits, self.limit)
+            except Exception as e:
+                _logger.warning("reddit poll failed: %s", e)
+                items = []
+            # Overlap between polls is removed by the pipeline's dedupe stage
+            for item in items:
+                yield Post.from_dict(item)
+            await asyncio.sleep(self.poll_seconds)
+
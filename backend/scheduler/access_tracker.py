@@ -0,0 +1,102 @@
+import hashlib
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+class CountMinSketch:
+    """
+    Approximate frequency counts in fixed memory.
+
+    ``depth`` rows of ``width`` counters, one hash per row. The estimate for
+    a key is the minimum over its counters, so collisions can only inflate
+    it; with the defaults the error stays within ~0.1% of all recorded
+    events for 98% of keys.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4) -> None:
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.uint32)
+        self._rows = np.arange(depth)
+
+    def _columns(self, key: str) -> np.ndarray:
+        # Double hashing: row i uses h1 + i * h2, from one 128-bit digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return np.array([(h1 + i * h2) % self.width for i in range(self.depth)])
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Record ``count`` events for ``key`` and return its new estimate."""
+        cols = self._columns(key)
+        self.table[self._rows, cols] += count
+        return int(self.table[self._rows, cols].min())
+
+    def estimate(self, key: str) -> int:
+        return int(self.table[self._rows, self._columns(key)].min())
+
+    def decay(self, factor: float = 0.5) -> None:
+        self.table[:] = (self.table * factor).astype(np.uint32)
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes
+
+
+class AccessTracker:
+    """
+    Per-key request frequency in bounded memory.
+
+    Counts live in a ``CountMinSketch``; a candidate set of at most
+    ``capacity`` keys remembers the current heaviest ones so ``top`` never
+    scans the whole key space. ``decay`` ages all counts so popularity
+    follows recent traffic rather than all-time totals.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4, capacity: int = 256) -> None:
+        self.sketch = CountMinSketch(width, depth)
+        self.capacity = capacity
+        self._top: Dict[str, int] = {}
+        # Lower bound on the smallest candidate count; avoids a scan per record
+        self._floor = 0
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def record(self, key: str) -> None:
+        with self._lock:
+            count = self.sketch.add(key)
+            self.recorded += 1
+            if key in self._top or len(self._top) < self.capacity:
+                self._top[key] = count
+            elif count > self._floor:
+                coldest = min(self._top, key=self._top.get)
+                if count > self._top[coldest]:
+                    del self._top[coldest]
+                    self._top[key] = count
+                self._floor = min(self._top.values())
+
+    def top(self, n: int, min_count: int = 1) -> List[Tuple[str, int]]:
+        """The ``n`` most requested keys with at least ``min_count`` requests, hottest first."""
+        with self._lock:
+            ranked = sorted(self._top.items(), key=lambda kv: kv[1], reverse=True)
+        return [(k, c) for k, c in ranked[:n] if c >= min_count]
+
+    def estimate(self, key: str) -> int:
+        return self.sketch.estimate(key)
+
+    def decay(self, factor: float = 0.5) -> None:
+        with self._lock:
+            self.sketch.decay(factor)
+            self._top = {k: int(c * factor) for k, c in self._top.items() if int(c * factor) > 0}
+            self._floor = min(self._top.values(), default=0)
+
+    def get_stats(self) -> Dict:
+        return {
+            "recorded": self.recorded,
+            "candidates": len(self._top),
+            "sketch_bytes": self.sketch.nbytes,
+            "top": dict(self.top(10)),
+        }
+
@@ -0,0 +1,96 @@
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from ..data.cache_manager import CacheManager
+from ..ml.predictor import ThreeDayPredictor
+from ..utils.logger import get_logger
+from ..utils.market_hours import MARKET_TZ, is_market_open, last_close, next_close
+
+
+_logger = get_logger(__name__)
+
+
+class BatchPredictionJob:
+    """
+    Precomputes ``/predict`` results for the hot universe.
+
+    Meant to be driven by ``UpdateScheduler`` on a short check interval: each
+    call runs only once per completed session, outside market hours and
+    ``settle_minutes`` after the close, when the new daily bar exists; a
+    restart mid-session waits for the close too. Frames come from
+    ``load_frames`` (``{ticker: frame}, {ticker: error}``), normally the bar
+    store. Results are written as ``predict:{ticker}`` with a TTL reaching
+    past the next close, so interactive calls hit the cache. Frames are
+    loaded ``chunk_size`` tickers at a time; if the market opens meanwhile
+    the run stops loading, caches what it has and tries again after the
+    next close.
+    """
+
+    def __init__(
+        self,
+        load_frames: Callable[[List[str], int], Tuple[Dict[str, pd.DataFrame], Dict[str, str]]],
+        predictor: ThreeDayPredictor,
+        cache: CacheManager,
+        tickers: List[str],
+        outputsize: int = 120,
+        settle_minutes: int = 15,
+        sentiment: Optional[Callable[[List[str]], Dict[str, Dict]]] = None,
+        chunk_size: int = 8,
+    ) -> None:
+        self.load_frames = load_frames
+        self.predictor = predictor
+        self.cache = cache
+        self.tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        self.outputsize = outputsize
+        # Give the provider time to publish the closing bar
+        self.settle = timedelta(minutes=settle_minutes)
+        # tickers -> live sentiment features, e.g. ``SentimentStore.features_many``
+        self.sentiment = sentiment
+        self.chunk_size = chunk_size
+        self.last_session: datetime | None = None
+        self.last_run_stats: Dict = {}
+
+    def is_due(self, now: datetime | None = None) -> bool:
+        now = now or datetime.now(tz=MARKET_TZ)
+        if is_market_open(now):
+            return False
+        session = last_close(now)
+        return (self.last_session is None or session > self.last_session) and now >= session + self.settle
+
+    def __call__(self) -> None:
+        if self.is_due():
+            self.run()
+
+    def run(self) -> Dict:
+        started = time.time()
+        frames: Dict[str, pd.DataFrame] = {}
+        errors: Dict[str, str] = {}
+        interrupted = False
+        for i in range(0, len(self.tickers), self.chunk_size):
+            if is_market_open():
+                interrupted = True
+                break
+            loaded, failed = self.load_frames(self.tickers[i:i + self.chunk_size], self.outputsize)
+            frames.update(loaded)
+            errors.update(failed)
+        features = self.sentiment(list(frames)) if self.sentiment else None
+        results = self.predictor.predict_frames(frames, features)
+        ttl = int((next_close() + self.settle - datetime.now(tz=last_close().tzinfo)).total_seconds())
+        self.cache.set_many({f"predict:{t}": r for t, r in results.items()}, ttl_seconds=ttl)
+        if not interrupted:
+            self.last_session = last_close()
+        self.last_run_stats = {
+            "tickers": len(self.tickers),
+            "predicted": len(results),
+            "missing": sorted(set(self.tickers) - set(results)),
+            "errors": errors,
+            "interrupted": interrupted,
+            "duration_seconds": round(time.time() - started, 2),
+            "finished_at": int(time.time()),
+        }
+        _logger.info("batch predictions: %d/%d tickers cached", len(results), len(self.tickers))
+        return self.last_run_stats
+
@@ -0,0 +1,76 @@
+import time
+from typing import Callable, Dict, List, Optional
+
+from ..data.fetcher import TwelveDataFetcher
+from ..data.fundamentals_table import FundamentalsTable
+from ..indicators.fundamental import compute_basic_fundamentals
+from ..utils.logger import get_logger
+from ..utils.market_hours import is_market_open
+
+
+_logger = get_logger(__name__)
+
+
+class FundamentalsJob:
+    """
+    Bulk-loads fundamentals for the universe into a ``FundamentalsTable``.
+
+    Meant to run outside market hours, when the provider quota is not
+    needed for prices. Each run fetches at most ``max_per_run`` tickers that
+    are due, oldest first, so a large universe is covered over several runs
+    without starving other jobs of quota; a run that reaches the open stops
+    there and leaves the rest for the next one. ``universe`` is called per run so
+    it can follow what users request, and ``on_loaded`` receives each
+    ticker's fresh values, e.g. to update screener rows.
+    """
+
+    def __init__(
+        self,
+        fetcher: TwelveDataFetcher,
+        table: FundamentalsTable,
+        universe: Callable[[], List[str]],
+        max_per_run: int = 200,
+        on_loaded: Optional[Callable[[str, Dict], object]] = None,
+    ) -> None:
+        self.fetcher = fetcher
+        self.table = table
+        self.universe = universe
+        self.max_per_run = max_per_run
+        self.on_loaded = on_loaded
+        self.last_run_stats: Dict = {}
+
+    def __call__(self) -> None:
+        self.run()
+
+    def run(self) -> Dict:
+        started = time.time()
+        due = self.table.due(self.universe())
+        batch = due[: self.max_per_run]
+        errors: Dict[str, str] = {}
+        interrupted = False
+        for n, ticker in enumerate(batch):
+            if is_market_open():
+                interrupted = True
+                batch = batch[:n]
+                break
+            try:
+                values = compute_basic_fundamentals(self.fetcher.get_fundamentals(ticker))
+                self.table.upsert(ticker, values)
+                if self.on_loaded:
+                    self.on_loaded(ticker, values)
+            except Exception as e:
+                errors[ticker] = str(e)
+        if len(errors) < len(batch):
+            self.table.save()
+        self.last_run_stats = {
+            "due": len(due),
+            "loaded": len(batch) - len(errors),
+            "errors": errors,
+            "interrupted": interrupted,
+            "duration_seconds": round(time.time() - started, 2),
+            "finished_at": int(time.time()),
+        }
+        if batch:
+            _logger.info("fundamentals: loaded %d/%d due tickers", len(batch) - len(errors), len(due))
+        return self.last_run_stats
+
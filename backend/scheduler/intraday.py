@@ -0,0 +1,83 @@
+import time
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from ..data.fetcher import TwelveDataFetcher
+from ..data.intraday_store import IntradayStore
+from ..utils.logger import get_logger
+
+
+_logger = get_logger(__name__)
+
+
+class IntradayPollJob:
+    """
+    Polls intraday bars for the universe into an ``IntradayStore``.
+
+    Tickers the store already holds fetch only the last ``poll_bars`` bars
+    (enough to cover a missed poll and the revision of the forming bar);
+    new ones fetch a full ring. Both groups go out as multi-symbol requests.
+
+    Every symbol costs one provider credit, so a run polls only as many
+    tickers as the fetcher has credits left this minute beyond
+    ``reserve_credits``, stalest first; the rest wait for a later run.
+    """
+
+    def __init__(
+        self,
+        fetcher: TwelveDataFetcher,
+        store: IntradayStore,
+        universe: Callable[[], List[str]],
+        parse: Callable[[List[Dict]], pd.DataFrame],
+        poll_bars: int = 5,
+        reserve_credits: int = 0,
+    ) -> None:
+        self.fetcher = fetcher
+        self.store = store
+        self.universe = universe
+        self.parse = parse
+        self.poll_bars = poll_bars
+        self.reserve_credits = reserve_credits
+        self.last_run_stats: Dict = {}
+
+    def __call__(self) -> None:
+        self.run()
+
+    def run(self) -> Dict:
+        started = time.time()
+        tickers = list(dict.fromkeys(t.upper() for t in self.universe()))
+        last = {t: self.store.last_time(t) for t in tickers}
+        known = sorted((t for t in tickers if last[t] is not None), key=last.get)
+        new = [t for t in tickers if last[t] is None]
+        # Known tickers first, so rings already filled keep up before new ones start
+        budget = max(0, self.fetcher.rate_limiter.remaining() - self.reserve_credits)
+        known, new = known[:budget], new[:max(0, budget - len(known))]
+        appended = 0
+        errors: Dict[str, str] = {}
+        for group, size in ((known, self.poll_bars), (new, self.store.capacity)):
+            if not group:
+                continue
+            try:
+                series = self.fetcher.get_time_series_batch(group, interval=self.store.interval, outputsize=size)
+            except Exception as e:
+                errors.update({t: str(e) for t in group})
+                continue
+            for t in group:
+                df = self.parse(series.get(t, []))
+                if df.empty:
+                    errors[t] = "No data"
+                else:
+                    appended += self.store.extend(t, df)
+        if errors:
+            _logger.warning("intraday: %d of %d tickers failed", len(errors), len(tickers))
+        self.last_run_stats = {
+            "tickers": len(tickers),
+            "polled": len(known) + len(new),
+            "appended": appended,
+            "errors": errors,
+            "duration_seconds": round(time.time() - started, 2),
+            "finished_at": int(time.time()),
+        }
+        return self.last_run_stats
+
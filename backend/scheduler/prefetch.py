@@ -0,0 +1,71 @@
+import time
+from typing import Callable, Dict, List, Sequence
+
+from ..data.cache_manager import CacheManager
+from ..utils.logger import get_logger
+from .access_tracker import AccessTracker
+
+
+_logger = get_logger(__name__)
+
+
+class PrefetchJob:
+    """
+    Recomputes hot cache entries shortly before they expire.
+
+    Keys are cache keys such as ``stock:AAPL``, recorded by the request
+    handlers into an ``AccessTracker``. Each run takes the ``max_keys``
+    hottest keys with at least ``min_hits`` recent requests and whose entry
+    expires within ``lead_seconds``, and hands them to ``refresh`` in one
+    call so upstream fetches can be batched. Entries that already expired
+    are left to the next request.
+    """
+
+    def __init__(
+        self,
+        tracker: AccessTracker,
+        cache: CacheManager,
+        refresh: Callable[[List[str]], Dict[str, str]],
+        prefixes: Sequence[str] = ("stock", "predict"),
+        lead_seconds: int = 120,
+        max_keys: int = 20,
+        min_hits: int = 3,
+    ) -> None:
+        self.tracker = tracker
+        self.cache = cache
+        self.refresh = refresh
+        self.prefixes = tuple(prefixes)
+        self.lead_seconds = lead_seconds
+        self.max_keys = max_keys
+        self.min_hits = min_hits
+        self.prefetched = 0
+        self.last_run_stats: Dict = {}
+
+    def due(self) -> List[str]:
+        keys = []
+        for key, _ in self.tracker.top(self.max_keys, self.min_hits):
+            if key.partition(":")[0] not in self.prefixes:
+                continue
+            if 0 < self.cache.ttl_remaining(key) <= self.lead_seconds:
+                keys.append(key)
+        return keys
+
+    def __call__(self) -> None:
+        keys = self.due()
+        if not keys:
+            return
+        started = time.time()
+        errors = self.refresh(keys)
+        self.prefetched += len(keys) - len(errors)
+        self.last_run_stats = {
+            "keys": len(keys),
+            "refreshed": len(keys) - len(errors),
+            "errors": errors,
+            "duration_seconds": round(time.time() - started, 2),
+            "finished_at": int(time.time()),
+        }
+        _logger.info("prefetch: refreshed %d/%d hot entries", len(keys) - len(errors), len(keys))
+
+    def get_stats(self) -> Dict:
+        return {"prefetched": self.prefetched, "last_run": self.last_run_stats, "access": self.tracker.get_stats()}
+
@@ -0,0 +1,135 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from ..data.snapshot_table import SnapshotTable
+from ..utils.logger import get_logger
+from ..utils.market_hours import is_market_open
+
+
+_logger = get_logger(__name__)
+
+
+class ScreenerJob:
+    """
+    Keeps a ``SnapshotTable`` current for the screener.
+
+    Frames reach it two ways: ``on_bars`` queues every daily frame the bar
+    store receives (so requests for any ticker refresh its row for free),
+    and runs outside market hours also load up to ``max_per_run`` universe
+    tickers whose row is missing or older than ``max_age_seconds``. During
+    the session only queued frames are used, so the sweep never competes
+    with price requests for provider quota; a sweep loads ``chunk_size``
+    tickers at a time and stops if the market opens meanwhile. Rows are recomputed only when
+    the last bar changed; ``compute`` turns ``{ticker: frame}`` into
+    ``{ticker: row}`` and may hand the work to a worker pool; if it raises, the frames are queued again.
+    """
+
+    def __init__(
+        self,
+        table: SnapshotTable,
+        load_frames: Callable[[List[str], int], Tuple[Dict[str, pd.DataFrame], Dict[str, str]]],
+        compute: Callable[[Dict[str, pd.DataFrame]], Dict[str, Dict]],
+        universe: Callable[[], List[str]],
+        extra: Optional[Callable[[List[str]], Dict[str, Dict]]] = None,
+        bars: int = 200,
+        key_prefix: str = "twelvedata:1day:",
+        max_age_seconds: float = 3600,
+        max_per_run: int = 500,
+        chunk_size: int = 8,
+    ) -> None:
+        self.table = table
+        self.load_frames = load_frames
+        self.compute = compute
+        self.universe = universe
+        # Extra per-ticker columns merged into each row, e.g. fundamentals
+        self.extra = extra
+        self.bars = bars
+        self.key_prefix = key_prefix
+        self.max_age_seconds = max_age_seconds
+        self.max_per_run = max_per_run
+        self.chunk_size = chunk_size
+        self._pending: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+        self._seen: Dict[str, float] = {}
+        self.last_run_stats: Dict = {}
+
+    def on_bars(self, key: str, df: pd.DataFrame) -> None:
+        """Bar store listener: queue daily frames for the next run."""
+        if key.startswith(self.key_prefix) and not df.empty:
+            with self._lock:
+                self._pending[key[len(self.key_prefix):].upper()] = df
+
+    def __call__(self) -> None:
+        self.run()
+
+    def _stale(self, tickers: List[str], now: float) -> List[str]:
+        ages = {t: now - self._seen.get(t, 0.0) for t in dict.fromkeys(t.upper() for t in tickers)}
+        due = [t for t, age in ages.items() if age >= self.max_age_seconds]
+        return sorted(due, key=ages.get, reverse=True)[: self.max_per_run]
+
+    def run(self) -> Dict:
+        started = time.time()
+        with self._lock:
+            frames, self._pending = self._pending, {}
+        queued = len(frames)
+        due = [] if is_market_open() else [t for t in self._stale(self.universe(), started) if t not in frames]
+        errors: Dict[str, str] = {}
+        loaded_count = 0
+        interrupted = False
+        for i in range(0, len(due), self.chunk_size):
+            # A sweep started before the open must not run into the session
+            if is_market_open():
+                interrupted = True
+                break
+            loaded, failed = self.load_frames(due[i:i + self.chunk_size], self.bars)
+            errors.update(failed)
+            loaded_count += len(loaded)
+            # Loads may have queued the same frames through on_bars
+            with self._lock:
+                for t in loaded:
+                    self._pending.pop(t, None)
+            frames.update({t.upper(): df for t, df in loaded.items()})
+        changed = {}
+        for t, df in frames.items():
+            self._seen[t] = started
+            bar_time, bar_close = self._version(df)
+            if not self.table.is_current(t, bar_time, bar_close):
+                changed[t] = df.tail(self.bars)
+        try:
+            rows = self.compute(changed) if changed else {}
+        except Exception:
+            # e.g. a saturated worker pool: keep the frames for the next run
+            with self._lock:
+                for t, df in changed.items():
+                    self._pending.setdefault(t, df)
+                    self._seen.pop(t, None)
+            raise
+        extra = self.extra(list(rows)) if self.extra and rows else {}
+        for t, row in rows.items():
+            if "error" in row:
+                errors[t] = row["error"]
+                continue
+            bar_time, bar_close = self._version(changed[t])
+            self.table.upsert(t, {**row, **extra.get(t, {})}, bar_time, bar_close)
+        if errors:
+            _logger.warning("screener: %d tickers failed to refresh", len(errors))
+        self.last_run_stats = {
+            "queued": queued,
+            "loaded": loaded_count,
+            "interrupted": interrupted,
+            "updated": len(rows) - len([t for t in rows if t in errors]),
+            "unchanged": len(frames) - len(changed),
+            "errors": errors,
+            "duration_seconds": round(time.time() - started, 2),
+            "finished_at": int(time.time()),
+        }
+        return self.last_run_stats
+
+    @staticmethod
+    def _version(df: pd.DataFrame) -> Tuple[float, float]:
+        stamp = pd.Timestamp(df.index[-1])
+        return stamp.value / 1e9, float(df["Close"].iloc[-1])
+
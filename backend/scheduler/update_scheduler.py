@@ -1,32 +1,214 @@
+import random
 import threading
 import time
-from typing import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Optional
 
+from ..utils.logger import get_logger
+from ..utils.market_hours import MARKET_TZ, is_market_open, next_close, next_open
+from ..utils.metrics import JOB_DURATION, JOB_LAST_SUCCESS, JOB_RUNS
 
-class UpdateScheduler:
-    def __init__(self, interval_seconds: int = 3600) -> None:
+
+_logger = get_logger(__name__)
+
+
+class Job:
+    """
+    A named periodic task and its run history.
+
+    ``interval_seconds`` applies while the market is open and
+    ``closed_interval_seconds`` outside trading hours; ``None`` for either
+    keeps the job idle until the market next opens or closes. Each delay is
+    spread by ``jitter`` (a fraction of the interval) so jobs sharing a
+    cadence do not fire together. ``quick`` jobs (short persistence tasks)
+    run in their own lane so long jobs cannot hold them up.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[], object],
+        interval_seconds: Optional[float],
+        closed_interval_seconds: Optional[float] = None,
+        jitter: float = 0.1,
+        run_at_start: bool = True,
+        quick: bool = False,
+    ) -> None:
+        self.name = name
+        self.fn = fn
         self.interval_seconds = interval_seconds
-        self._thread: threading.Thread | None = None
+        self.closed_interval_seconds = closed_interval_seconds
+        self.jitter = jitter
+        self.run_at_start = run_at_start
+        self.quick = quick
+        self.next_run = 0.0
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_duration: float | None = None
+        self.last_error: str | None = None
+        self.last_success: float | None = None
+
+    def next_delay(self, now: datetime) -> float:
+        """Seconds until the next run, given the market clock ``now``."""
+        if is_market_open(now):
+            until_close = (next_close(now) - now).total_seconds()
+            if self.interval_seconds is None:
+                # Wake shortly after the close, spread like a regular interval
+                return until_close + random.uniform(0, self.jitter * (self.closed_interval_seconds or 0))
+            base = min(self.interval_seconds, until_close)
+        else:
+            until_open = (next_open(now) - now).total_seconds()
+            if self.closed_interval_seconds is None:
+                return until_open + random.uniform(0, self.jitter * (self.interval_seconds or 0))
+            base = min(self.closed_interval_seconds, until_open)
+        return max(1.0, base * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def get_stats(self) -> Dict:
+        return {
+            "interval_seconds": self.interval_seconds,
+            "closed_interval_seconds": self.closed_interval_seconds,
+            "lane": "quick" if self.quick else "main",
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_duration_seconds": round(self.last_duration, 3) if self.last_duration is not None else None,
+            "last_success": int(self.last_success) if self.last_success else None,
+            "last_error": self.last_error,
+            "next_run_in_seconds": max(0, int(self.next_run - time.time())) if self.next_run else None,
+        }
+
+
+class UpdateScheduler:
+    """
+    Runs named background jobs on market-hours-aware cadences.
+
+    - One dispatcher thread; jobs run on a small worker pool so a slow job
+      does not delay the others, and ``quick`` jobs on a separate pool of
+      ``quick_workers`` so long off-hours jobs never starve them
+    - A job still running when it falls due again is skipped, not stacked
+    - Failures are logged and counted; the job keeps its schedule
+    - Run time and outcomes are exported as ``traderblock_job_*`` metrics
+    """
+
+    def __init__(
+        self, max_workers: int = 2, quick_workers: int = 1, clock: Callable[[], datetime] | None = None
+    ) -> None:
+        self.max_workers = max_workers
+        self.quick_workers = quick_workers
+        self._clock = clock or (lambda: datetime.now(tz=MARKET_TZ))
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
         self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._quick_executor: ThreadPoolExecutor | None = None
 
-    def start(self, task: Callable[[], None]) -> None:
+    def add_job(
+        self,
+        name: str,
+        fn: Callable[[], object],
+        interval_seconds: Optional[float],
+        closed_interval_seconds: Optional[float] = None,
+        jitter: float = 0.1,
+        run_at_start: bool = True,
+        quick: bool = False,
+    ) -> Job:
+        job = Job(name, fn, interval_seconds, closed_interval_seconds, jitter, run_at_start, quick)
+        with self._lock:
+            if name in self._jobs:
+                raise ValueError(f"Job already registered: {name}")
+            self._jobs[name] = job
+        self._wake.set()
+        return job
+
+    def start(self) -> None:
+        # Startup hooks may fire more than once
         if self._thread and self._thread.is_alive():
             return
-
-        def run() -> None:
-            while not self._stop.is_set():
-                try:
-                    task()
-                except Exception:
-                    pass
-                self._stop.wait(self.interval_seconds)
-
-        self._thread = threading.Thread(target=run, daemon=True)
+        self._stop.clear()
+        now = time.time()
+        with self._lock:
+            for job in self._jobs.values():
+                job.next_run = now if job.run_at_start else now + job.next_delay(self._clock())
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scheduler")
+        self._quick_executor = ThreadPoolExecutor(
+            max_workers=self.quick_workers, thread_name_prefix="scheduler-quick"
+        )
+        # The dispatcher only sleeps and submits; jobs run on the pool's threads,
+        # which the interpreter joins at exit instead of killing mid-run
+        self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
         self._thread.start()
 
     def stop(self) -> None:
         self._stop.set()
+        self._wake.set()
         if self._thread:
             self._thread.join(timeout=1)
+        for executor in (self._executor, self._quick_executor):
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._quick_executor = None
+
+    def run_now(self, name: str) -> None:
+        """Make ``name`` due immediately."""
+        with self._lock:
+            self._jobs[name].next_run = 0.0
+        self._wake.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            now = time.time()
+            with self._lock:
+                for job in self._jobs.values():
+                    if job.next_run <= now:
+                        self._dispatch(job)
+                        job.next_run = now + job.next_delay(self._clock())
+                wait = min((job.next_run for job in self._jobs.values()), default=now + 60) - now
+            # Re-check at least every minute so clock jumps and new jobs are noticed
+            self._wake.wait(min(max(wait, 0.05), 60))
+            self._wake.clear()
+
+    def _dispatch(self, job: Job) -> None:
+        if job.running:
+            job.skipped += 1
+            JOB_RUNS.inc(job=job.name, outcome="skipped")
+            return
+        job.running = True
+        try:
+            (self._quick_executor if job.quick else self._executor).submit(self._execute, job)
+        except (AttributeError, RuntimeError):
+            # Executor already shut down
+            job.running = False
+
+    def _execute(self, job: Job) -> None:
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            job.fn()
+            job.last_error = None
+            job.last_success = time.time()
+            JOB_LAST_SUCCESS.set(job.last_success, job=job.name)
+        except Exception as e:
+            outcome = "failed"
+            job.failures += 1
+            job.last_error = f"{type(e).__name__}: {e}"
+            _logger.exception("job %s failed", job.name)
+        finally:
+            job.last_duration = time.perf_counter() - started
+            job.runs += 1
+            job.running = False
+            JOB_RUNS.inc(job=job.name, outcome=outcome)
+            JOB_DURATION.observe(job.last_duration, job=job.name, outcome=outcome)
 
+    def get_stats(self) -> Dict:
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "market_open": is_market_open(self._clock()),
+            "jobs": {name: job.get_stats() for name, job in list(self._jobs.items())},
+        }
 
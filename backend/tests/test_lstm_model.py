@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from backend.ml.models.lstm_model import LSTMModel, export_keras_weights
+
+
+tf = pytest.importorskip("tensorflow")
+
+ATOL = 1e-4
+
+
+def _keras_model():
+    # Same architecture as StockAnalyzer.create_model, with fixed initial weights
+    tf.keras.utils.set_random_seed(0)
+    model = tf.keras.Sequential([
+        tf.keras.Input(shape=(60, 1)),
+        tf.keras.layers.LSTM(50, return_sequences=True),
+        tf.keras.layers.Dropout(0.2),
+        tf.keras.layers.LSTM(50, return_sequences=False),
+        tf.keras.layers.Dropout(0.2),
+        tf.keras.layers.Dense(25),
+        tf.keras.layers.Dense(1),
+    ])
+    model.compile(optimizer="adam", loss="mean_squared_error")
+    return model
+
+
+def _batch(size: int = 16) -> np.ndarray:
+    return np.random.default_rng(1).random((size, 60, 1), dtype=np.float32)
+
+
+def test_predict_matches_keras():
+    model = _keras_model()
+    X = _batch()
+    expected = np.asarray(model.predict(X, verbose=0))
+    np.testing.assert_allclose(LSTMModel.from_keras(model).predict(X), expected, atol=ATOL)
+
+
+def test_exported_weights_match_keras(tmp_path):
+    model = _keras_model()
+    path = str(tmp_path / "lstm_weights.npz")
+    export_keras_weights(model, path, check=False)
+    X = _batch()
+    expected = np.asarray(model.predict(X, verbose=0))
+    np.testing.assert_allclose(LSTMModel.load(path).predict(X), expected, atol=ATOL)
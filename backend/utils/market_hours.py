@@ -0,0 +1,55 @@
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+
+
+def _now(now: datetime | None) -> datetime:
+    return (now or datetime.now(tz=MARKET_TZ)).astimezone(MARKET_TZ)
+
+
+def is_trading_day(day: datetime) -> bool:
+    # Weekends only; exchange holidays are not modelled yet
+    return day.weekday() < 5
+
+
+def is_market_open(now: datetime | None = None) -> bool:
+    now = _now(now)
+    return is_trading_day(now) and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def last_close(now: datetime | None = None) -> datetime:
+    """Most recent session close at or before ``now``."""
+    now = _now(now)
+    day = now
+    if now.time() < MARKET_CLOSE:
+        day -= timedelta(days=1)
+    while not is_trading_day(day):
+        day -= timedelta(days=1)
+    return datetime.combine(day.date(), MARKET_CLOSE, tzinfo=MARKET_TZ)
+
+
+def next_close(now: datetime | None = None) -> datetime:
+    """First session close strictly after ``now``."""
+    now = _now(now)
+    day = now
+    if now.time() >= MARKET_CLOSE:
+        day += timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return datetime.combine(day.date(), MARKET_CLOSE, tzinfo=MARKET_TZ)
+
+
+def next_open(now: datetime | None = None) -> datetime:
+    """First session open strictly after ``now``."""
+    now = _now(now)
+    day = now
+    if now.time() >= MARKET_OPEN:
+        day += timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return datetime.combine(day.date(), MARKET_OPEN, tzinfo=MARKET_TZ)
+
@@ -0,0 +1,207 @@
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+
+# Latency buckets in seconds, from sub-millisecond cache work to slow upstream calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> List[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[Sample]:
+        return [(self.name, self._labels(k), v) for k, v in list(self._values.items())]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = float(value)
+
+    def samples(self) -> List[Sample]:
+        return [(self.name, self._labels(k), v) for k, v in list(self._values.items())]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (last slot is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][idx] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[Sample]:
+        out = []
+        for key, (counts, total) in list(self._series.items()):
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                out.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            out.append((f"{self.name}_sum", labels, total))
+            out.append((f"{self.name}_count", labels, cumulative))
+        return out
+
+
+class Registry:
+    """
+    Minimal in-process metrics registry rendered in Prometheus text format.
+
+    Collectors are callables returning ``(name, kind, help, samples)`` tuples,
+    evaluated only at scrape time for values that already live elsewhere
+    (pool stats, cache sizes).
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], List[Tuple[str, str, str, List[Sample]]]]] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], List[Tuple[str, str, str, List[Sample]]]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        families = [(m.name, m.kind, m.help, m.samples()) for m in self._metrics.values()]
+        for collector in self._collectors:
+            try:
+                families.extend(collector())
+            except Exception:
+                continue
+        lines = []
+        for name, kind, help_text, samples in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    "traderblock_http_request_duration_seconds", "HTTP request latency by route", ("route", "method", "status")
+)
+STAGE_LATENCY = REGISTRY.histogram(
+    "traderblock_stage_duration_seconds", "Latency of request processing stages", ("stage",)
+)
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    "traderblock_upstream_request_duration_seconds", "Market data provider call latency", ("endpoint",)
+)
+UPSTREAM_REQUESTS = REGISTRY.counter(
+    "traderblock_upstream_requests_total", "Market data provider calls by outcome", ("endpoint", "outcome")
+)
+UPSTREAM_THROTTLE = REGISTRY.histogram(
+    "traderblock_upstream_throttle_seconds", "Time spent waiting on the provider rate limit"
+)
+UPSTREAM_QUOTA = REGISTRY.gauge(
+    "traderblock_upstream_quota_remaining", "Provider calls left in the current window", ("source",)
+)
+CACHE_LATENCY = REGISTRY.histogram(
+    "traderblock_cache_operation_seconds", "Cache operation latency", ("cache", "op")
+)
+
+JOB_DURATION = REGISTRY.histogram(
+    "traderblock_job_duration_seconds", "Scheduled job run time", ("job", "outcome")
+)
+JOB_RUNS = REGISTRY.counter(
+    "traderblock_job_runs_total", "Scheduled job runs by outcome (ok, failed, skipped)", ("job", "outcome")
+)
+JOB_LAST_SUCCESS = REGISTRY.gauge(
+    "traderblock_job_last_success_timestamp_seconds", "Unix time of the last successful run", ("job",)
+)
+
+
+def stage(name: str):
+    """Context manager timing one processing stage."""
+    return STAGE_LATENCY.time(stage=name)
+
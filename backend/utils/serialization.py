@@ -0,0 +1,35 @@
+import hashlib
+import json
+import math
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json is the fallback
+    orjson = None
+
+
+def _nan_to_none(value: Any) -> Any:
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _nan_to_none(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_nan_to_none(v) for v in value]
+    return value
+
+
+def encode_json(payload: Any) -> bytes:
+    """Compact JSON bytes for a response body; NaN/inf become null, as orjson does."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    try:
+        return json.dumps(payload, separators=(",", ":"), allow_nan=False).encode()
+    except ValueError:
+        return json.dumps(_nan_to_none(payload), separators=(",", ":"), allow_nan=False).encode()
+
+
+def content_etag(body: bytes) -> str:
+    """Strong ETag derived from the encoded body."""
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
@@ -0,0 +1,13 @@
+from typing import List
+
+
+def read_universe(path: str) -> List[str]:
+    """Symbols from a file of ``SYMBOL`` or ``SYMBOL,Company name[,alias...]`` lines, in file order."""
+    symbols: List[str] = []
+    with open(path, "r") as f:
+        for line in f:
+            symbol = line.split(",", 1)[0].strip().upper()
+            if symbol and not symbol.startswith("#"):
+                symbols.append(symbol)
+    return list(dict.fromkeys(symbols))
+
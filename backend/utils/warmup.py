@@ -0,0 +1,81 @@
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from .logger import get_logger
+
+
+_logger = get_logger(__name__)
+
+
+class WarmUp:
+    """
+    Background warm-up of slow, non-essential state (models, worker pools).
+
+    Tasks registered before ``start`` run once, in order, on a daemon thread
+    so the server accepts light traffic immediately. ``ready`` turns true
+    when every task has succeeded. Failures are recorded, not raised, since
+    the code paths they warm load lazily on first use anyway; they keep
+    ``ready`` false and are listed in ``failed``.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: List[Tuple[str, Callable[[], object]]] = []
+        self._status: Dict[str, Dict] = {}
+        self._thread: threading.Thread | None = None
+        self._done = threading.Event()
+        self._started_at: float | None = None
+
+    def register(self, name: str, fn: Callable[[], object]) -> None:
+        self._tasks.append((name, fn))
+        self._status[name] = {"state": "pending"}
+
+    def start(self) -> None:
+        # Startup hooks may fire more than once; warm up a single time
+        if self._thread is not None:
+            return
+        self._started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        for name, fn in self._tasks:
+            self._status[name] = {"state": "running"}
+            started = time.perf_counter()
+            try:
+                fn()
+                self._status[name] = {"state": "done", "seconds": round(time.perf_counter() - started, 3)}
+            except Exception as e:
+                _logger.warning("warm-up task %s failed: %s", name, e)
+                self._status[name] = {
+                    "state": "failed", "seconds": round(time.perf_counter() - started, 3), "error": str(e)
+                }
+        self._done.set()
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def failed(self) -> List[str]:
+        return [name for name, status in self._status.items() if status["state"] == "failed"]
+
+    @property
+    def ready(self) -> bool:
+        return self.finished and not self.failed
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+    def get_stats(self) -> Dict:
+        return {
+            "started": self._started_at is not None,
+            "finished": self.finished,
+            "ready": self.ready,
+            "failed": self.failed,
+            "tasks": dict(self._status),
+        }
+
+
+warmup = WarmUp()
+